@@ -0,0 +1,371 @@
+"""
+CyberPunk Arcade - Headless Benchmark
+Drives every mini-game with scripted input under the SDL dummy driver and
+reports per-phase frame timings as JSON
+
+Usage: python bench.py [--frames N] [--games ID ...] [--output FILE] [--compare FILE]
+                       [--packet-stress COUNT] [--wave-stress COUNT] [--dirty-rects] [--no-parallax]
+                       [--no-sprite-batch] [--replay LOG ...]
+"""
+
+import os
+
+# Must be set before pygame initializes its video/audio subsystems
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import contextlib
+import io
+import json
+import platform
+import sys
+import time
+import pygame
+from config import *
+from game import CyberpunkArcade
+from utils.replay import ReplayLog, run_replay
+
+PHASES = ("input", "update", "render", "present")
+PERCENTILES = (50, 95, 99)
+
+
+class ScriptedInput:
+    """Feeds a per-frame input script to the engine as posted pygame events
+
+    A script is a function of the frame number returning
+    (held_keys, mouse_pos, mouse_buttons). Changes from the previous frame
+    become KEYDOWN/KEYUP, MOUSEMOTION and MOUSEBUTTONDOWN/UP events, so the
+    engine sees exactly what real input would produce.
+    """
+
+    def __init__(self):
+        self.keys = frozenset()
+        self.mouse_pos = (0, 0)
+        self.mouse_buttons = (False, False, False)
+
+    def post_frame(self, script, frame):
+        keys, mouse_pos, mouse_buttons = script(frame)
+        post = pygame.event.post
+
+        for key in keys - self.keys:
+            post(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode="", scancode=0))
+        for key in self.keys - keys:
+            post(pygame.event.Event(pygame.KEYUP, key=key, mod=0, unicode="", scancode=0))
+
+        if mouse_pos != self.mouse_pos:
+            rel = (mouse_pos[0] - self.mouse_pos[0], mouse_pos[1] - self.mouse_pos[1])
+            post(pygame.event.Event(pygame.MOUSEMOTION, pos=mouse_pos, rel=rel, buttons=mouse_buttons))
+        for i, (was_down, is_down) in enumerate(zip(self.mouse_buttons, mouse_buttons)):
+            if is_down != was_down:
+                event_type = pygame.MOUSEBUTTONDOWN if is_down else pygame.MOUSEBUTTONUP
+                post(pygame.event.Event(event_type, pos=mouse_pos, button=i + 1))
+
+        self.keys, self.mouse_pos, self.mouse_buttons = keys, mouse_pos, mouse_buttons
+
+    def release(self):
+        """Let go of everything the script is still holding"""
+        self.post_frame(lambda frame: (frozenset(), self.mouse_pos, NO_BUTTONS), 0)
+
+
+# Scripted input per game ------------------------------------------------------
+
+NO_BUTTONS = (False, False, False)
+LEFT_BUTTON = (True, False, False)
+
+
+def script_main_menu(frame):
+    # Idle on the menu with the skyline scrolling
+    return frozenset(), (0, 0), NO_BUTTONS
+
+
+def script_packet_runner(frame):
+    # Sweep left and right across the screen
+    key = pygame.K_LEFT if (frame // 90) % 2 else pygame.K_RIGHT
+    return frozenset([key]), (0, 0), NO_BUTTONS
+
+
+def script_firewall_defender(frame):
+    # Click a new grid cell every two seconds
+    grid_size = 40
+    slot = frame // 120
+    pos = (grid_size * (3 + slot * 5 % 28) + grid_size // 2,
+           grid_size * (2 + slot * 3 % 14) + grid_size // 2)
+    buttons = LEFT_BUTTON if frame % 120 == 0 else NO_BUTTONS
+    return frozenset(), pos, buttons
+
+
+def script_code_breaker(frame):
+    return frozenset(), (0, 0), NO_BUTTONS
+
+
+def script_social_engineering(frame):
+    # Answer a question every second, alternating between the options
+    option = (frame // 60) % 2
+    pos = (SCREEN_WIDTH // 2, 330 + option * 80)
+    buttons = LEFT_BUTTON if frame % 60 == 59 else NO_BUTTONS
+    return frozenset(), pos, buttons
+
+
+def script_ctf_racer(frame):
+    # Full throttle with a steady right-hand turn
+    keys = [pygame.K_UP]
+    if frame % 4 == 0:
+        keys.append(pygame.K_RIGHT)
+    return frozenset(keys), (0, 0), NO_BUTTONS
+
+
+SCRIPTS = {
+    STATE_MAIN_MENU: script_main_menu,
+    "packet_runner": script_packet_runner,
+    "firewall_defender": script_firewall_defender,
+    "code_breaker": script_code_breaker,
+    "social_engineering": script_social_engineering,
+    "ctf_racer": script_ctf_racer
+}
+
+
+# Statistics -------------------------------------------------------------------
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(0, min(len(sorted_samples) - 1, int(round(pct / 100 * len(sorted_samples))) - 1))
+    return sorted_samples[rank]
+
+
+def summarize(samples):
+    """Summarize a list of durations in seconds as milliseconds"""
+    ordered = sorted(samples)
+    summary = {
+        "mean_ms": sum(ordered) / len(ordered) * 1000 if ordered else 0.0,
+        "max_ms": ordered[-1] * 1000 if ordered else 0.0
+    }
+    for pct in PERCENTILES:
+        summary[f"p{pct}_ms"] = percentile(ordered, pct) * 1000
+    return summary
+
+
+# Benchmark --------------------------------------------------------------------
+
+# Benchmarkable scenes: the main menu plus every mini-game
+SCENES = {STATE_MAIN_MENU: "Main Menu", **GAMES}
+
+
+def start_scene(engine, scene_id):
+    if scene_id in GAMES:
+        engine.start_game(scene_id)
+    else:
+        engine.close_game()
+        engine.current_state = scene_id
+
+
+def bench_game(engine, scripted, game_id, frames, warmup, setup=None):
+    """Run one game for warmup + frames frames and return its timing summary
+
+    setup, if given, is called with each new game instance (e.g. to apply a stress level).
+    """
+    script = SCRIPTS.get(game_id, script_code_breaker)
+    samples = {phase: [] for phase in PHASES}
+    totals = []
+    restarts = 0
+
+    scripted.release()
+    start_scene(engine, game_id)
+    if setup:
+        setup(engine.game_instance)
+
+    for frame in range(warmup + frames):
+        # Games that finish (timer, all answers given) are restarted outside the timed region
+        if engine.current_state != game_id:
+            start_scene(engine, game_id)
+            if setup:
+                setup(engine.game_instance)
+            restarts += 1
+
+        scripted.post_frame(script, frame)
+
+        t0 = time.perf_counter()
+        engine.handle_events()
+        t1 = time.perf_counter()
+        engine.update(FIXED_TIMESTEP)
+        t2 = time.perf_counter()
+        engine.render()
+        t3 = time.perf_counter()
+        engine.present()
+        t4 = time.perf_counter()
+
+        if frame >= warmup:
+            samples["input"].append(t1 - t0)
+            samples["update"].append(t2 - t1)
+            samples["render"].append(t3 - t2)
+            samples["present"].append(t4 - t3)
+            totals.append(t4 - t0)
+
+    return {
+        "name": SCENES[game_id],
+        "frames": frames,
+        "restarts": restarts,
+        "phases": {phase: summarize(values) for phase, values in samples.items()},
+        "frame": summarize(totals)
+    }
+
+
+def run_benchmark(game_ids, frames, warmup, verbose=False, packet_stress=None, dirty_rects=False,
+                  parallax=True, sprite_batching=True, wave_stress=None):
+    """Benchmark the given games and return the full JSON-ready report"""
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    scripted = ScriptedInput()
+    results = {}
+
+    setups = {}
+    if packet_stress:
+        setups["packet_runner"] = lambda game: setattr(game, "spawn_count", packet_stress)
+    if wave_stress:
+        setups["firewall_defender"] = lambda game: setattr(game, "enemies_per_wave", wave_stress)
+
+    with output:
+        # Benchmark runs must not touch the player's saved scores
+        engine = CyberpunkArcade(save_data=False)
+        engine.dirty_rect_mode = dirty_rects
+        engine.parallax_enabled = parallax
+        engine.sprite_batching = sprite_batching
+        
+        # The skyline strips build on a worker thread; wait for them so
+        # frames aren't measured against a black background
+        while parallax and not engine.background.ready:
+            engine.render()
+            time.sleep(0.005)
+        for game_id in game_ids:
+            results[game_id] = bench_game(engine, scripted, game_id, frames, warmup,
+                                          setups.get(game_id))
+        engine.shutdown()
+
+    return {
+        "version": VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "python": platform.python_version(),
+        "pygame": pygame.version.ver,
+        "platform": platform.platform(),
+        "video_driver": os.environ.get("SDL_VIDEODRIVER"),
+        "frames": frames,
+        "warmup": warmup,
+        "packet_stress": packet_stress,
+        "wave_stress": wave_stress,
+        "dirty_rects": dirty_rects,
+        "parallax": parallax,
+        "sprite_batching": sprite_batching,
+        "games": results,
+        "launch": engine.games.timings(),
+        "text_cache": engine.text_cache.stats()
+    }
+
+
+def bench_replays(paths, verbose=False):
+    """Play recorded sessions through a headless engine at full speed
+
+    The same log always produces the same game, so the final score doubles
+    as a correctness check between runs.
+    """
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    results = {}
+    with output:
+        engine = CyberpunkArcade(headless=True)
+        for path in paths:
+            log = ReplayLog.load(path)
+            tick_times, game = run_replay(log, engine)
+            results[os.path.basename(path)] = {
+                "game": log.game_id,
+                "seed": log.seed,
+                "ticks": len(tick_times),
+                "update": summarize(tick_times),
+                "total_ms": sum(tick_times) * 1000,
+                "score": game.score
+            }
+    return results
+
+
+def print_report(report, baseline=None):
+    """Print a human-readable table, with deltas against a baseline report"""
+    print(f"{GAME_TITLE} v{report['version']} benchmark - {report['frames']} frames per scene")
+    header = f"{'game':<20}{'phase':<8}" + "".join(f"{'p' + str(p) + ' ms':>10}" for p in PERCENTILES)
+    print(header)
+    print("-" * len(header))
+
+    for game_id, result in report["games"].items():
+        rows = list(result["phases"].items()) + [("frame", result["frame"])]
+        for phase, summary in rows:
+            line = f"{game_id:<20}{phase:<8}"
+            for pct in PERCENTILES:
+                line += f"{summary[f'p{pct}_ms']:>10.3f}"
+            if baseline and game_id in baseline["games"]:
+                old = baseline["games"][game_id]
+                old_summary = old["frame"] if phase == "frame" else old["phases"].get(phase)
+                if old_summary and old_summary["p50_ms"]:
+                    change = (summary["p50_ms"] - old_summary["p50_ms"]) / old_summary["p50_ms"]
+                    line += f"   p50 {change:+.1%} vs {baseline['version']}"
+            print(line)
+
+    launch = report.get("launch")
+    if launch:
+        print()
+        print(f"{'game':<20}{'import ms':>10}{'start ms':>10}")
+        for game_id, timing in launch.items():
+            cells = [f"{timing[key]:>10.1f}" if timing[key] is not None else f"{'-':>10}"
+                     for key in ("import_ms", "construct_ms")]
+            print(f"{game_id:<20}" + "".join(cells))
+
+    for name, replay in report.get("replays", {}).items():
+        line = (f"replay {name}: {replay['ticks']} ticks in {replay['total_ms']:.1f} ms, "
+                f"p99 tick {replay['update']['p99_ms']:.3f} ms, score {replay['score']}")
+        old = baseline.get("replays", {}).get(name) if baseline else None
+        if old and old["score"] != replay["score"]:
+            line += f"   SCORE CHANGED (was {old['score']})"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless per-game frame benchmark")
+    parser.add_argument("--frames", type=int, default=600, help="timed frames per scene")
+    parser.add_argument("--warmup", type=int, default=60, help="untimed frames before measuring")
+    parser.add_argument("--games", nargs="+", choices=list(SCENES), default=list(SCENES),
+                        help="scenes to benchmark (default: main menu and all games)")
+    parser.add_argument("--output", default=f"bench_{VERSION}.json", help="JSON report path")
+    parser.add_argument("--compare", help="previous JSON report to compare against")
+    parser.add_argument("--packet-stress", type=int, metavar="COUNT",
+                        help="Packet Runner packets spawned per spawn interval")
+    parser.add_argument("--wave-stress", type=int, metavar="COUNT",
+                        help="Firewall Defender enemies in the first wave")
+    parser.add_argument("--dirty-rects", action="store_true",
+                        help="present frames with dirty-rect updates instead of full flips")
+    parser.add_argument("--no-parallax", dest="parallax", action="store_false",
+                        help="clear to black instead of drawing the parallax background")
+    parser.add_argument("--no-sprite-batch", dest="sprite_batching", action="store_false",
+                        help="draw entities with per-entity draw calls instead of batched sprites")
+    parser.add_argument("--replay", nargs="+", metavar="LOG", default=[],
+                        help="also replay recorded sessions headless at full speed")
+    parser.add_argument("--verbose", action="store_true", help="show game output while running")
+    args = parser.parse_args()
+
+    report = run_benchmark(args.games, args.frames, args.warmup, args.verbose, args.packet_stress,
+                           args.dirty_rects, args.parallax, args.sprite_batching, args.wave_stress)
+    if args.replay:
+        report["replays"] = bench_replays(args.replay, args.verbose)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
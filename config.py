@@ -16,6 +16,35 @@ SCREEN_HEIGHT = 720
 FPS = 60
 FULLSCREEN = False
 
+# Game Loop Settings
+FIXED_TIMESTEP = 1 / 60  # seconds of game time per simulation tick
+MAX_FRAME_TIME = 0.25  # longer stalls are clamped so the loop can catch up
+MAX_UPDATES_PER_FRAME = 5  # simulation ticks run before a frame must be rendered
+
+# Rendering Settings
+TEXT_CACHE_SIZE = 512  # rendered text surfaces kept before LRU eviction
+DIRTY_RECT_MODE = False  # push only changed screen regions instead of flipping the whole display
+SPRITE_BATCHING = True  # draw game entities as cached sprites with one blits() call per frame
+
+# Profiler Settings (F3 toggles the overlay, F4 saves the buffered frames as CSV)
+PROFILER_HISTORY = 600  # frames kept in the ring buffer
+PROFILER_TEXT_INTERVAL = 15  # frames between overlay text refreshes
+
+# Replay Settings (F5 toggles recording from the next game started)
+RECORD_REPLAYS = False  # write every game's seed and per-tick input to REPLAY_PATH
+
+# Asset Settings
+ASSET_CACHE_BUDGET = 32 * 1024 * 1024  # bytes of converted image surfaces kept before LRU eviction
+ASSET_CONVERTS_PER_FRAME = 4  # preloaded images converted to the display format each frame
+
+# Hint Settings (Code Breaker solver thread)
+HINT_WORK_SLICE = 0.002  # seconds of search per slice
+HINT_PAUSE = 0.006  # seconds the solver sleeps between slices, leaving the interpreter to the game
+
+# Save Settings
+SAVE_BATCH_INTERVAL = 0.5  # seconds of changes the save writer collects into one transaction
+SAVE_FLUSH_TIMEOUT = 2.0  # seconds quitting waits for pending saves before giving up
+
 # Colors - Cyberpunk Theme
 NEON_BLUE = (0, 195, 255)
 NEON_PINK = (255, 0, 128)
@@ -57,10 +86,16 @@ IMAGES_PATH = os.path.join(ASSETS_PATH, "images")
 AUDIO_PATH = os.path.join(ASSETS_PATH, "audio")
 FONTS_PATH = os.path.join(ASSETS_PATH, "fonts")
 DATA_PATH = os.path.join(BASE_DIR, "data")
+TRACK_CACHE_PATH = os.path.join(DATA_PATH, "tracks")
+PROFILE_PATH = os.path.join(DATA_PATH, "profiles")
+REPLAY_PATH = os.path.join(DATA_PATH, "replays")
+SAVE_DB_PATH = os.path.join(DATA_PATH, "saves", "arcade.db")
 
 # Game Settings
 DEFAULT_PLAYER_SPEED = 5
 DEFAULT_GAME_TIME = 60  # seconds
+GAME_PREWARM = True  # import every game module in the background at startup
+TRACK_SEED_COUNT = 16  # CTF Racer picks from this many generated (and cached) tracks
 
 # Input Settings
 KEY_REPEAT_DELAY = 200  # ms
@@ -88,6 +123,23 @@ GAMES = {
     "ctf_racer": "CTF Racer"
 }
 
+# Parallax background - layers back to front as (asset key, scroll speed in pixels per second)
+PARALLAX_LAYERS = [
+    ("cyberpunk-street-files/PNG/layers/far-buildings.png", 8),
+    ("cyberpunk-street-files/PNG/layers/back-buildings.png", 24),
+    ("cyberpunk-street-files/PNG/layers/foreground.png", 60)
+]
+PARALLAX_DIM = 110  # brightness (0-255) the layers are baked at so neon UI stays readable
+PARALLAX_ENABLED = True
+
+# Asset manifests - images keyed by path inside the asset archives. Everything
+# listed is decoded in the background while the main menu is up. The menu and
+# every game drawn over the skyline share the one background manifest.
+CITY_LAYERS = [key for key, _ in PARALLAX_LAYERS]
+ASSET_MANIFESTS = {
+    "background": CITY_LAYERS
+}
+
 # Achievement Settings
 ACHIEVEMENTS = {
     "first_blood": {"name": "First Blood", "description": "Catch your first packet", "points": 10},
@@ -6,17 +6,63 @@ Handles the game loop, scene management, and core functionality
 import pygame
 import sys
 import os
+import time
 from config import *
+from games.registry import GameRegistry
+from utils.asset_manager import AssetManager
+from utils.debug_tools import FrameProfiler
+from utils.input_utils import InputState
+from utils.parallax import ParallaxBackground
+from utils.replay import ReplayLog, replay_path
+from utils.save_manager import SaveManager
+from utils.text_utils import TextCache
 
 class CyberpunkArcade:
-    def __init__(self):
+    # Engine phases timed by the profiler overlay
+    profile_phases = ("handle_events", "update", "render", "present")
+    
+    def __init__(self, headless=False, save_data=True):
+        # Headless engines (replays, simulations) never open a window or
+        # audio device; games draw into an off-screen surface nobody shows
+        self.headless = headless
+        
         # Initialize pygame
         pygame.init()
-        pygame.mixer.init()
+        if headless:
+            self.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+        else:
+            pygame.mixer.init()
+            
+            # Create display
+            self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+            pygame.display.set_caption(f"{GAME_TITLE} v{VERSION}")
+        
+        # Shared font registry and text-surface cache
+        self.text_cache = TextCache()
+        
+        # Images come straight from the bundled archives; every scene's
+        # manifest is decoded in the background while the menu is showing
+        self.assets = AssetManager()
+        if not headless:
+            self.assets.preload([key for keys in ASSET_MANIFESTS.values() for key in keys])
+        
+        # Scrolling skyline behind the menu and games that opt in
+        self.background = ParallaxBackground(self.assets)
+        self.parallax_enabled = PARALLAX_ENABLED and not headless
+        
+        # Games build their SpriteBatch with this setting when they start
+        self.sprite_batching = SPRITE_BATCHING
         
-        # Create display
-        self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
-        pygame.display.set_caption(f"{GAME_TITLE} v{VERSION}")
+        # Display updates - in dirty-rect mode only regions marked this frame
+        # (and last frame, to erase what moved) are pushed to the display
+        self.dirty_rect_mode = DIRTY_RECT_MODE
+        self.dirty_rects = []
+        self.previous_dirty_rects = []
+        self.full_redraw = True
+        self.presented_state = None
+        
+        # Frame profiler - instruments the engine and game only while enabled
+        self.profiler = FrameProfiler()
         
         # Game clock
         self.clock = pygame.time.Clock()
@@ -27,85 +73,133 @@ class CyberpunkArcade:
         self.previous_state = None
         self.game_instance = None
         
+        # Games are imported on first launch, or ahead of time in the background
+        self.games = GameRegistry()
+        if GAME_PREWARM:
+            self.games.prewarm()
+        
+        # Scene dispatch: state -> (update(dt), render(alpha)); every game id
+        # shares the handlers that forward to the running game
+        self.scenes = {
+            STATE_MAIN_MENU: (self.update_main_menu, self.render_main_menu),
+            STATE_ARCADE_HUB: (self.update_arcade_hub, self.render_arcade_hub),
+            STATE_GAME_SELECT: (self.update_game_select, None),
+            STATE_PAUSED: (self.update_pause_menu, self.render_pause_menu),
+            STATE_GAME_OVER: (self.update_game_over, self.render_game_over),
+            STATE_OPTIONS: (self.update_options_menu, self.render_options_menu)
+        }
+        for game_id in GAMES:
+            self.scenes[game_id] = (self.update_game, self.render_game)
+        
         # Game data
         self.score = 0
         self.high_score = 0
+        self.high_scores = {}  # game id -> best score
         self.unlocked_games = ["packet_runner", "firewall_defender", "code_breaker", "social_engineering", "ctf_racer"]
         self.achievements = {}
         
-        # Input
-        self.keys_pressed = set()
-        self.mouse_pos = (0, 0)
-        self.mouse_clicked = False
+        # Input - built from events, read by menus and games each tick
+        self.input = InputState()
+        
+        # Replay recording - the running game's seed and per-tick input
+        self.record_replays = RECORD_REPLAYS and not headless
+        self.recording = None
         
-        # Load game data
+        # Saved game data - written by a background thread, so saving never
+        # blocks the game loop; headless engines and save_data=False (the
+        # benchmark) don't touch the save file
+        self.saves = SaveManager(enabled=save_data and not headless)
         self._load_game_data()
         
     def _load_game_data(self):
         """Load saved game data"""
         try:
-            # Placeholder - will implement proper save system
-            self.high_score = 0
+            data = self.saves.load()
+            self.high_score = data['stats'].get('high_score', 0)
+            self.high_scores = data['high_scores']
+            self.achievements = {achievement_id: True for achievement_id in data['achievements']}
             print("Game data loaded successfully")
         except Exception as e:
             print(f"Error loading game data: {e}")
             
     def _save_game_data(self):
-        """Save game data"""
+        """Queue the current game data for the save writer - returns without waiting"""
         try:
-            # Placeholder - will implement proper save system
-            print("Game data saved successfully")
+            self.saves.save_stat('high_score', self.high_score)
+            for game_id, score in self.high_scores.items():
+                self.saves.submit_score(game_id, score)
+            for achievement_id in self.achievements:
+                self.saves.unlock(achievement_id)
         except Exception as e:
             print(f"Error saving game data: {e}")
     
     def run(self):
-        """Main game loop"""
+        """Main game loop - fixed-timestep simulation with interpolated rendering"""
         print("Starting CyberPunk Arcade...")
         
+        previous_time = time.perf_counter()
+        accumulator = 0.0
+        
         while self.running:
+            current_time = time.perf_counter()
+            accumulator += min(current_time - previous_time, MAX_FRAME_TIME)
+            previous_time = current_time
+            
             self.handle_events()
-            self.update()
-            self.render()
+            
+            # Catch the simulation up with real time. When a frame runs late this
+            # runs several ticks before the next render, skipping render frames
+            # instead of slowing game time down.
+            updates = 0
+            while accumulator >= FIXED_TIMESTEP and updates < MAX_UPDATES_PER_FRAME:
+                self.update(FIXED_TIMESTEP)
+                accumulator -= FIXED_TIMESTEP
+                updates += 1
+                
+            # Too far behind to catch up - drop the backlog rather than spiral
+            if accumulator >= FIXED_TIMESTEP:
+                accumulator %= FIXED_TIMESTEP
+                
+            self.render(accumulator / FIXED_TIMESTEP)
+            self.present()
             self.clock.tick(FPS)
             
+            if self.profiler.enabled:
+                self.profiler.end_frame(time.perf_counter() - current_time)
+            
         self.quit_game()
     
     def handle_events(self):
         """Handle all pygame events"""
-        self.mouse_clicked = False
-        
         for event in pygame.event.get():
+            self.input.process_event(event)
+            
             if event.type == pygame.QUIT:
                 self.running = False
                 
             elif event.type == pygame.KEYDOWN:
-                self.keys_pressed.add(event.key)
-                
                 # Global key bindings
                 if event.key == pygame.K_ESCAPE:
                     self.handle_escape()
                 elif event.key == pygame.K_F11:
                     self.toggle_fullscreen()
+                elif event.key == pygame.K_F3:
+                    self.toggle_profiler()
+                elif event.key == pygame.K_F4 and self.profiler.enabled:
+                    path = self.profiler.dump_csv()
+                    print(f"📊 Frame profile saved to {path}")
+                elif event.key == pygame.K_F5:
+                    self.record_replays = not self.record_replays
+                    print(f"⏺️ Replay recording {'on' if self.record_replays else 'off'} from the next game")
                     
-            elif event.type == pygame.KEYUP:
-                if event.key in self.keys_pressed:
-                    self.keys_pressed.remove(event.key)
-                    
-            elif event.type == pygame.MOUSEBUTTONDOWN:
-                if event.button == 1:  # Left click
-                    self.mouse_clicked = True
-                    
-            elif event.type == pygame.MOUSEMOTION:
-                self.mouse_pos = event.pos
-                
-        # Update key state for continuous presses
-        self.keys_pressed = set(pygame.key.get_pressed())
+            elif event.type == pygame.VIDEOEXPOSE:
+                self.full_redraw = True
     
     def handle_escape(self):
         """Handle ESC key press based on current state"""
         if self.current_state == STATE_MAIN_MENU:
             self.running = False
-        elif self.current_state in [STATE_ARCADE_HUB, STATE_GAME_SELECT]:
+        elif self.current_state in [STATE_ARCADE_HUB, STATE_GAME_SELECT, STATE_OPTIONS]:
             self.current_state = STATE_MAIN_MENU
         elif self.current_state == STATE_PAUSED:
             self.current_state = self.previous_state
@@ -122,140 +216,200 @@ class CyberpunkArcade:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.FULLSCREEN)
         else:
             self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
+        self.full_redraw = True
     
-    def update(self):
-        """Update game state based on current scene"""
-        if self.current_state == STATE_MAIN_MENU:
-            self.update_main_menu()
-        elif self.current_state == STATE_ARCADE_HUB:
-            self.update_arcade_hub()
-        elif self.current_state == STATE_GAME_SELECT:
-            self.update_game_select()
-        elif self.current_state == STATE_PAUSED:
-            self.update_pause_menu()
-        elif self.current_state == STATE_GAME_OVER:
-            self.update_game_over()
-        elif self.current_state == STATE_OPTIONS:
-            self.update_options_menu()
-        elif self.current_state in GAMES:
-            self.update_game()
+    def toggle_profiler(self):
+        """Show or hide the profiler overlay and (un)wrap the timed methods"""
+        profiler = self.profiler
+        profiler.enabled = not profiler.enabled
+        
+        if profiler.enabled:
+            profiler.reset()
+            profiler.instrument(self, self.profile_phases)
+            if self.game_instance:
+                self.profile_game(self.game_instance)
+        else:
+            profiler.release()
+        self.full_redraw = True
+    
+    def profile_game(self, game):
+        """Time a game's own phases, listed in its profile_phases"""
+        self.profiler.instrument(game, getattr(game, 'profile_phases', ()), type(game).__name__ + ".")
+    
+    def update(self, dt):
+        """Advance game state by one fixed tick of dt seconds"""
+        if self.uses_parallax():
+            self.background.update(dt)
             
-        # Update current game instance if active
-        if self.game_instance and hasattr(self.game_instance, 'update'):
-            self.game_instance.update()
+        update_scene, _ = self.scenes.get(self.current_state, (None, None))
+        if update_scene:
+            update_scene(dt)
+            
+        # This tick has seen the key/button edges
+        self.input.end_tick()
     
-    def update_main_menu(self):
+    def update_main_menu(self, dt=FIXED_TIMESTEP):
         """Update main menu state"""
-        # Check for number keys (both numpad and number row)
-        keys = pygame.key.get_pressed()
-        
-        # Number row keys (1, 2, 3, 4, 5)
-        if keys[pygame.K_1] and "packet_runner" in self.unlocked_games:
-            self.start_game("packet_runner")
-        elif keys[pygame.K_2] and "firewall_defender" in self.unlocked_games:
-            self.start_game("firewall_defender")
-        elif keys[pygame.K_3] and "code_breaker" in self.unlocked_games:
-            self.start_game("code_breaker")
-        elif keys[pygame.K_4] and "social_engineering" in self.unlocked_games:
-            self.start_game("social_engineering")
-        elif keys[pygame.K_5] and "ctf_racer" in self.unlocked_games:
-            self.start_game("ctf_racer")
-        elif keys[pygame.K_o]:
+        # Number row keys select games in menu order (1 = first game)
+        for i, game_id in enumerate(GAMES):
+            if i < 9 and self.input.just_pressed(pygame.K_1 + i) and game_id in self.unlocked_games:
+                self.start_game(game_id)
+                return
+        if self.input.just_pressed(pygame.K_o):
             self.current_state = STATE_OPTIONS
     
-    def update_arcade_hub(self):
+    def update_arcade_hub(self, dt=FIXED_TIMESTEP):
         """Update arcade hub state"""
         pass
     
-    def update_game_select(self):
+    def update_game_select(self, dt=FIXED_TIMESTEP):
         """Update game selection screen"""
         pass
     
-    def update_pause_menu(self):
+    def update_pause_menu(self, dt=FIXED_TIMESTEP):
         """Update pause menu"""
         pass
     
-    def update_game_over(self):
+    def update_game_over(self, dt=FIXED_TIMESTEP):
         """Update game over screen"""
         pass
     
-    def update_options_menu(self):
-        """Update options menu"""
-        if pygame.K_ESCAPE in self.keys_pressed:
-            self.current_state = STATE_MAIN_MENU
+    def update_options_menu(self, dt=FIXED_TIMESTEP):
+        """Update options menu (ESC back to the main menu is handled by handle_escape)"""
+        pass
     
-    def update_game(self):
+    def update_game(self, dt):
         """Update current mini-game"""
-        pass
+        if self.game_instance and hasattr(self.game_instance, 'update'):
+            if self.recording:
+                self.recording.record(self.input)
+            self.game_instance.update(dt, self.input)
+            
+            # The game ended itself - its recording is complete
+            if self.recording and self.current_state != self.recording.game_id:
+                self.finish_recording()
     
-    def start_game(self, game_name):
-        """Start a specific mini-game"""
+    def start_game(self, game_name, seed=None):
+        """Start a specific mini-game (seed None picks a random one)"""
         try:
             print(f"Starting game: {game_name}")
+            self.finish_recording()
             
-            # Import and initialize the game
-            if game_name == "packet_runner":
-                from games.packet_runner.packet_runner import PacketRunner
-                self.game_instance = PacketRunner(self)
-            elif game_name == "firewall_defender":
-                from games.firewall_defender.firewall_defender import FirewallDefender
-                self.game_instance = FirewallDefender(self)
-            elif game_name == "code_breaker":
-                from games.code_breaker.code_breaker import CodeBreaker
-                self.game_instance = CodeBreaker(self)
-            elif game_name == "social_engineering":
-                from games.social_engineering.social_engineering import SocialEngineering
-                self.game_instance = SocialEngineering(self)
-            elif game_name == "ctf_racer":
-                from games.ctf_racer.ctf_racer import CTFRacer
-                self.game_instance = CTFRacer(self)
-            
+            # Import (if not prewarmed) and initialize the game
+            self.close_game()
+            self.game_instance = self.games.create(game_name, self, seed)
             self.current_state = game_name
+            if self.profiler.enabled:
+                self.profile_game(self.game_instance)
+            if self.record_replays:
+                self.recording = ReplayLog(game_name, self.game_instance.seed)
             
-        except ImportError as e:
+            timing = self.games.timings()[game_name]
+            import_ms = f"{timing['import_ms']:.1f} ms" if timing['import_ms'] is not None else "n/a"
+            print(f"⏱️ {GAMES[game_name]} loaded - import {import_ms}, start {timing['construct_ms']:.1f} ms")
+            
+        except (ImportError, KeyError) as e:
             print(f"Error loading game {game_name}: {e}")
             print("Game not implemented yet!")
         except Exception as e:
             print(f"Error starting game {game_name}: {e}")
     
-    def render(self):
-        """Render the current game state"""
-        # Clear screen with background color
-        self.screen.fill(BLACK)
+    def close_game(self):
+        """Drop the current mini-game, letting it stop any background work first"""
+        game, self.game_instance = self.game_instance, None
+        if game:
+            if self.profiler.enabled:
+                self.profiler.release(game)
+            game.close()
+    
+    def finish_recording(self):
+        """Write the current replay recording (if any) to REPLAY_PATH"""
+        recording, self.recording = self.recording, None
+        if not recording or not recording.tick_count:
+            return
+        path = replay_path(recording.game_id)
+        try:
+            recording.save(path)
+            print(f"⏺️ Replay saved to {path} ({recording.tick_count} ticks)")
+        except OSError as e:
+            print(f"Error saving replay: {e}")
+    
+    def render(self, alpha=1.0):
+        """Render the current game state
+        
+        alpha is how far real time has moved past the last simulation tick
+        (0.0 - 1.0), used by games to interpolate moving objects.
+        """
+        # Finish converting a few background-loaded images
+        self.assets.pump(ASSET_CONVERTS_PER_FRAME)
+        
+        # Clear screen with the skyline or the background color
+        if self.uses_parallax():
+            self.background.draw(self.screen, alpha)
+            self.full_redraw = True  # the whole background moves
+        else:
+            self.screen.fill(BLACK)
         
         # Render based on current state
-        if self.current_state == STATE_MAIN_MENU:
-            self.render_main_menu()
-        elif self.current_state == STATE_ARCADE_HUB:
-            self.render_arcade_hub()
-        elif self.current_state in GAMES:
-            self.render_game()
-        elif self.current_state == STATE_PAUSED:
-            self.render_pause_menu()
-        elif self.current_state == STATE_GAME_OVER:
-            self.render_game_over()
-        elif self.current_state == STATE_OPTIONS:
-            self.render_options_menu()
+        _, render_scene = self.scenes.get(self.current_state, (None, None))
+        if render_scene:
+            render_scene(alpha)
         
-        # Update display
-        pygame.display.flip()
+        # Profiler overlay on top of everything
+        if self.profiler.enabled:
+            self.mark_dirty(self.profiler.draw(self.screen, self.text_cache.fonts))
     
-    def render_main_menu(self):
+    def uses_parallax(self):
+        """Whether the current scene is drawn over the parallax background"""
+        if not self.parallax_enabled:
+            return False
+        if self.current_state == STATE_MAIN_MENU:
+            return True
+        return self.current_state in GAMES and getattr(self.game_instance, 'use_parallax', False)
+    
+    def present(self):
+        """Push the rendered frame to the display (called after render)"""
+        # Scenes that don't report dirty rects are always flipped in full
+        if self.current_state != self.presented_state:
+            self.full_redraw = True
+        elif self.current_state in GAMES and not getattr(self.game_instance, 'tracks_dirty_rects', False):
+            self.full_redraw = True
+            
+        if not self.dirty_rect_mode or self.full_redraw:
+            pygame.display.flip()
+        elif self.dirty_rects or self.previous_dirty_rects:
+            pygame.display.update(self.previous_dirty_rects + self.dirty_rects)
+            
+        self.previous_dirty_rects = self.dirty_rects
+        self.dirty_rects = []
+        self.full_redraw = False
+        self.presented_state = self.current_state
+    
+    def mark_dirty(self, rect):
+        """Mark a screen region as changed this frame (used in dirty-rect mode)"""
+        self.dirty_rects.append(rect)
+    
+    def mark_dirty_rects(self, rects):
+        """Mark many changed regions at once (e.g. everything a sprite batch drew)"""
+        self.dirty_rects.extend(rects)
+    
+    def request_full_redraw(self):
+        """Push the whole screen on the next present"""
+        self.full_redraw = True
+    
+    def render_main_menu(self, alpha=1.0):
         """Render the main menu"""
         # Title
-        title_font = pygame.font.Font(None, 74)
-        title_text = title_font.render(GAME_TITLE, True, NEON_BLUE)
+        title_text = self.text_cache.render(GAME_TITLE, 74, NEON_BLUE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title_text, title_rect)
         
         # Subtitle
-        subtitle_font = pygame.font.Font(None, 36)
-        subtitle_text = subtitle_font.render("Cybersecurity Mini-Games Collection", True, NEON_GREEN)
+        subtitle_text = self.text_cache.render("Cybersecurity Mini-Games Collection", 36, NEON_GREEN)
         subtitle_rect = subtitle_text.get_rect(center=(SCREEN_WIDTH//2, 160))
         self.screen.blit(subtitle_text, subtitle_rect)
         
         # Game options
-        option_font = pygame.font.Font(None, 32)
         options = []
         
         for i, (game_id, game_name) in enumerate(GAMES.items()):
@@ -273,37 +427,34 @@ class CyberpunkArcade:
         
         # Render options
         for i, (text, color) in enumerate(options):
-            option_text = option_font.render(text, True, color)
+            option_text = self.text_cache.render(text, 32, color)
             option_rect = option_text.get_rect(center=(SCREEN_WIDTH//2, 250 + i*50))
             self.screen.blit(option_text, option_rect)
         
         # Footer
-        footer_font = pygame.font.Font(None, 24)
-        footer_text = footer_font.render(f"Version {VERSION} | Press number keys to select games", True, LIGHT_GRAY)
+        footer_text = self.text_cache.render(f"Version {VERSION} | Press number keys to select games", 24, LIGHT_GRAY)
         footer_rect = footer_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT - 30))
         self.screen.blit(footer_text, footer_rect)
     
-    def render_arcade_hub(self):
+    def render_arcade_hub(self, alpha=1.0):
         """Render arcade hub"""
         pass
     
-    def render_game(self):
+    def render_game(self, alpha=1.0):
         """Render the current mini-game"""
         if self.game_instance and hasattr(self.game_instance, 'render'):
-            self.game_instance.render()
+            self.game_instance.render(alpha)
         else:
             # Fallback rendering if game doesn't implement render
-            font = pygame.font.Font(None, 48)
-            text = font.render(f"Playing: {GAMES.get(self.current_state, self.current_state)}", True, WHITE)
+            text = self.text_cache.render(f"Playing: {GAMES.get(self.current_state, self.current_state)}", 48, WHITE)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2))
             self.screen.blit(text, text_rect)
             
-            hint_font = pygame.font.Font(None, 24)
-            hint_text = hint_font.render("Game rendering not implemented yet", True, GRAY)
+            hint_text = self.text_cache.render("Game rendering not implemented yet", 24, GRAY)
             hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
             self.screen.blit(hint_text, hint_rect)
     
-    def render_pause_menu(self):
+    def render_pause_menu(self, alpha=1.0):
         """Render pause menu overlay"""
         # Semi-transparent overlay
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
@@ -311,33 +462,29 @@ class CyberpunkArcade:
         self.screen.blit(overlay, (0, 0))
         
         # Pause text
-        font = pygame.font.Font(None, 72)
-        text = font.render("PAUSED", True, NEON_BLUE)
+        text = self.text_cache.render("PAUSED", 72, NEON_BLUE)
         text_rect = text.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 - 50))
         self.screen.blit(text, text_rect)
         
         # Instructions
-        instruction_font = pygame.font.Font(None, 32)
-        instruction = instruction_font.render("Press ESC to resume", True, WHITE)
+        instruction = self.text_cache.render("Press ESC to resume", 32, WHITE)
         instruction_rect = instruction.get_rect(center=(SCREEN_WIDTH//2, SCREEN_HEIGHT//2 + 50))
         self.screen.blit(instruction, instruction_rect)
     
-    def render_game_over(self):
+    def render_game_over(self, alpha=1.0):
         """Render game over screen"""
         pass
     
-    def render_options_menu(self):
+    def render_options_menu(self, alpha=1.0):
         """Render options menu"""
         self.screen.fill(DARK_BLUE)
         
         # Title
-        font = pygame.font.Font(None, 64)
-        title = font.render("OPTIONS", True, NEON_BLUE)
+        title = self.text_cache.render("OPTIONS", 64, NEON_BLUE)
         title_rect = title.get_rect(center=(SCREEN_WIDTH//2, 100))
         self.screen.blit(title, title_rect)
         
         # Options placeholder
-        option_font = pygame.font.Font(None, 32)
         options = [
             "Audio Settings",
             "Video Settings", 
@@ -346,27 +493,53 @@ class CyberpunkArcade:
         ]
         
         for i, option in enumerate(options):
-            text = option_font.render(option, True, NEON_GREEN)
+            text = self.text_cache.render(option, 32, NEON_GREEN)
             text_rect = text.get_rect(center=(SCREEN_WIDTH//2, 200 + i*60))
             self.screen.blit(text, text_rect)
     
     def quit_game(self):
         """Cleanup and quit the game"""
-        print("Shutting down game...")
-        self._save_game_data()
+        self.shutdown()
         pygame.quit()
         sys.exit()
     
+    def shutdown(self):
+        """Release assets and write out replays and saved data, leaving pygame running"""
+        print("Shutting down game...")
+        stats = self.text_cache.stats()
+        print(f"Text cache: {stats['hits']} hits, {stats['misses']} misses ({stats['hit_rate']:.1%} hit rate)")
+        stats = self.assets.stats()
+        print(f"Asset cache: {stats['entries']} images, {stats['bytes'] // 1024} KB, {stats['evictions']} evictions")
+        self.assets.close()
+        self.finish_recording()
+        self.close_game()
+        self._save_game_data()
+        if self.saves.close():
+            print("Game data saved successfully")
+        else:
+            print(f"⚠️ Game data still saving after {SAVE_FLUSH_TIMEOUT:.0f} s - the last changes may be lost")
+    
     def add_score(self, points):
         """Add points to total score"""
         self.score += points
         if self.score > self.high_score:
             self.high_score = self.score
+            self.saves.save_stat('high_score', self.high_score)
+    
+    def record_score(self, game_id, score):
+        """Keep a finished game's score if it beats that game's best"""
+        if game_id is None or score <= self.high_scores.get(game_id, 0):
+            return False
+        self.high_scores[game_id] = score
+        self.saves.submit_score(game_id, score)
+        print(f"🏆 New {GAMES[game_id]} high score: {score}")
+        return True
     
     def unlock_achievement(self, achievement_id):
         """Unlock an achievement"""
         if achievement_id in ACHIEVEMENTS and achievement_id not in self.achievements:
             self.achievements[achievement_id] = True
+            self.saves.unlock(achievement_id)
             achievement = ACHIEVEMENTS[achievement_id]
             print(f"Achievement Unlocked: {achievement['name']} - {achievement['description']}")
             return True
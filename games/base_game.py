@@ -1,27 +1,65 @@
 import pygame
+import random
 from config import *
 
 class BaseGame:
-    def __init__(self,game_engine):
+    # Games that report every changed region via game_engine.mark_dirty()
+    # set this so the engine can push only those regions in dirty-rect mode
+    tracks_dirty_rects = False
+    
+    # Games drawn over the engine's parallax skyline; games that paint the
+    # whole screen themselves turn this off to skip drawing it
+    use_parallax = True
+    
+    # Methods the profiler overlay times while it is enabled
+    profile_phases = ("update", "render")
+    
+    # Set by the game registry; games built outside it don't record high scores
+    game_id = None
+
+    def __init__(self, game_engine, seed=None):
         self.game_engine = game_engine
+        
+        # Every random choice a game makes comes from its own seeded stream,
+        # so a recorded seed plus recorded input replays the same session
+        self.seed = seed if seed is not None else random.randrange(2**32)
+        self.rng = random.Random(self.seed)
+        
         self.screen = game_engine.screen
+        self.text_cache = game_engine.text_cache
+        self.assets = game_engine.assets
         self.running = True
         self.score = 0
 
 
-    def update(self):
-        """Update game logic - to be implemented by child classes"""
+    def update(self, dt, input_state):
+        """Advance game logic by one fixed tick of dt seconds - to be implemented by child classes
+
+        input_state is the engine's InputState: held keys/buttons plus the
+        presses and releases since the previous tick.
+        """
         pass
 
-    def render(self):
-        """Render game - to be implemented by child classes"""
+    def render(self, alpha=1.0):
+        """Render game - to be implemented by child classes
+
+        alpha (0.0 - 1.0) is the fraction of a tick elapsed since the last
+        update, for interpolating moving objects between ticks.
+        """
         pass
 
-    def handle_input(self):
+    def handle_input(self, input_state):
         """Handle input - to be implemented by child classes"""
         pass
 
+    def close(self):
+        """Stop anything the game runs in the background - called when it ends
+        and when the engine drops it (a new game starting, quitting)"""
+        pass
+
     def end_game(self):
         """End the current game"""
         self.running = False
+        self.close()
+        self.game_engine.record_score(self.game_id, self.score)
         self.game_engine.current_state = "main_menu"
\ No newline at end of file
@@ -0,0 +1,195 @@
+# games/code_breaker/ciphers.py
+import base64
+import string
+
+ALPHABET = string.ascii_uppercase
+
+# Every shift of the alphabet as a translate table, for both letter cases
+SHIFT_TABLES = [str.maketrans(ALPHABET + ALPHABET.lower(),
+                              ALPHABET[k:] + ALPHABET[:k] + ALPHABET.lower()[k:] + ALPHABET.lower()[:k])
+                for k in range(26)]
+
+# Character -> "01000001 " (one byte of Latin-1 per character)
+BINARY_TABLE = str.maketrans({chr(i): format(i, '08b') + ' ' for i in range(256)})
+
+
+class Cipher:
+    """A reversible text transform
+
+    Subclasses implement encrypt() and decrypt(). Ciphers compose with
+    `+`: (Reverse() + Caesar(13)).encrypt(text) reverses first, then shifts,
+    and decrypt() undoes the steps in the opposite order.
+    """
+
+    name = "cipher"
+
+    def encrypt(self, text):
+        raise NotImplementedError
+
+    def decrypt(self, text):
+        raise NotImplementedError
+
+    def describe(self):
+        """Short human-readable description, used for puzzle hints"""
+        return self.name
+
+    def __add__(self, other):
+        return Chain(self, other)
+
+
+class Chain(Cipher):
+    name = "chain"
+
+    def __init__(self, *ciphers):
+        self.ciphers = []
+        for cipher in ciphers:
+            # Flatten nested chains so a + b + c is one flat list
+            self.ciphers.extend(cipher.ciphers if isinstance(cipher, Chain) else [cipher])
+
+    def encrypt(self, text):
+        for cipher in self.ciphers:
+            text = cipher.encrypt(text)
+        return text
+
+    def decrypt(self, text):
+        for cipher in reversed(self.ciphers):
+            text = cipher.decrypt(text)
+        return text
+
+    def describe(self):
+        return ", then ".join(cipher.describe() for cipher in self.ciphers)
+
+
+class Caesar(Cipher):
+    name = "caesar"
+
+    def __init__(self, shift):
+        self.shift = shift % 26
+        self.forward = SHIFT_TABLES[self.shift]
+        self.backward = SHIFT_TABLES[-self.shift % 26]
+
+    def encrypt(self, text):
+        return text.translate(self.forward)
+
+    def decrypt(self, text):
+        return text.translate(self.backward)
+
+    def describe(self):
+        return f"shift letters by {self.shift}"
+
+
+class Substitution(Cipher):
+    name = "substitution"
+
+    def __init__(self, key):
+        """key is the 26 cipher letters for A-Z, e.g. a shuffled alphabet"""
+        key = key.upper()
+        if sorted(key) != list(ALPHABET):
+            raise ValueError("substitution key must be a permutation of A-Z")
+        self.key = key
+        self.forward = str.maketrans(ALPHABET + ALPHABET.lower(), key + key.lower())
+        self.backward = str.maketrans(key + key.lower(), ALPHABET + ALPHABET.lower())
+
+    @classmethod
+    def random(cls, rng):
+        letters = list(ALPHABET)
+        rng.shuffle(letters)
+        return cls("".join(letters))
+
+    @property
+    def mapping(self):
+        return dict(zip(ALPHABET, self.key))
+
+    def encrypt(self, text):
+        return text.translate(self.forward)
+
+    def decrypt(self, text):
+        return text.translate(self.backward)
+
+    def describe(self):
+        return "replace each letter with another"
+
+
+class Reverse(Cipher):
+    name = "reverse"
+
+    def encrypt(self, text):
+        return text[::-1]
+
+    def decrypt(self, text):
+        return text[::-1]
+
+    def describe(self):
+        return "reverse the text"
+
+
+class Binary(Cipher):
+    """Each character as 8 binary digits, separated by spaces"""
+
+    name = "binary"
+
+    def encrypt(self, text):
+        return text.translate(BINARY_TABLE)[:-1]
+
+    def decrypt(self, text):
+        return "".join(chr(int(byte, 2)) for byte in text.split())
+
+    def describe(self):
+        return "write each character as 8-bit binary"
+
+
+class Vigenere(Cipher):
+    """Caesar shifts cycling through a keyword; non-letters don't use up the key"""
+
+    name = "vigenere"
+
+    def __init__(self, keyword):
+        keyword = keyword.upper()
+        if not keyword or not keyword.isalpha() or not keyword.isascii():
+            raise ValueError("Vigenère keyword must be letters A-Z")
+        self.keyword = keyword
+        shifts = [ALPHABET.index(letter) for letter in keyword]
+        self.forward = [SHIFT_TABLES[shift] for shift in shifts]
+        self.backward = [SHIFT_TABLES[-shift % 26] for shift in shifts]
+
+    def _apply(self, text, tables):
+        out = []
+        period = len(tables)
+        i = 0
+        for char in text:
+            if char.isascii() and char.isalpha():
+                out.append(char.translate(tables[i % period]))
+                i += 1
+            else:
+                out.append(char)
+        return "".join(out)
+
+    def encrypt(self, text):
+        return self._apply(text, self.forward)
+
+    def decrypt(self, text):
+        return self._apply(text, self.backward)
+
+    def describe(self):
+        return f"Vigenère with a {len(self.keyword)}-letter keyword"
+
+
+class XorBase64(Cipher):
+    """UTF-8 bytes XORed with a one-byte key, then base64-encoded"""
+
+    name = "xor_base64"
+
+    def __init__(self, key):
+        if not 0 < key < 256:
+            raise ValueError("XOR key must be a single byte (1-255)")
+        self.key = key
+        self.table = bytes(i ^ key for i in range(256))
+
+    def encrypt(self, text):
+        return base64.b64encode(text.encode("utf-8").translate(self.table)).decode("ascii")
+
+    def decrypt(self, text):
+        return base64.b64decode(text).translate(self.table).decode("utf-8")
+
+    def describe(self):
+        return f"XOR each byte with {self.key}, then base64"
@@ -1,138 +1,109 @@
 # games/code_breaker/code_breaker.py
 import pygame
-import random
-import string
 from games.base_game import BaseGame
+from games.code_breaker.hint_system import HintSolver
+from games.code_breaker.puzzle import LEVEL_KINDS, build_levels
+from utils.text_utils import TextBlock
 from config import *
 
+PUZZLES_PER_LEVEL = 8
+HINT_REFRESH_FRAMES = 15  # frames between redraws of the solver's closest guess
+TEXT_WIDTH = SCREEN_WIDTH - 100
+
 class CodeBreaker(BaseGame):
-    def __init__(self, game_engine):
-        super().__init__(game_engine)
+    def __init__(self, game_engine, seed=None):
+        super().__init__(game_engine, seed)
         self.game_active = True
         self.current_level = 1
-        self.max_levels = 5
+        self.max_levels = len(LEVEL_KINDS)
         self.current_puzzle = None
         
+        # Every level's puzzles are built up front, so advancing a level
+        # only picks one
+        self.level_puzzles = build_levels(self.rng, PUZZLES_PER_LEVEL)
+        
+        # Frequency-analysis solver working on the puzzle in the background
+        self.hints = HintSolver(seed=self.seed)
+        self.show_hints = True
+        self.hint_line = None
+        self.hint_refresh = 0
+        
+        # Letters the player has pinned for the solver: cipher letter -> plain
+        # letter. fixing is None, or the cipher letter picked so far after TAB
+        self.fixed_letters = {}
+        self.fixing = None
+        
+        # Long ciphertexts and guesses wrap instead of running off screen
+        self.cipher_block = TextBlock(self.text_cache.fonts, 36, WHITE, TEXT_WIDTH)
+        self.guess_block = TextBlock(self.text_cache.fonts, 24, NEON_YELLOW, TEXT_WIDTH)
+        
         self.initialize_puzzle()
         print("Code Breaker started! Crack the codes before time runs out!")
         
     def initialize_puzzle(self):
-        if self.current_level == 1:
-            self.current_puzzle = self.create_caesar_cipher()
-        elif self.current_level == 2:
-            self.current_puzzle = self.create_substitution_cipher()
-        elif self.current_level == 3:
-            self.current_puzzle = self.create_reverse_cipher()
-        elif self.current_level == 4:
-            self.current_puzzle = self.create_binary_cipher()
-        else:
-            self.current_puzzle = self.create_mixed_cipher()
-            
-    def create_caesar_cipher(self):
-        # Caesar cipher - shift letters
-        plaintext = "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG"
-        shift = random.randint(1, 25)
-        ciphertext = ""
-        
-        for char in plaintext:
-            if char.isalpha():
-                shifted = chr((ord(char) - 65 + shift) % 26 + 65)
-                ciphertext += shifted
-            else:
-                ciphertext += char
-                
-        return {
-            'type': 'caesar',
-            'ciphertext': ciphertext,
-            'plaintext': plaintext,
-            'shift': shift,
-            'hint': f"Letters are shifted by a fixed number",
-            'time_limit': 120
-        }
-        
-    def create_substitution_cipher(self):
-        # Simple substitution cipher
-        alphabet = list(string.ascii_uppercase)
-        shuffled = alphabet.copy()
-        random.shuffle(shuffled)
-        
-        plaintext = "CRYPTOGRAPHY IS FUN"
-        ciphertext = ""
-        
-        for char in plaintext:
-            if char.isalpha():
-                index = alphabet.index(char)
-                ciphertext += shuffled[index]
-            else:
-                ciphertext += char
-                
-        return {
-            'type': 'substitution',
-            'ciphertext': ciphertext,
-            'plaintext': plaintext,
-            'mapping': dict(zip(alphabet, shuffled)),
-            'hint': "Each letter is consistently replaced with another",
-            'time_limit': 180
-        }
-        
-    def create_reverse_cipher(self):
-        # Reverse the text
-        plaintext = "REVERSE THIS MESSAGE"
-        ciphertext = plaintext[::-1]
-        
-        return {
-            'type': 'reverse',
-            'ciphertext': ciphertext,
-            'plaintext': plaintext,
-            'hint': "The text is reversed",
-            'time_limit': 60
-        }
-        
-    def create_binary_cipher(self):
-        # Convert to binary
-        plaintext = "BINARY"
-        ciphertext = ' '.join(format(ord(c), '08b') for c in plaintext)
-        
-        return {
-            'type': 'binary',
-            'ciphertext': ciphertext,
-            'plaintext': plaintext,
-            'hint': "Convert binary to ASCII characters",
-            'time_limit': 150
-        }
-        
-    def create_mixed_cipher(self):
-        # Mixed challenge
-        plaintext = "FINAL CHALLENGE"
-        # Reverse then Caesar shift
-        reversed_text = plaintext[::-1]
-        shift = 13
-        ciphertext = ""
-        
-        for char in reversed_text:
-            if char.isalpha():
-                shifted = chr((ord(char) - 65 + shift) % 26 + 65)
-                ciphertext += shifted
-            else:
-                ciphertext += char
-                
-        return {
-            'type': 'mixed',
-            'ciphertext': ciphertext,
-            'plaintext': plaintext,
-            'hint': "Combination of multiple techniques",
-            'time_limit': 200
-        }
-        
-    def update(self):
+        self.current_puzzle = self.rng.choice(self.level_puzzles[self.current_level - 1])
+        self.hints.solve(self.current_puzzle)
+        self.hint_line = None
+        self.fixed_letters = {}
+        self.fixing = None
+        self.cipher_block.set_text(self.current_puzzle['ciphertext'])
+        
+    def update(self, dt, input_state):
         if not self.game_active:
             return
             
-        self.handle_input()
+        self.handle_input(input_state)
+        
+    def handle_input(self, input_state):
+        # Answers aren't typed in yet. TAB, a cipher letter, then a plain
+        # letter pins a letter for the solver (BACKSPACE instead of the plain
+        # letter unpins it); otherwise H shows or hides the solver's guess
+        if input_state.just_pressed(pygame.K_TAB):
+            self.fixing = "" if self.fixing is None else None
+            return
         
-    def handle_input(self):
-        # For now, we'll handle input in render. In full version, add text input.
-        pass
+        if self.fixing is None:
+            if input_state.just_pressed(pygame.K_h):
+                self.show_hints = not self.show_hints
+            return
+        
+        if self.fixing and input_state.just_pressed(pygame.K_BACKSPACE):
+            self.unfix_letter(self.fixing)
+            self.fixing = None
+            return
+        
+        letter = self.typed_letter(input_state)
+        if letter is None:
+            return
+        if not self.fixing:
+            self.fixing = letter
+        else:
+            self.fix_letter(self.fixing, letter)
+            self.fixing = None
+            
+    def typed_letter(self, input_state):
+        for i in range(26):
+            if input_state.just_pressed(pygame.K_a + i):
+                return chr(ord('A') + i)
+        return None
+            
+    def fix_letter(self, cipher_letter, plain_letter):
+        """Tell the hint solver the player is sure cipher_letter decrypts to plain_letter"""
+        # As in the solver, a plain letter can only come from one cipher letter
+        for other, plain in list(self.fixed_letters.items()):
+            if plain == plain_letter:
+                del self.fixed_letters[other]
+        self.fixed_letters[cipher_letter] = plain_letter
+        self.hints.fix(cipher_letter, plain_letter)
+        self.hint_refresh = 0
+        
+    def unfix_letter(self, cipher_letter):
+        self.fixed_letters.pop(cipher_letter, None)
+        self.hints.unfix(cipher_letter)
+        self.hint_refresh = 0
+        
+    def close(self):
+        self.hints.stop()
         
     def check_solution(self, user_input):
         if user_input.upper() == self.current_puzzle['plaintext']:
@@ -148,43 +119,66 @@ class CodeBreaker(BaseGame):
             return True
         return False
         
-    def render(self):
+    def render(self, alpha=1.0):
         if not self.current_puzzle:
             return
             
-        # Display puzzle
-        font_large = pygame.font.Font(None, 48)
-        font_medium = pygame.font.Font(None, 36)
-        font_small = pygame.font.Font(None, 24)
-        
         # Title
-        title = font_large.render(f"Code Breaker - Level {self.current_level}", True, NEON_BLUE)
+        title = self.text_cache.render(f"Code Breaker - Level {self.current_level}", 48, NEON_BLUE)
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
         
         # Ciphertext
-        cipher_text = font_medium.render("Ciphertext:", True, NEON_GREEN)
+        cipher_text = self.text_cache.render("Ciphertext:", 36, NEON_GREEN)
         self.screen.blit(cipher_text, (50, 120))
         
-        cipher_display = font_medium.render(self.current_puzzle['ciphertext'], True, WHITE)
-        self.screen.blit(cipher_display, (50, 160))
+        self.cipher_block.blit(self.screen, (50, 160))
+        y = max(220, 160 + self.cipher_block.height + 20)
         
         # Hint
-        hint_text = font_small.render(f"Hint: {self.current_puzzle['hint']}", True, NEON_PURPLE)
-        self.screen.blit(hint_text, (50, 220))
+        hint_text = self.text_cache.render(f"Hint: {self.current_puzzle['hint']}", 24, NEON_PURPLE)
+        self.screen.blit(hint_text, (50, y))
+        y += 30
+        
+        # Closest guess - laid out again a few times a second at most while
+        # the search is still improving it
+        if self.show_hints:
+            self.hint_refresh -= 1
+            if self.hint_line is None or self.hint_refresh <= 0:
+                best = self.hints.best()
+                if best is None:
+                    self.hint_line = "Closest guess: analysing..."
+                else:
+                    self.hint_line = f"Closest guess: {best['guess']}  ({best['detail']})"
+                self.hint_refresh = HINT_REFRESH_FRAMES
+                self.guess_block.set_text(self.hint_line)
+            self.guess_block.blit(self.screen, (50, y))
+            y += max(40, self.guess_block.height + 20)
+        else:
+            y += 40
         
         # Instructions
         instructions = [
             "Type your answer (not implemented in demo)",
+            f"H: {'hide' if self.show_hints else 'show'} the solver's closest guess",
+            self.fixing_line(),
             f"Level {self.current_level}/{self.max_levels}",
             f"Score: {self.score}",
             "Press ESC to return to menu"
         ]
         
         for i, instruction in enumerate(instructions):
-            text = font_small.render(instruction, True, LIGHT_GRAY)
-            self.screen.blit(text, (50, 280 + i*30))
+            text = self.text_cache.render(instruction, 24, LIGHT_GRAY)
+            self.screen.blit(text, (50, y + i*30))
             
         # For demo purposes, show the answer
         if self.current_level <= 3:  # Only show for first few levels as hint
-            answer_text = font_small.render(f"Answer: {self.current_puzzle['plaintext']}", True, NEON_ORANGE)
-            self.screen.blit(answer_text, (SCREEN_WIDTH - 300, SCREEN_HEIGHT - 50))
\ No newline at end of file
+            answer_text = self.text_cache.render(f"Answer: {self.current_puzzle['plaintext']}", 24, NEON_ORANGE)
+            self.screen.blit(answer_text, (SCREEN_WIDTH - 300, SCREEN_HEIGHT - 50))
+            
+    def fixing_line(self):
+        if self.fixing == "":
+            return "Fix a letter: type the cipher letter (TAB cancels)"
+        if self.fixing:
+            return f"Fix {self.fixing} as: type the plain letter, BACKSPACE unfixes {self.fixing}"
+        pinned = ", ".join(f"{cipher}={plain}" for cipher, plain in sorted(self.fixed_letters.items()))
+        return "TAB: fix a letter for the solver" + (f" (fixed: {pinned})" if pinned else "")
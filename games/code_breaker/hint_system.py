@@ -0,0 +1,405 @@
+# games/code_breaker/hint_system.py
+"""
+Code Breaker hint system
+
+Frequency-analysis solvers that score candidate decryptions against letter
+n-gram statistics of English, and a HintSolver service that runs them on a
+worker thread so the game can show a live "closest guess".
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from collections import deque
+from games.code_breaker.ciphers import ALPHABET, Binary, Caesar
+from config import *
+
+NGRAM_CORPUS_PATH = os.path.join(DATA_PATH, "code_breaker", "english_sample.txt")
+
+SPACE = 26  # symbol code for a word break (any run of non-letters)
+SYMBOLS = 27
+
+# Interpolation weights for trigram, bigram and unigram estimates; the
+# bundled corpus is small, so unseen trigrams fall back on the shorter ones
+NGRAM_WEIGHTS = (0.6, 0.3, 0.1)
+
+CLIMB_STALL_LIMIT = 1500  # swaps without improvement before a hill-climb restarts
+CLIMB_RESTARTS = 12  # restarts before the substitution solver settles on its best key
+
+
+def encode(text):
+    """Text as symbol codes: 0-25 for letters, one SPACE per run of anything else"""
+    codes = [SPACE]
+    for char in text.upper():
+        code = ord(char) - 65 if "A" <= char <= "Z" else SPACE
+        if code != SPACE or codes[-1] != SPACE:
+            codes.append(code)
+    if codes[-1] != SPACE:
+        codes.append(SPACE)
+    return codes
+
+
+class NgramModel:
+    """Trigram log-probability table over letters and word breaks
+
+    table[(a * 27 + b) * 27 + c] is log10 P(c | a, b), interpolated with
+    bigram and unigram estimates. Scoring a text sums the table over its
+    trigram windows, so higher scores look more like English.
+    """
+
+    def __init__(self, text):
+        codes = encode(text)
+        unigrams = [1] * SYMBOLS  # add-one smoothing
+        bigrams = [0] * SYMBOLS ** 2
+        trigrams = [0] * SYMBOLS ** 3
+        for i, code in enumerate(codes):
+            unigrams[code] += 1
+            if i >= 1:
+                bigrams[codes[i - 1] * SYMBOLS + code] += 1
+            if i >= 2:
+                trigrams[(codes[i - 2] * SYMBOLS + codes[i - 1]) * SYMBOLS + code] += 1
+
+        total = sum(unigrams)
+        self.unigrams = [math.log10(count / total) for count in unigrams]
+        # Context counts: how often each symbol / pair is followed by something
+        firsts = [sum(bigrams[a * SYMBOLS:(a + 1) * SYMBOLS]) for a in range(SYMBOLS)]
+        pairs = [sum(trigrams[ab * SYMBOLS:(ab + 1) * SYMBOLS]) for ab in range(SYMBOLS ** 2)]
+
+        w3, w2, w1 = NGRAM_WEIGHTS
+        table = [0.0] * SYMBOLS ** 3
+        for ab in range(SYMBOLS ** 2):
+            b = ab % SYMBOLS
+            for c in range(SYMBOLS):
+                p1 = unigrams[c] / total
+                p2 = bigrams[b * SYMBOLS + c] / firsts[b] if firsts[b] else p1
+                p3 = trigrams[ab * SYMBOLS + c] / pairs[ab] if pairs[ab] else p2
+                table[ab * SYMBOLS + c] = math.log10(w3 * p3 + w2 * p2 + w1 * p1)
+        self.table = table
+
+    def window(self, a, b, c):
+        return self.table[(a * SYMBOLS + b) * SYMBOLS + c]
+
+    def score(self, codes):
+        table = self.table
+        return sum(table[(codes[i] * SYMBOLS + codes[i + 1]) * SYMBOLS + codes[i + 2]]
+                   for i in range(len(codes) - 2))
+
+    def score_text(self, text):
+        return self.score(encode(text))
+
+
+_models = {}
+_models_lock = threading.Lock()
+
+
+def ngram_model(path=NGRAM_CORPUS_PATH):
+    """The n-gram model for a training text, built once per process"""
+    with _models_lock:
+        model = _models.get(path)
+        if model is None:
+            with open(path, encoding="utf-8") as f:
+                text = "".join(line for line in f if not line.startswith("#"))
+            model = _models[path] = NgramModel(text)
+        return model
+
+
+def rank_caesar(ciphertext, model):
+    """Every Caesar shift as (score, encryption shift, plaintext), best first"""
+    codes = encode(ciphertext)
+    ranked = []
+    for shift in range(26):
+        shifted = [code if code == SPACE else (code - shift) % 26 for code in codes]
+        ranked.append((model.score(shifted), shift, Caesar(shift).decrypt(ciphertext)))
+    ranked.sort(key=lambda candidate: -candidate[0])
+    return ranked
+
+
+class SubstitutionClimber:
+    """Hill-climbing search for a substitution key, scored incrementally
+
+    key[c] is the plain letter for cipher letter c. A move swaps two
+    entries; only the trigram windows that contain those cipher letters are
+    rescored, so a move costs a handful of table lookups however long the
+    text is. Letters the player fixes are pinned in place and the search
+    carries on from its current key instead of starting over.
+    """
+
+    def __init__(self, ciphertext, model, rng):
+        self.ciphertext = ciphertext
+        self.model = model
+        self.rng = rng
+        self.codes = encode(ciphertext)
+        self.fixed = {}  # cipher letter -> plain letter, both as codes
+
+        # Window i covers codes[i:i + 3]; record which windows each cipher letter touches
+        self.window_count = max(0, len(self.codes) - 2)
+        touching = [set() for _ in range(26)]
+        for i, code in enumerate(self.codes):
+            if code != SPACE:
+                for start in range(max(0, i - 2), min(i, self.window_count - 1) + 1):
+                    touching[code].add(start)
+        self.windows = [sorted(starts) for starts in touching]
+        self.present = [c for c in range(26) if self.windows[c]]
+
+        self.key = self.frequency_key()
+        self.rescore()
+        self.best_key = list(self.key)
+        self.best_score = self.score
+        self.stall = 0
+        self.restarts = 0
+        self.iterations = 0
+
+    def frequency_key(self):
+        """Map cipher letters to plain letters by matching frequency ranks"""
+        counts = [0] * 26
+        for code in self.codes:
+            if code != SPACE:
+                counts[code] += 1
+        english = sorted(range(26), key=lambda c: -self.model.unigrams[c])
+        cipher = sorted(range(26), key=lambda c: -counts[c])
+        key = [0] * 26
+        for cipher_letter, plain_letter in zip(cipher, english):
+            key[cipher_letter] = plain_letter
+        self.apply_fixed(key)
+        return key
+
+    def apply_fixed(self, key):
+        """Swap entries so every fixed cipher letter maps to its plain letter"""
+        for cipher_letter, plain_letter in self.fixed.items():
+            other = key.index(plain_letter)
+            key[cipher_letter], key[other] = key[other], key[cipher_letter]
+
+    def window_score(self, start):
+        key = self.key
+        a, b, c = self.codes[start:start + 3]
+        return self.model.window(key[a] if a != SPACE else SPACE,
+                                 key[b] if b != SPACE else SPACE,
+                                 key[c] if c != SPACE else SPACE)
+
+    def rescore(self):
+        self.window_scores = [self.window_score(i) for i in range(self.window_count)]
+        self.score = sum(self.window_scores)
+
+    def step(self, iterations):
+        """Try up to `iterations` swaps; returns False once the search has settled"""
+        rng = self.rng
+        key = self.key
+        window_scores = self.window_scores
+        movable = [c for c in range(26) if c not in self.fixed]
+        present = [c for c in self.present if c not in self.fixed]
+        if not present or len(movable) < 2:
+            return False
+
+        for _ in range(iterations):
+            a = rng.choice(present)
+            b = rng.choice(movable)
+            if a == b:
+                continue
+            self.iterations += 1
+
+            affected = set(self.windows[a])
+            affected.update(self.windows[b])
+            before = sum(window_scores[i] for i in affected)
+            key[a], key[b] = key[b], key[a]
+            after_scores = [(i, self.window_score(i)) for i in affected]
+            after = sum(score for _, score in after_scores)
+
+            if after > before:
+                for i, score in after_scores:
+                    window_scores[i] = score
+                self.score += after - before
+                self.stall = 0
+                if self.score > self.best_score:
+                    self.best_score = self.score
+                    self.best_key = list(key)
+            else:
+                key[a], key[b] = key[b], key[a]
+                self.stall += 1
+                if self.stall >= CLIMB_STALL_LIMIT:
+                    if self.restarts >= CLIMB_RESTARTS:
+                        return False
+                    self.restart()
+                    key = self.key
+                    window_scores = self.window_scores
+        return True
+
+    def restart(self):
+        """Jump to a random key that keeps the fixed letters"""
+        self.restarts += 1
+        self.stall = 0
+        self.key = list(range(26))
+        self.rng.shuffle(self.key)
+        self.apply_fixed(self.key)
+        self.rescore()
+
+    def fix(self, cipher_letter, plain_letter):
+        """Pin a cipher letter (A-Z) to a plain letter and keep searching from here"""
+        cipher_code = ALPHABET.index(cipher_letter.upper())
+        plain_code = ALPHABET.index(plain_letter.upper())
+        # A plain letter can only come from one cipher letter
+        for other, plain in list(self.fixed.items()):
+            if plain == plain_code:
+                del self.fixed[other]
+        self.fixed[cipher_code] = plain_code
+        self._constraints_changed()
+
+    def unfix(self, cipher_letter):
+        self.fixed.pop(ALPHABET.index(cipher_letter.upper()), None)
+        self._constraints_changed()
+
+    def _constraints_changed(self):
+        self.apply_fixed(self.key)
+        self.rescore()
+        self.best_key = list(self.key)
+        self.best_score = self.score
+        self.apply_fixed(self.best_key)
+        self.stall = 0
+        self.restarts = 0
+
+    def guess(self):
+        table = str.maketrans(ALPHABET, "".join(ALPHABET[plain] for plain in self.best_key))
+        return self.ciphertext.translate(table)
+
+
+class HintSolver:
+    """Runs the solvers on a worker thread and publishes the closest guess
+
+    The game calls solve() when a puzzle starts and fix()/unfix() when the
+    player pins letters; best() returns the latest result without waiting.
+    The worker does HINT_WORK_SLICE seconds of search at a time and then
+    sleeps, so it never holds the interpreter long enough to cost a frame.
+    It exits once the search has settled and restarts on the next command.
+    """
+
+    def __init__(self, model=None, seed=None):
+        self.model = model
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.commands = deque()
+        self.thread = None
+        self.job = None  # worker-side state of the current puzzle
+        self.result = None
+        # Bumped by every solve/stop; results from an older job are dropped
+        self.generation = 0
+
+    # Game side --------------------------------------------------------------
+
+    def solve(self, puzzle):
+        """Start working on a new puzzle (a Code Breaker puzzle dict)"""
+        self._send(("solve", puzzle))
+
+    def fix(self, cipher_letter, plain_letter):
+        self._send(("fix", cipher_letter, plain_letter))
+
+    def unfix(self, cipher_letter):
+        self._send(("unfix", cipher_letter))
+
+    def best(self):
+        """Latest result dict (guess, detail, score, done) or None"""
+        with self.lock:
+            return self.result
+
+    def stop(self):
+        self._send(("stop",))
+
+    def _send(self, command):
+        with self.lock:
+            if command[0] in ("solve", "stop"):
+                self.generation += 1
+                self.result = None
+            self.commands.append((self.generation, command))
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._worker, name="code-breaker-hints", daemon=True)
+                self.thread.start()
+
+    # Worker side ------------------------------------------------------------
+
+    def _worker(self):
+        if self.model is None:
+            self.model = ngram_model()
+
+        while True:
+            with self.lock:
+                commands = list(self.commands)
+                self.commands.clear()
+                if not commands and (self.job is None or self.job["done"]):
+                    self.thread = None
+                    return
+            for generation, command in commands:
+                self._handle(generation, command)
+
+            job = self.job
+            if job is None or job["done"]:
+                continue
+
+            deadline = time.perf_counter() + HINT_WORK_SLICE
+            climber = job["climber"]
+            while time.perf_counter() < deadline:
+                if not climber.step(200):
+                    job["done"] = True
+                    break
+            self._publish_climber(job)
+            time.sleep(HINT_PAUSE)
+
+    def _handle(self, generation, command):
+        if command[0] == "stop":
+            self.job = None
+        elif command[0] == "solve":
+            self.job = self._start(command[1], generation)
+        elif self.job is not None and self.job.get("climber") is not None:
+            climber = self.job["climber"]
+            if command[0] == "fix":
+                climber.fix(command[1], command[2])
+            else:
+                climber.unfix(command[1])
+            self.job["done"] = False
+
+    def _start(self, puzzle, generation):
+        """Solve the quick kinds outright; set up a hill-climb for substitution"""
+        kind = puzzle['type']
+        ciphertext = puzzle['ciphertext']
+        result = None
+
+        if kind in ("caesar", "mixed"):
+            # Mixed puzzles are reversed, then shifted
+            text = ciphertext[::-1] if kind == "mixed" else ciphertext
+            ranked = rank_caesar(text, self.model)
+            score, shift, guess = ranked[0]
+            others = ", ".join(str(candidate[1]) for candidate in ranked[1:3])
+            detail = f"shift {shift}" + (" after reversing" if kind == "mixed" else "") + f" (next: {others})"
+            result = {'guess': guess, 'detail': detail, 'score': score, 'done': True}
+        elif kind == "reverse":
+            guess = ciphertext[::-1]
+            result = {'guess': guess, 'detail': "read it backwards",
+                      'score': self.model.score_text(guess), 'done': True}
+        elif kind == "binary":
+            guess = Binary().decrypt(ciphertext)
+            result = {'guess': guess, 'detail': "8 bits per character",
+                      'score': self.model.score_text(guess), 'done': True}
+        elif kind == "substitution":
+            climber = SubstitutionClimber(ciphertext, self.model, random.Random(self.rng.random()))
+            job = {'puzzle': puzzle, 'climber': climber, 'done': False, 'generation': generation}
+            self._publish_climber(job)
+            return job
+
+        self._publish(generation, result)
+        return {'puzzle': puzzle, 'climber': None, 'done': True, 'generation': generation}
+
+    def _publish_climber(self, job):
+        climber = job["climber"]
+        result = {
+            'guess': climber.guess(),
+            'detail': f"{climber.iterations} keys tried, {len(climber.fixed)} letters fixed",
+            'score': climber.best_score,
+            'done': job["done"]
+        }
+        self._publish(job["generation"], result)
+
+    def _publish(self, generation, result):
+        # A solve() or stop() sent while this job was mid-slice has already
+        # cleared the result; don't bring the old puzzle's guess back
+        with self.lock:
+            if generation == self.generation:
+                self.result = result
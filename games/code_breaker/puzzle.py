@@ -0,0 +1,165 @@
+# games/code_breaker/puzzle.py
+"""
+Code Breaker puzzle generation
+
+Puzzles are built from a plaintext corpus with the table-driven ciphers in
+ciphers.py. A whole batch costs a few microseconds per puzzle, so the game
+prebuilds every level's puzzles when it starts, and level packs can be
+generated offline:
+
+Usage: python -m games.code_breaker.puzzle [--count N] [--kind KIND ...] [--seed N]
+                                           [--corpus FILE] [--output FILE]
+"""
+
+import argparse
+import json
+import random
+import time
+from games.code_breaker.ciphers import Binary, Caesar, Reverse, Substitution, Vigenere, XorBase64
+
+PLAINTEXT_CORPUS = (
+    "THE QUICK BROWN FOX JUMPS OVER THE LAZY DOG",
+    "CRYPTOGRAPHY IS FUN",
+    "REVERSE THIS MESSAGE",
+    "FINAL CHALLENGE",
+    "NEVER REUSE YOUR PASSWORDS",
+    "PATCH EARLY AND PATCH OFTEN",
+    "TRUST BUT VERIFY",
+    "THE FIREWALL IS UP",
+    "ENCRYPT DATA AT REST",
+    "PHISHING EMAILS LOOK URGENT",
+    "LEAST PRIVILEGE WINS",
+    "DEFENSE IN DEPTH",
+    "THE KEY IS UNDER THE MAT",
+    "MEET ME AT THE DATA CENTER",
+    "ROTATE YOUR KEYS",
+    "SOCIAL ENGINEERING WORKS",
+    "ZERO DAY DETECTED",
+    "BACKUPS SAVE LIVES",
+    "LOG EVERYTHING",
+    "ENABLE TWO FACTOR AUTH",
+    "BINARY", "PACKET", "CIPHER", "HACKER", "ROUTER", "SERVER",
+    "KERNEL", "BORDER", "PROXY", "TOKEN", "CACHE", "SHELL",
+)
+
+VIGENERE_KEYWORDS = ("KEY", "CODE", "NEON", "CYBER", "MATRIX", "GHOST")
+
+
+def caesar_puzzle(rng):
+    cipher = Caesar(rng.randint(1, 25))
+    return cipher, {'shift': cipher.shift}
+
+
+def substitution_puzzle(rng):
+    cipher = Substitution.random(rng)
+    return cipher, {'mapping': cipher.mapping}
+
+
+def reverse_puzzle(rng):
+    return Reverse(), {}
+
+
+def binary_puzzle(rng):
+    return Binary(), {}
+
+
+def mixed_puzzle(rng):
+    # Reverse then Caesar shift
+    return Reverse() + Caesar(13), {}
+
+
+def vigenere_puzzle(rng):
+    cipher = Vigenere(rng.choice(VIGENERE_KEYWORDS))
+    return cipher, {'keyword': cipher.keyword}
+
+
+def xor_base64_puzzle(rng):
+    cipher = XorBase64(rng.randint(1, 255))
+    return cipher, {'key': cipher.key}
+
+
+# kind -> (cipher factory, hint, time limit in seconds, longest plaintext)
+PUZZLE_KINDS = {
+    'caesar': (caesar_puzzle, "Letters are shifted by a fixed number", 120, None),
+    'substitution': (substitution_puzzle, "Each letter is consistently replaced with another", 180, None),
+    'reverse': (reverse_puzzle, "The text is reversed", 60, None),
+    'binary': (binary_puzzle, "Convert binary to ASCII characters", 150, 8),
+    'mixed': (mixed_puzzle, "Combination of multiple techniques", 200, None),
+    'vigenere': (vigenere_puzzle, "Each letter is shifted by a repeating keyword", 240, None),
+    'xor_base64': (xor_base64_puzzle, "Base64 hides bytes XORed with a single key", 240, 16),
+}
+
+# The game's levels, in order
+LEVEL_KINDS = ('caesar', 'substitution', 'reverse', 'binary', 'mixed')
+
+
+def make_puzzle(kind, plaintext, rng):
+    """Encrypt one plaintext with a fresh cipher of the given kind"""
+    factory, hint, time_limit, _ = PUZZLE_KINDS[kind]
+    cipher, details = factory(rng)
+    puzzle = {
+        'type': kind,
+        'ciphertext': cipher.encrypt(plaintext),
+        'plaintext': plaintext,
+        'hint': hint,
+        'time_limit': time_limit
+    }
+    puzzle.update(details)
+    return puzzle
+
+
+def generate_batch(kind, count, rng, corpus=PLAINTEXT_CORPUS):
+    """count puzzles of one kind, with plaintexts drawn from the corpus"""
+    max_length = PUZZLE_KINDS[kind][3]
+    plaintexts = [text for text in corpus if max_length is None or len(text) <= max_length]
+    if not plaintexts:
+        raise ValueError(f"no plaintext in the corpus is short enough for {kind} puzzles")
+    return [make_puzzle(kind, rng.choice(plaintexts), rng) for _ in range(count)]
+
+
+def build_levels(rng, per_level, corpus=PLAINTEXT_CORPUS):
+    """Prebuilt puzzles for every game level: [[puzzle, ...] per level]"""
+    return [generate_batch(kind, per_level, rng, corpus) for kind in LEVEL_KINDS]
+
+
+def load_corpus(path):
+    """One plaintext per line; blank lines and # comments are skipped"""
+    with open(path, encoding="utf-8") as f:
+        lines = (line.strip() for line in f)
+        corpus = tuple(line.upper() for line in lines if line and not line.startswith("#"))
+    if not corpus:
+        raise ValueError(f"{path} has no plaintexts")
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate Code Breaker puzzles in bulk")
+    parser.add_argument("--count", type=int, default=1000, help="puzzles per kind")
+    parser.add_argument("--kind", nargs="+", choices=list(PUZZLE_KINDS), default=list(PUZZLE_KINDS),
+                        help="puzzle kinds to generate (default: all)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--corpus", help="plaintext file, one phrase per line")
+    parser.add_argument("--output", help="write the puzzles as JSON lines")
+    args = parser.parse_args()
+
+    corpus = load_corpus(args.corpus) if args.corpus else PLAINTEXT_CORPUS
+    rng = random.Random(args.seed)
+
+    puzzles = []
+    for kind in args.kind:
+        start = time.perf_counter()
+        batch = generate_batch(kind, args.count, rng, corpus)
+        elapsed = time.perf_counter() - start
+        print(f"{kind:<14}{len(batch):>8} puzzles in {elapsed * 1000:8.1f} ms "
+              f"({elapsed / len(batch) * 1e6:.1f} µs each)")
+        puzzles.extend(batch)
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            for puzzle in puzzles:
+                f.write(json.dumps(puzzle) + "\n")
+        print(f"{len(puzzles)} puzzles written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
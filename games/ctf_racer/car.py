@@ -0,0 +1,42 @@
+# games/ctf_racer/car.py
+import pygame
+from utils.math_utils import heading_index, rotate
+
+CAR_LENGTH = 40
+CAR_WIDTH = 20
+CAR_ANGLES = 72  # pre-rotated sprites per full turn (5 degree steps)
+
+# Corners relative to the car's center at heading 0, nose pointing up
+CAR_CORNERS = ((-CAR_WIDTH / 2, -CAR_LENGTH / 2), (CAR_WIDTH / 2, -CAR_LENGTH / 2),
+               (CAR_WIDTH / 2, CAR_LENGTH / 2), (-CAR_WIDTH / 2, CAR_LENGTH / 2))
+
+
+def car_corners(x, y, heading):
+    """Screen-space corners of a car centered on (x, y)"""
+    return [(x + cx, y + cy) for cx, cy in (rotate(px, py, heading) for px, py in CAR_CORNERS)]
+
+
+class CarSprites:
+    """A car body pre-rotated at CAR_ANGLES headings, registered in a SpriteBatch
+
+    Each heading is drawn once as an exact polygon (no rotozoom blur) the
+    first time it is used. Any number of cars - the player's, AI or ghost
+    cars - then cost one queued blit each.
+    """
+
+    def __init__(self, batch, color, name='car', angles=CAR_ANGLES):
+        self.name = name
+        self.angles = angles
+        size = int((CAR_LENGTH ** 2 + CAR_WIDTH ** 2) ** 0.5) + 3
+        anchor = (size // 2, size // 2)
+        for i in range(angles):
+            batch.define((name, i), (size, size), anchor, self._painter(color, i * 360 / angles))
+
+    def _painter(self, color, heading):
+        def paint(surface, pos):
+            pygame.draw.polygon(surface, color, car_corners(pos[0], pos[1], heading))
+        return paint
+
+    def key(self, heading):
+        """Sprite key of the nearest pre-rotated heading"""
+        return (self.name, heading_index(heading, self.angles))
@@ -1,141 +1,178 @@
 # games/ctf_racer/ctf_racer.py
 import pygame
-import random
-import math
 from games.base_game import BaseGame
+from games.ctf_racer.car import CarSprites
+from games.ctf_racer.track import TrackIndex, PointIndex, load_track
+from utils.math_utils import direction
+from utils.render_utils import SpriteBatch, StaticLayer
 from config import *
 
+CHECKPOINT_RADIUS = 100  # how far off the track the car can be and still make progress
+CHALLENGE_RADIUS = 80
+MAX_PROGRESS_STEP = 0.25  # larger forward jumps in lap progress are shortcuts and don't count
+LAP_COMPLETE_PROGRESS = 0.9  # lap progress needed before crossing the start counts as a lap
+OFF_TRACK_DRAG = 0.9  # speed kept per tick while off the track surface
+CHALLENGE_COLORS = {
+    'password_crack': NEON_PURPLE,
+    'port_scan': NEON_ORANGE,
+    'forensics': NEON_GREEN,
+    'steganography': NEON_BLUE
+}
+
 class CTFRacer(BaseGame):
-    def __init__(self, game_engine):
-        super().__init__(game_engine)
+    use_parallax = False  # the track layer covers the whole screen
+    profile_phases = ("update", "handle_input", "update_car", "locate_car", "check_checkpoints",
+                      "check_challenges", "render", "render_ui")
+    
+    def __init__(self, game_engine, seed=None):
+        super().__init__(game_engine, seed)
         self.game_active = True
         self.laps = 0
         self.max_laps = 3
         self.current_challenge = None
         
-        # Car physics
-        self.car_x = SCREEN_WIDTH // 2
-        self.car_y = SCREEN_HEIGHT - 100
-        self.car_speed = 0
-        self.car_max_speed = 8
-        self.car_acceleration = 0.2
-        self.car_rotation = 0
-        
         # Track
+        self.track_seed = self.rng.randrange(TRACK_SEED_COUNT)
         self.track_points = self.generate_track()
         self.current_checkpoint = 0
+        self.lap_start = None  # track progress where the car first joined the track
+        self.lap_progress = 0.0  # fraction of the current lap covered
+        self.track_hit = None  # nearest track segment to the car this tick
+        self.on_track = True
+        
+        # Car physics - start on the line, facing along the track
+        self.car_x, self.car_y = self.track_points[0]
+        self.prev_car_x = self.car_x
+        self.prev_car_y = self.car_y
+        self.car_speed = 0
+        self.car_max_speed = 8
+        self.car_acceleration = 0.2
+        self.car_rotation = self.track.heading(0)
         
         # Challenges
         self.challenges = []
         self.generate_challenges()
         
+        # Track surface, boundaries and instructions are drawn once
+        self.static_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), self.draw_static_layer)
+        
+        # One pre-rendered marker per challenge type
+        self.sprites = SpriteBatch(game_engine.sprite_batching)
+        for challenge_type, color in CHALLENGE_COLORS.items():
+            self.sprites.define(challenge_type, (31, 31), (15, 15),
+                                lambda surface, pos, color=color: pygame.draw.circle(surface, color, pos, 15))
+        self.car_sprites = CarSprites(self.sprites, NEON_RED)
+        
         print("CTF Racer started! Race around the track while solving cybersecurity challenges!")
         
     def generate_track(self):
-        # Simple oval track
-        points = []
-        track_width = 200
-        
-        # Outer track
-        for angle in range(0, 360, 10):
-            rad = math.radians(angle)
-            x = SCREEN_WIDTH//2 + track_width * math.cos(rad)
-            y = SCREEN_HEIGHT//2 + track_width * math.sin(rad)
-            points.append((x, y))
+        # Spline track for this seed - generated once, then loaded from the disk cache
+        self.track = load_track(self.track_seed)
+        points = [tuple(point) for point in self.track.centerline.tolist()]
             
+        # Spatial index for nearest-segment / lap-progress queries
+        self.track_index = TrackIndex(points)
         return points
         
     def generate_challenges(self):
-        challenge_types = ['password_crack', 'port_scan', 'forensics', 'steganography']
+        challenge_types = list(CHALLENGE_COLORS)
         
-        for i in range(4):  # 4 challenges per lap
+        # 4 challenges per lap, evenly spaced by distance and clear of the start line
+        for i, position in enumerate(self.track.checkpoint_indices(4, offset=0.5)):
             self.challenges.append({
-                'type': random.choice(challenge_types),
+                'type': self.rng.choice(challenge_types),
                 'solved': False,
-                'position': i * (len(self.track_points) // 4),
+                'position': position,
                 'question': f"Challenge {i+1}: What is port 22 used for?",
                 'answer': 'ssh',
                 'options': ['HTTP', 'SSH', 'FTP', 'DNS']
             })
+            
+        self.challenge_index = PointIndex([self.track_points[c['position']] for c in self.challenges])
         
-    def update(self):
+    def update(self, dt, input_state):
         if not self.game_active:
             return
             
-        self.handle_input()
+        self.handle_input(input_state)
         self.update_car()
+        self.locate_car()
         self.check_checkpoints()
         self.check_challenges()
         
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
-        
+    def handle_input(self, input_state):
         # Acceleration
-        if keys[pygame.K_UP]:
+        if input_state.pressed(pygame.K_UP):
             self.car_speed = min(self.car_speed + self.car_acceleration, self.car_max_speed)
-        elif keys[pygame.K_DOWN]:
+        elif input_state.pressed(pygame.K_DOWN):
             self.car_speed = max(self.car_speed - self.car_acceleration * 2, -self.car_max_speed/2)
         else:
             # Friction
             self.car_speed *= 0.95
             
         # Steering
-        if keys[pygame.K_LEFT]:
+        if input_state.pressed(pygame.K_LEFT):
             self.car_rotation -= 3
-        if keys[pygame.K_RIGHT]:
+        if input_state.pressed(pygame.K_RIGHT):
             self.car_rotation += 3
             
     def update_car(self):
+        # Remember last tick's position for render interpolation
+        self.prev_car_x = self.car_x
+        self.prev_car_y = self.car_y
+        
         # Update car position based on speed and rotation
-        rad = math.radians(self.car_rotation)
-        self.car_x += self.car_speed * math.sin(rad)
-        self.car_y -= self.car_speed * math.cos(rad)
+        sin, cos = direction(self.car_rotation)
+        self.car_x += self.car_speed * sin
+        self.car_y -= self.car_speed * cos
         
         # Keep car on screen
         self.car_x = max(50, min(SCREEN_WIDTH - 50, self.car_x))
         self.car_y = max(50, min(SCREEN_HEIGHT - 50, self.car_y))
         
+    def locate_car(self):
+        # Nearest track segment, if the car is close enough to the track to make progress
+        self.track_hit = self.track_index.nearest_segment(self.car_x, self.car_y, CHECKPOINT_RADIUS)
+        self.on_track = self.track_hit is not None and self.track_hit[2] <= self.track.half_width
+        
+        # Leaving the track surface slows the car down
+        if not self.on_track:
+            self.car_speed *= OFF_TRACK_DRAG
+            
     def check_checkpoints(self):
-        # Simple checkpoint system based on track proximity
-        car_pos = (self.car_x, self.car_y)
-        
-        # Find nearest track point
-        min_dist = float('inf')
-        nearest_index = 0
-        
-        for i, point in enumerate(self.track_points):
-            dist = math.sqrt((car_pos[0] - point[0])**2 + (car_pos[1] - point[1])**2)
-            if dist < min_dist:
-                min_dist = dist
-                nearest_index = i
-                
-        # Check if passed checkpoint
-        if nearest_index > self.current_checkpoint and min_dist < 100:
-            self.current_checkpoint = nearest_index
+        if self.track_hit is None:
+            return
+        segment, _, _, progress = self.track_hit
+        
+        # Measure the lap from wherever the car joined the track
+        if self.lap_start is None:
+            self.lap_start = progress
+        progress = (progress - self.lap_start) % 1.0
+        
+        advance = progress - self.lap_progress
+        if 0 < advance <= MAX_PROGRESS_STEP:
+            self.lap_progress = progress
+            self.current_checkpoint = segment
+        elif advance < -(1 - MAX_PROGRESS_STEP) and self.lap_progress >= LAP_COMPLETE_PROGRESS:
+            # Crossed the start line having covered the lap
+            self.lap_progress = progress
+            self.current_checkpoint = segment
+            self.laps += 1
+            print(f"🏁 Lap {self.laps}/{self.max_laps} completed!")
             
-            # Completed lap?
-            if self.current_checkpoint >= len(self.track_points) - 10:
-                self.laps += 1
-                self.current_checkpoint = 0
-                print(f"🏁 Lap {self.laps}/{self.max_laps} completed!")
-                
-                if self.laps >= self.max_laps:
-                    self.score += 500
-                    print("🎉 Race complete! All laps finished!")
-                    self.end_game()
+            if self.laps >= self.max_laps:
+                self.score += 500
+                print("🎉 Race complete! All laps finished!")
+                self.end_game()
                     
     def check_challenges(self):
-        car_pos = (self.car_x, self.car_y)
-        
-        for challenge in self.challenges:
+        for i in self.challenge_index.within(self.car_x, self.car_y, CHALLENGE_RADIUS):
+            challenge = self.challenges[i]
             if not challenge['solved']:
-                challenge_pos = self.track_points[challenge['position']]
-                dist = math.sqrt((car_pos[0] - challenge_pos[0])**2 + (car_pos[1] - challenge_pos[1])**2)
-                
-                if dist < 80:
+                if challenge is not self.current_challenge:
                     self.current_challenge = challenge
                     print(f"🚩 Challenge available! {challenge['question']}")
-                    break
+                break
                     
     def solve_challenge(self, answer):
         if self.current_challenge and answer.lower() == self.current_challenge['answer'].lower():
@@ -152,80 +189,71 @@ class CTFRacer(BaseGame):
         else:
             print("❌ Wrong answer! Try again.")
             
-    def render(self):
+    def draw_static_layer(self, surface):
+        surface.fill(BLACK)
+        
+        # Track surface as one quad per centerline segment
+        left = self.track.left.tolist()
+        right = self.track.right.tolist()
+        for i in range(len(left)):
+            j = (i + 1) % len(left)
+            pygame.draw.polygon(surface, DARK_BLUE, (left[i], left[j], right[j], right[i]))
+            
+        # Boundaries and start line
+        pygame.draw.lines(surface, NEON_BLUE, True, left, 2)
+        pygame.draw.lines(surface, NEON_PINK, True, right, 2)
+        pygame.draw.line(surface, WHITE, left[0], right[0], 4)
+        
+        # Instructions
+        instructions = [
+            "↑ ↓ : Accelerate/Brake",
+            "← → : Steer",
+            "Drive near purple circles for challenges",
+            "Leaving the track slows you down",
+            "Complete 3 laps to win!"
+        ]
+        
+        for i, instruction in enumerate(instructions):
+            text = self.text_cache.render(instruction, 24, LIGHT_GRAY)
+            surface.blit(text, (SCREEN_WIDTH - 300, 20 + i*25))
+            
+    def render(self, alpha=1.0):
         # Draw track
-        for i in range(len(self.track_points)):
-            pygame.draw.circle(self.screen, GRAY, (int(self.track_points[i][0]), int(self.track_points[i][1])), 5)
+        self.static_layer.blit(self.screen)
             
         # Draw challenges
         for challenge in self.challenges:
             if not challenge['solved']:
                 pos = self.track_points[challenge['position']]
-                color = NEON_PURPLE if challenge['type'] == 'password_crack' else \
-                       NEON_ORANGE if challenge['type'] == 'port_scan' else \
-                       NEON_GREEN if challenge['type'] == 'forensics' else \
-                       NEON_BLUE
-                pygame.draw.circle(self.screen, color, (int(pos[0]), int(pos[1])), 15)
+                self.sprites.add(challenge['type'], int(pos[0]), int(pos[1]))
                 
-        # Draw car
-        car_points = self.get_car_shape()
-        pygame.draw.polygon(self.screen, NEON_RED, car_points)
+        # Draw car, interpolated between the last two ticks
+        car_x = self.prev_car_x + (self.car_x - self.prev_car_x) * alpha
+        car_y = self.prev_car_y + (self.car_y - self.prev_car_y) * alpha
+        self.sprites.add(self.car_sprites.key(self.car_rotation), int(car_x), int(car_y))
+        self.sprites.flush(self.screen)
         
         # Draw UI
         self.render_ui()
         
-    def get_car_shape(self):
-        # Create car shape based on rotation
-        points = []
-        rad = math.radians(self.car_rotation)
-        
-        # Car corners relative to center
-        corners = [(-20, -10), (20, -10), (20, 10), (-20, 10)]
-        
-        for x, y in corners:
-            # Rotate point
-            rotated_x = x * math.cos(rad) - y * math.sin(rad)
-            rotated_y = x * math.sin(rad) + y * math.cos(rad)
-            
-            # Translate to car position
-            points.append((self.car_x + rotated_x, self.car_y + rotated_y))
-            
-        return points
-        
     def render_ui(self):
-        font = pygame.font.Font(None, 36)
-        
         # Stats
         stats = [
-            f"Lap: {self.laps}/{self.max_laps}",
+            f"Lap: {self.laps}/{self.max_laps} ({int(self.lap_progress * 100)}%)",
             f"Speed: {abs(int(self.car_speed * 10))}",
             f"Score: {self.score}",
             f"Challenges: {sum(1 for c in self.challenges if c['solved'])}/{len(self.challenges)}"
         ]
         
         for i, stat in enumerate(stats):
-            text = font.render(stat, True, NEON_GREEN)
+            text = self.text_cache.render(stat, 36, NEON_GREEN)
             self.screen.blit(text, (20, 20 + i*40))
             
-        # Instructions
-        small_font = pygame.font.Font(None, 24)
-        instructions = [
-            "↑ ↓ : Accelerate/Brake",
-            "← → : Steer",
-            "Drive near purple circles for challenges",
-            "Complete 3 laps to win!"
-        ]
-        
-        for i, instruction in enumerate(instructions):
-            text = small_font.render(instruction, True, LIGHT_GRAY)
-            self.screen.blit(text, (SCREEN_WIDTH - 300, 20 + i*25))
-            
         # Current challenge
         if self.current_challenge:
-            challenge_font = pygame.font.Font(None, 28)
-            challenge_text = challenge_font.render(self.current_challenge['question'], True, NEON_ORANGE)
+            challenge_text = self.text_cache.render(self.current_challenge['question'], 28, NEON_ORANGE)
             self.screen.blit(challenge_text, (SCREEN_WIDTH//2 - challenge_text.get_width()//2, SCREEN_HEIGHT - 100))
             
             # For demo, show answer
-            answer_text = small_font.render(f"Answer: {self.current_challenge['answer']}", True, NEON_GREEN)
+            answer_text = self.text_cache.render(f"Answer: {self.current_challenge['answer']}", 24, NEON_GREEN)
             self.screen.blit(answer_text, (SCREEN_WIDTH//2 - answer_text.get_width()//2, SCREEN_HEIGHT - 70))
\ No newline at end of file
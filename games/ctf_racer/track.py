@@ -0,0 +1,260 @@
+# games/ctf_racer/track.py
+import math
+import os
+import random
+import numpy as np
+from config import *
+
+INDEX_CELL_SIZE = 64  # pixels per spatial-index cell
+
+# Track generation
+TRACK_FORMAT_VERSION = 1  # bump when the generator changes so stale caches are ignored
+CONTROL_POINTS = 8
+ANGLE_JITTER = 0.15  # fraction of the control point spacing
+RADIUS_RANGE = (0.85, 1.0)  # control point distance from the center, relative to the ellipse
+SAMPLES_PER_SEGMENT = 32
+POINT_SPACING = 8  # pixels between centerline points after arc-length resampling
+TRACK_HALF_WIDTH = 50  # kept below the tightest corner radius these settings produce
+
+
+class Track:
+    """A closed race track with everything derived from its centerline precomputed
+
+    centerline, normals, left and right are (N, 2) arrays of evenly spaced
+    points; arc_length[i] is the distance along the track to point i.
+    """
+
+    ARRAYS = ("centerline", "normals", "left", "right", "arc_length")
+
+    def __init__(self, seed, centerline, normals, left, right, arc_length, length, half_width):
+        self.seed = seed
+        self.centerline = centerline
+        self.normals = normals
+        self.left = left
+        self.right = right
+        self.arc_length = arc_length
+        self.length = length
+        self.half_width = half_width
+
+    def __len__(self):
+        return len(self.centerline)
+
+    def index_at(self, distance):
+        """Centerline point index at an arc-length distance (wraps around the lap)"""
+        return int(np.searchsorted(self.arc_length, distance % self.length, side="right")) - 1
+
+    def checkpoint_indices(self, count, offset=0.0):
+        """Point indices of count checkpoints spaced evenly by distance along the track
+
+        offset shifts them by a fraction of the spacing (0.5 puts them between
+        the evenly spaced positions, away from the start line).
+        """
+        return [self.index_at((i + offset) * self.length / count) for i in range(count)]
+
+    def heading(self, index):
+        """Direction of travel at a point, in the car's degrees (0 = up, clockwise)"""
+        # Normals are stored as (ty, -tx) of the unit tangent
+        nx, ny = self.normals[index]
+        tx, ty = -ny, nx
+        return math.degrees(math.atan2(tx, -ty))
+
+    def save(self, path):
+        """Write the track atomically so a crash never leaves a half-written cache"""
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            np.savez(f, version=TRACK_FORMAT_VERSION, seed=self.seed, length=self.length,
+                     half_width=self.half_width, **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            if int(data["version"]) != TRACK_FORMAT_VERSION:
+                raise ValueError(f"Track cache {path} has an old format")
+            return cls(int(data["seed"]), *(data[name] for name in cls.ARRAYS),
+                       float(data["length"]), float(data["half_width"]))
+
+
+def generate_track(seed, control_points=CONTROL_POINTS, half_width=TRACK_HALF_WIDTH):
+    """Build a closed Catmull-Rom track from a seed"""
+    rng = random.Random(seed)
+
+    # Control points jittered around an ellipse filling most of the screen
+    center_x, center_y = SCREEN_WIDTH / 2, SCREEN_HEIGHT / 2
+    radius_x, radius_y = SCREEN_WIDTH * 0.38, SCREEN_HEIGHT * 0.36
+    controls = []
+    for i in range(control_points):
+        angle = 2 * math.pi * (i + rng.uniform(-ANGLE_JITTER, ANGLE_JITTER)) / control_points
+        scale = rng.uniform(*RADIUS_RANGE)
+        controls.append((center_x + radius_x * scale * math.cos(angle),
+                         center_y + radius_y * scale * math.sin(angle)))
+    controls = np.array(controls)
+
+    # Sample every segment of the closed spline at once
+    p0 = np.roll(controls, 1, axis=0)[:, None, :]
+    p1 = controls[:, None, :]
+    p2 = np.roll(controls, -1, axis=0)[:, None, :]
+    p3 = np.roll(controls, -2, axis=0)[:, None, :]
+    t = np.linspace(0, 1, SAMPLES_PER_SEGMENT, endpoint=False)[None, :, None]
+    dense = 0.5 * (2 * p1 + (p2 - p0) * t + (2 * p0 - 5 * p1 + 4 * p2 - p3) * t ** 2 +
+                   (3 * p1 - p0 - 3 * p2 + p3) * t ** 3)
+    dense = dense.reshape(-1, 2)
+
+    # Arc-length parameterization: resample at even spacing along the curve
+    closed = np.vstack([dense, dense[:1]])
+    dense_arc = np.concatenate([[0.0], np.cumsum(np.hypot(*np.diff(closed, axis=0).T))])
+    length = float(dense_arc[-1])
+    arc_length = np.arange(0, length, length / max(3, round(length / POINT_SPACING)))
+    centerline = np.column_stack([np.interp(arc_length, dense_arc, closed[:, 0]),
+                                  np.interp(arc_length, dense_arc, closed[:, 1])])
+
+    # Normals from central-difference tangents, then the boundary polylines
+    tangents = np.roll(centerline, -1, axis=0) - np.roll(centerline, 1, axis=0)
+    tangents /= np.linalg.norm(tangents, axis=1, keepdims=True)
+    normals = np.column_stack([tangents[:, 1], -tangents[:, 0]])
+    left = centerline + normals * half_width
+    right = centerline - normals * half_width
+
+    return Track(seed, centerline, normals, left, right, arc_length, length, half_width)
+
+
+def load_track(seed, cache_dir=TRACK_CACHE_PATH):
+    """Load a track from the disk cache, generating and caching it on a miss"""
+    path = os.path.join(cache_dir, f"track_{seed}_v{TRACK_FORMAT_VERSION}.npz")
+    try:
+        return Track.load(path)
+    except (OSError, ValueError, KeyError):
+        pass
+
+    track = generate_track(seed)
+    try:
+        track.save(path)
+    except OSError as e:
+        print(f"Could not cache track {seed}: {e}")
+    return track
+
+
+class TrackIndex:
+    """Uniform-grid spatial index over a closed track polyline
+
+    Segment i runs from points[i] to points[i + 1] (wrapping at the end).
+    Each segment is registered in every grid cell its bounding box touches,
+    so a nearest-segment query only examines the cells around the car.
+    """
+
+    def __init__(self, points, cell_size=INDEX_CELL_SIZE):
+        self.points = points
+        self.cell_size = cell_size
+        self.cells = {}
+
+        # Arc length at the start of each segment, for progress along the lap
+        self.segment_lengths = []
+        self.segment_starts = []
+        total = 0.0
+        for i in range(len(points)):
+            (x1, y1), (x2, y2) = points[i], points[(i + 1) % len(points)]
+            length = math.hypot(x2 - x1, y2 - y1)
+            self.segment_starts.append(total)
+            self.segment_lengths.append(length)
+            total += length
+
+            for cell in self._cells_in_box(min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)):
+                self.cells.setdefault(cell, []).append(i)
+        self.total_length = total
+
+        cell_xs = [cx for cx, _ in self.cells] or [0]
+        cell_ys = [cy for _, cy in self.cells] or [0]
+        self.bounds = (min(cell_xs), min(cell_ys), max(cell_xs), max(cell_ys))
+
+    def _cell(self, x, y):
+        return int(x // self.cell_size), int(y // self.cell_size)
+
+    def _cells_in_box(self, x1, y1, x2, y2):
+        cx1, cy1 = self._cell(x1, y1)
+        cx2, cy2 = self._cell(x2, y2)
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                yield (cx, cy)
+
+    def _ring(self, cx, cy, r):
+        """Cells at Chebyshev distance exactly r from (cx, cy)"""
+        if r == 0:
+            yield (cx, cy)
+            return
+        for dx in range(-r, r + 1):
+            yield (cx + dx, cy - r)
+            yield (cx + dx, cy + r)
+        for dy in range(-r + 1, r):
+            yield (cx - r, cy + dy)
+            yield (cx + r, cy + dy)
+
+    def project(self, segment, x, y):
+        """Closest point on a segment: returns (t, distance)"""
+        (x1, y1), (x2, y2) = self.points[segment], self.points[(segment + 1) % len(self.points)]
+        dx, dy = x2 - x1, y2 - y1
+        length_sq = dx * dx + dy * dy
+        t = 0.0 if length_sq == 0 else max(0.0, min(1.0, ((x - x1) * dx + (y - y1) * dy) / length_sq))
+        return t, math.hypot(x - (x1 + dx * t), y - (y1 + dy * t))
+
+    def nearest_segment(self, x, y, max_distance=math.inf):
+        """Nearest segment to (x, y) within max_distance
+
+        Returns (segment, t, distance, progress) where progress is the lap
+        fraction (0.0 - 1.0) at the closest point, or None if nothing is in range.
+        """
+        cx, cy = self._cell(x, y)
+        min_x, min_y, max_x, max_y = self.bounds
+        max_ring = max(abs(cx - min_x), abs(cx - max_x), abs(cy - min_y), abs(cy - max_y))
+
+        best = None
+        best_distance = max_distance
+        checked = set()
+
+        for r in range(max_ring + 1):
+            # Anything in ring r is at least (r - 1) cells away from the query point
+            if (r - 1) * self.cell_size > best_distance:
+                break
+            for cell in self._ring(cx, cy, r):
+                for segment in self.cells.get(cell, ()):
+                    if segment in checked:
+                        continue
+                    checked.add(segment)
+                    t, distance = self.project(segment, x, y)
+                    if distance <= best_distance:
+                        best = (segment, t)
+                        best_distance = distance
+
+        if best is None:
+            return None
+        segment, t = best
+        progress = (self.segment_starts[segment] + t * self.segment_lengths[segment]) / self.total_length
+        return segment, t, best_distance, progress
+
+
+class PointIndex:
+    """Uniform-grid index answering "which points are within a radius" queries"""
+
+    def __init__(self, points, cell_size=INDEX_CELL_SIZE):
+        self.points = points
+        self.cell_size = cell_size
+        self.cells = {}
+        for i, (x, y) in enumerate(points):
+            self.cells.setdefault((int(x // cell_size), int(y // cell_size)), []).append(i)
+
+    def within(self, x, y, radius):
+        """Indices of points within radius of (x, y), nearest first"""
+        cx1, cy1 = int((x - radius) // self.cell_size), int((y - radius) // self.cell_size)
+        cx2, cy2 = int((x + radius) // self.cell_size), int((y + radius) // self.cell_size)
+
+        found = []
+        for cx in range(cx1, cx2 + 1):
+            for cy in range(cy1, cy2 + 1):
+                for i in self.cells.get((cx, cy), ()):
+                    px, py = self.points[i]
+                    distance = math.hypot(x - px, y - py)
+                    if distance <= radius:
+                        found.append((distance, i))
+
+        found.sort()
+        return [i for _, i in found]
@@ -0,0 +1,163 @@
+# games/firewall_defender/entities.py
+import numpy as np
+
+# health, speed (cells per second), reward
+ENEMY_TYPES = {
+    'virus': (30, 3.0, 20),
+    'trojan': (50, 1.8, 30),
+    'ransomware': (80, 1.2, 50),
+}
+
+# Enemy type codes stored in EnemyStore.kind
+ENEMY_KINDS = tuple(ENEMY_TYPES)
+ENEMY_HEALTH = np.array([ENEMY_TYPES[kind][0] for kind in ENEMY_KINDS], dtype=np.float32)
+ENEMY_SPEED = np.array([ENEMY_TYPES[kind][1] for kind in ENEMY_KINDS], dtype=np.float32)
+ENEMY_REWARD = np.array([ENEMY_TYPES[kind][2] for kind in ENEMY_KINDS], dtype=np.int32)
+
+
+class EnemyStore:
+    """Struct-of-arrays malware storage walking the flow field
+
+    Live enemies occupy rows [0, count). Cells are grid cell ids (see
+    GridMap.cell_id); progress is the fraction of the way from cell to next
+    and position the total cells travelled. Removal swap-removes like
+    PacketStore, so rows move - anything that must follow one enemy across
+    ticks (a projectile's target) holds its uid and looks the row up.
+    """
+
+    COLUMNS = (("cell", np.int32), ("next", np.int32), ("progress", np.float32),
+               ("position", np.float32), ("speed", np.float32), ("health", np.float32),
+               ("max_health", np.float32), ("reward", np.int32), ("kind", np.int8),
+               ("uid", np.int64))
+
+    def __init__(self, capacity=64):
+        self.count = 0
+        self.next_uid = 0
+        self.rows = {}  # uid -> row
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.cell)
+
+    def _reserve(self, needed):
+        """Grow every column (by doubling) to hold at least `needed` rows"""
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name, dtype in self.COLUMNS:
+            column = np.zeros(capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def spawn_batch(self, kinds, cell, next_cell):
+        """Append one enemy per kind code, all standing on the same cell"""
+        n = len(kinds)
+        self._reserve(self.count + n)
+        live = slice(self.count, self.count + n)
+        kinds = np.asarray(kinds, dtype=np.int8)
+        self.kind[live] = kinds
+        self.cell[live] = cell
+        self.next[live] = next_cell
+        self.progress[live] = 0
+        self.position[live] = 0
+        self.speed[live] = ENEMY_SPEED[kinds]
+        self.health[live] = ENEMY_HEALTH[kinds]
+        self.max_health[live] = ENEMY_HEALTH[kinds]
+        self.reward[live] = ENEMY_REWARD[kinds]
+        self.uid[live] = np.arange(self.next_uid, self.next_uid + n)
+        for row in range(self.count, self.count + n):
+            self.rows[self.next_uid] = row
+            self.next_uid += 1
+        self.count += n
+
+    def advance(self, dt, flow, core):
+        """Move every enemy along the flow field (next-cell ids, see GridMap.flow_ids)
+
+        Enemies that reach the core stop there; fast enemies may cross
+        several cells in one tick.
+        """
+        n = self.count
+        step = self.speed[:n] * dt
+        self.position[:n] += step
+        self.progress[:n] += step
+
+        moving = np.flatnonzero((self.progress[:n] >= 1) & (self.cell[:n] != core))
+        while len(moving):
+            self.progress[moving] -= 1
+            self.cell[moving] = self.next[moving]
+            self.next[moving] = flow[self.cell[moving]]
+            moving = moving[(self.progress[moving] >= 1) & (self.cell[moving] != core)]
+
+    def dead(self):
+        """Rows of enemies with no health left"""
+        return np.flatnonzero(self.health[:self.count] <= 0)
+
+    def at(self, cell):
+        """Rows of enemies standing on a cell id"""
+        return np.flatnonzero(self.cell[:self.count] == cell)
+
+    def occupied(self):
+        """Cell ids enemies stand on or are stepping into"""
+        n = self.count
+        return set(np.union1d(self.cell[:n], self.next[:n]).tolist())
+
+    def row(self, uid):
+        """Current row of an enemy, or None once it has been removed"""
+        return self.rows.get(uid)
+
+    def remove(self, indices):
+        """Swap-remove the rows at the given (unique) indices"""
+        removed = len(indices)
+        if removed == 0:
+            return
+
+        for uid in self.uid[indices].tolist():
+            del self.rows[uid]
+
+        n = self.count
+        remaining = n - removed
+        keep = np.ones(n, dtype=bool)
+        keep[indices] = False
+
+        # Holes below the new count are filled with survivors from the tail
+        holes = np.flatnonzero(~keep[:remaining])
+        movers = np.flatnonzero(keep[remaining:]) + remaining
+        for name, _ in self.COLUMNS:
+            column = getattr(self, name)
+            column[holes] = column[movers]
+        for row, uid in zip(holes.tolist(), self.uid[holes].tolist()):
+            self.rows[uid] = row
+
+        self.count = remaining
+
+    def clear(self):
+        self.count = 0
+        self.rows.clear()
+
+
+class Projectile:
+    """Pooled shot flying from a tower to its target
+
+    target is the target enemy's uid in the EnemyStore. end_x/end_y follow
+    the target while it is alive and stay put once it is gone.
+    """
+
+    __slots__ = ('start_x', 'start_y', 'end_x', 'end_y', 'target', 'progress', 'speed', 'pool_index')
+
+    def __init__(self):
+        self.pool_index = -1
+        self.reset(0, 0, None, 0, 0)
+
+    def reset(self, start_x, start_y, target, end_x, end_y, speed=0.1):
+        self.start_x = start_x
+        self.start_y = start_y
+        self.end_x = end_x
+        self.end_y = end_y
+        self.target = target
+        self.progress = 0
+        self.speed = speed
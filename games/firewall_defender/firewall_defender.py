@@ -1,13 +1,27 @@
 # games/firewall_defender/firewall_defender.py
+import numpy as np
 import pygame
-import random
-import math
 from games.base_game import BaseGame
+from games.firewall_defender.entities import EnemyStore, Projectile, ENEMY_KINDS
+from games.firewall_defender.map import GridMap
+from games.firewall_defender.tower import CoverageIndex, TARGET_POLICIES
+from utils.pool import Pool
+from utils.render_utils import SpriteBatch, StaticLayer
 from config import *
 
+WAVE_DELAY = 5  # seconds between clearing a wave and the next one arriving
+TOWER_COST = 50
+ENEMY_COLORS = (NEON_PINK, NEON_ORANGE, NEON_PURPLE)  # indexed by ENEMY_KINDS code
+HEALTH_BAR_WIDTH = 30
+
 class FirewallDefender(BaseGame):
-    def __init__(self, game_engine):
-        super().__init__(game_engine)
+    tracks_dirty_rects = True
+    use_parallax = False  # the static layer covers the whole screen
+    profile_phases = ("update", "handle_input", "spawn_enemies", "update_enemies", "update_towers",
+                      "update_projectiles", "render", "render_ui")
+    
+    def __init__(self, game_engine, seed=None):
+        super().__init__(game_engine, seed)
         self.game_active = True
         self.lives = 10
         self.money = 100
@@ -17,144 +31,178 @@ class FirewallDefender(BaseGame):
         self.grid_width = SCREEN_WIDTH // self.grid_size
         self.grid_height = SCREEN_HEIGHT // self.grid_size
         
-        # Towers and enemies
+        # Towers and enemies - enemies live in NumPy columns, shots are recycled
         self.towers = []
-        self.enemies = []
-        self.projectiles = []
+        self.enemies = EnemyStore()
+        self.projectiles = Pool(Projectile, 64)
         
         # Waves
         self.current_wave = 1
         self.wave_timer = 0
         self.enemies_per_wave = 5
         
-        # Path for enemies (simple left-to-right)
-        self.path = [(0, i) for i in range(5, self.grid_height - 5)]
+        # Malware enters on the left edge and heads for the network core on the
+        # right, following a flow field that routes around towers
+        spawn = (0, self.grid_height // 2)
+        core = (self.grid_width - 1, self.grid_height // 2)
+        self.grid_map = GridMap(self.grid_width, self.grid_height, spawn, core)
+        self.path = self.grid_map.route()
+        self.flow = self.grid_map.flow_ids()
+        self.core_id = self.grid_map.cell_id(core)
+        
+        # Which cells each tower covers
+        self.coverage = CoverageIndex(self.grid_map)
+        self.target_policy = "first"
+        
+        # Grid, path, towers and instructions only change when a tower is placed
+        self.static_layer = StaticLayer((SCREEN_WIDTH, SCREEN_HEIGHT), self.draw_static_layer)
+        
+        # Enemies (one sprite per type and health bar width) and shots
+        self.sprites = SpriteBatch(game_engine.sprite_batching)
+        self.define_sprites()
         
         print("Firewall Defender started! Place towers to stop malware from reaching the network core!")
         
-    def update(self):
+    def update(self, dt, input_state):
         if not self.game_active:
             return
             
-        self.handle_input()
-        self.spawn_enemies()
-        self.update_enemies()
-        self.update_towers()
+        self.handle_input(input_state)
+        self.step(dt)
+        
+    def step(self, dt):
+        """One tick of the game itself, without player input (also run by the simulator)"""
+        self.spawn_enemies(dt)
+        self.update_enemies(dt)
+        self.update_towers(dt)
         self.update_projectiles()
         self.check_game_over()
         
-    def handle_input(self):
-        mouse_pos = pygame.mouse.get_pos()
-        grid_x = mouse_pos[0] // self.grid_size
-        grid_y = mouse_pos[1] // self.grid_size
-        
-        if pygame.mouse.get_pressed()[0]:  # Left click
-            self.place_tower(grid_x, grid_y)
+    def handle_input(self, input_state):
+        # One tower per click, not one per tick the button is held
+        if input_state.mouse_just_pressed(1):
+            mouse_x, mouse_y = input_state.mouse_pos
+            self.place_tower(mouse_x // self.grid_size, mouse_y // self.grid_size)
+            
+        # Cycle the targeting policy
+        if input_state.just_pressed(pygame.K_t):
+            next_policy = (TARGET_POLICIES.index(self.target_policy) + 1) % len(TARGET_POLICIES)
+            self.set_target_policy(TARGET_POLICIES[next_policy])
+            print(f"🎯 Firewalls now target: {self.target_policy}")
             
     def place_tower(self, x, y):
-        # Check if valid position and enough money
-        if (x, y) in self.path or self.money < 50:
+        # Check if enough money and no malware on or entering the cell
+        if self.money < TOWER_COST:
+            return
+        occupied = {self.grid_map.cell_at(cell) for cell in self.enemies.occupied()}
+        if (x, y) in occupied:
             return
             
-        # Check if position is empty
-        for tower in self.towers:
-            if tower['x'] == x and tower['y'] == y:
-                return
+        # Block the cell - refused if it is taken or would seal the path to the core
+        if not self.grid_map.block((x, y), occupied):
+            return
+        self.coverage.remove_cell((x, y))
+        self.path = self.grid_map.route()
+        self.flow = self.grid_map.flow_ids()
+        self.coverage.update_paths()
                 
         # Place tower
-        self.towers.append({
+        tower = {
             'x': x, 'y': y, 
             'type': 'firewall',
             'range': 3,
             'damage': 10,
             'cooldown': 0,
-            'attack_speed': 1.0
-        })
-        self.money -= 50
+            'attack_speed': 1.0,
+            'policy': self.target_policy
+        }
+        self.coverage.add_tower(tower)
+        self.towers.append(tower)
+        self.money -= TOWER_COST
+        self.static_layer.invalidate()
         print(f"🔥 Firewall placed at ({x}, {y})! Money: {self.money}")
         
-    def spawn_enemies(self):
-        self.wave_timer += 1/60
+    def spawn_enemies(self, dt):
+        self.wave_timer += dt
         
-        if len(self.enemies) == 0 and self.wave_timer > 5:
+        if len(self.enemies) == 0 and self.wave_timer > WAVE_DELAY:
             # Spawn new wave
-            for i in range(self.enemies_per_wave):
-                enemy_type = random.choice(['virus', 'trojan', 'ransomware'])
-                health = 30 if enemy_type == 'virus' else 50 if enemy_type == 'trojan' else 80
-                speed = 0.5 if enemy_type == 'virus' else 0.3 if enemy_type == 'trojan' else 0.2
-                reward = 20 if enemy_type == 'virus' else 30 if enemy_type == 'trojan' else 50
-                
-                self.enemies.append({
-                    'type': enemy_type,
-                    'health': health,
-                    'max_health': health,
-                    'speed': speed,
-                    'position': 0,
-                    'reward': reward
-                })
+            spawn = self.grid_map.cell_id(self.grid_map.spawn)
+            kinds = [self.rng.randrange(len(ENEMY_KINDS)) for i in range(self.enemies_per_wave)]
+            self.enemies.spawn_batch(kinds, spawn, self.flow[spawn])
                 
             self.current_wave += 1
             self.enemies_per_wave += 2
             self.wave_timer = 0
             print(f"🚨 Wave {self.current_wave} incoming! {self.enemies_per_wave} enemies")
             
-    def update_enemies(self):
-        for enemy in self.enemies[:]:
-            enemy['position'] += enemy['speed']
+    def update_enemies(self, dt):
+        enemies = self.enemies
+        
+        # Enemies killed last tick pay out in one go
+        dead = enemies.dead()
+        if len(dead):
+            reward = int(enemies.reward[dead].sum())
+            self.money += reward
+            enemies.remove(dead)
+            print(f"✅ {len(dead)} malware eliminated! +{reward} money")
             
-            # Check if enemy reached the end
-            if enemy['position'] >= len(self.path) - 1:
-                self.enemies.remove(enemy)
-                self.lives -= 1
-                print(f"💥 Malware breached! Lives: {self.lives}")
+        # Step everyone along the shared flow field
+        enemies.advance(dt, self.flow, self.core_id)
                 
-            # Check if enemy died
-            if enemy['health'] <= 0:
-                self.enemies.remove(enemy)
-                self.money += enemy['reward']
-                print(f"✅ Malware eliminated! +{enemy['reward']} money")
-                
-    def update_towers(self):
+        # Enemies that reached the core each cost a life
+        breached = enemies.at(self.core_id)
+        if len(breached):
+            enemies.remove(breached)
+            self.lives -= len(breached)
+            print(f"💥 {len(breached)} malware breached! Lives: {self.lives}")
+            
+    def update_towers(self, dt):
+        self.coverage.index_enemies(self.enemies)
         for tower in self.towers:
-            tower['cooldown'] -= 1/60
+            tower['cooldown'] -= dt
             
             if tower['cooldown'] <= 0:
                 # Find target in range
                 target = self.find_target_in_range(tower)
-                if target:
+                if target is not None:
                     self.attack(tower, target)
                     tower['cooldown'] = tower['attack_speed']
                     
     def find_target_in_range(self, tower):
-        tower_x, tower_y = self.path[tower['x']] if tower['x'] < len(self.path) else (0, 0)
+        return self.coverage.find_target(tower, self.enemies, tower['policy'])
         
-        for enemy in self.enemies:
-            enemy_pos = enemy['position']
-            if enemy_pos < len(self.path):
-                enemy_x, enemy_y = self.path[int(enemy_pos)]
-                distance = math.sqrt((tower_x - enemy_x)**2 + (tower_y - enemy_y)**2)
-                
-                if distance <= tower['range']:
-                    return enemy
-        return None
+    def set_target_policy(self, policy):
+        """Switch every tower (and future towers) to a targeting policy"""
+        if policy not in TARGET_POLICIES:
+            return
+        self.target_policy = policy
+        for tower in self.towers:
+            tower['policy'] = policy
         
-    def attack(self, tower, enemy):
-        enemy['health'] -= tower['damage']
+    def attack(self, tower, row):
+        enemies = self.enemies
+        enemies.health[row] -= tower['damage']
         
-        self.projectiles.append({
-            'start_x': tower['x'] * self.grid_size + self.grid_size//2,
-            'start_y': tower['y'] * self.grid_size + self.grid_size//2,
-            'target': enemy,
-            'progress': 0,
-            'speed': 0.1
-        })
+        target_x, target_y = self.enemy_center(row)
+        self.projectiles.acquire().reset(
+            tower['x'] * self.grid_size + self.grid_size//2,
+            tower['y'] * self.grid_size + self.grid_size//2,
+            int(enemies.uid[row]), target_x, target_y)
         
     def update_projectiles(self):
-        for projectile in self.projectiles[:]:
-            projectile['progress'] += projectile['speed']
+        for projectile in self.projectiles:
+            projectile.progress += projectile.speed
             
-            if projectile['progress'] >= 1:
-                self.projectiles.remove(projectile)
+            if projectile.progress >= 1:
+                self.projectiles.release(projectile)
+            elif projectile.target is not None:
+                # Shots whose target is gone keep their last aim point
+                row = self.enemies.row(projectile.target)
+                if row is None:
+                    projectile.target = None
+                else:
+                    projectile.end_x, projectile.end_y = self.enemy_center(row)
                 
     def check_game_over(self):
         if self.lives <= 0:
@@ -162,86 +210,129 @@ class FirewallDefender(BaseGame):
             print(f"💀 Game Over! Final Score: {self.score}")
             self.end_game()
             
-    def render(self):
+    def draw_static_layer(self, surface):
+        surface.fill(BLACK)
+        
         # Draw grid
         for x in range(self.grid_width):
             for y in range(self.grid_height):
                 rect = pygame.Rect(x * self.grid_size, y * self.grid_size, 
                                  self.grid_size, self.grid_size)
-                pygame.draw.rect(self.screen, DARK_BLUE, rect, 1)
+                pygame.draw.rect(surface, DARK_BLUE, rect, 1)
                 
-        # Draw path
+        # Draw current route from the spawn to the core
         for i, (x, y) in enumerate(self.path):
-            pygame.draw.rect(self.screen, GRAY, 
+            pygame.draw.rect(surface, GRAY, 
                            (x * self.grid_size, y * self.grid_size, 
                             self.grid_size, self.grid_size))
                             
+        # Draw network core
+        core_x, core_y = self.grid_map.core
+        pygame.draw.rect(surface, NEON_GREEN, 
+                       (core_x * self.grid_size, core_y * self.grid_size, 
+                        self.grid_size, self.grid_size), 3)
+                            
         # Draw towers
         for tower in self.towers:
             x = tower['x'] * self.grid_size + self.grid_size//2
             y = tower['y'] * self.grid_size + self.grid_size//2
-            pygame.draw.circle(self.screen, NEON_BLUE, (x, y), 15)
+            pygame.draw.circle(surface, NEON_BLUE, (x, y), 15)
             
-        # Draw enemies
-        for enemy in self.enemies:
-            pos = min(int(enemy['position']), len(self.path) - 1)
-            x, y = self.path[pos]
-            x = x * self.grid_size + self.grid_size//2
-            y = y * self.grid_size + self.grid_size//2
+        # Instructions
+        instructions = [
+            f"Click to place Firewall ({TOWER_COST} money)",
+            "T: cycle firewall targeting",
+            "Stop malware from reaching the core!",
+            "Firewalls reroute malware but can't seal the path",
+            "Viruses (Pink): Fast, Low HP",
+            "Trojans (Orange): Medium",
+            "Ransomware (Purple): Slow, High HP"
+        ]
+        
+        for i, instruction in enumerate(instructions):
+            text = self.text_cache.render(instruction, 24, LIGHT_GRAY)
+            surface.blit(text, (20, 20 + i*25))
             
-            color = NEON_PINK if enemy['type'] == 'virus' else \
-                   NEON_ORANGE if enemy['type'] == 'trojan' else \
-                   NEON_PURPLE
-                   
-            pygame.draw.circle(self.screen, color, (x, y), 10)
+    def enemy_centers(self):
+        """Pixel positions of all enemies, between their current and next cell"""
+        enemies = self.enemies
+        n = len(enemies)
+        width = self.grid_map.width
+        cell = enemies.cell[:n]
+        next_cell = enemies.next[:n]
+        progress = enemies.progress[:n]
+        x = cell % width + (next_cell % width - cell % width) * progress
+        y = cell // width + (next_cell // width - cell // width) * progress
+        half = self.grid_size // 2
+        return ((x * self.grid_size + half).astype(np.int32),
+                (y * self.grid_size + half).astype(np.int32))
+        
+    def enemy_center(self, row):
+        """Pixel position of one enemy row"""
+        enemies = self.enemies
+        x, y = self.grid_map.cell_at(int(enemies.cell[row]))
+        next_x, next_y = self.grid_map.cell_at(int(enemies.next[row]))
+        progress = float(enemies.progress[row])
+        x += (next_x - x) * progress
+        y += (next_y - y) * progress
+        return (int(x * self.grid_size + self.grid_size//2),
+                int(y * self.grid_size + self.grid_size//2))
+            
+    def define_sprites(self):
+        for kind, color in enumerate(ENEMY_COLORS):
+            for width in range(HEALTH_BAR_WIDTH + 1):
+                self.sprites.define((kind, width), (31, 31), (15, 20), self.enemy_painter(color, width))
+        self.sprites.define('projectile', (11, 11), (5, 5),
+                            lambda surface, pos: pygame.draw.circle(surface, NEON_YELLOW, pos, 5))
+        
+    def enemy_painter(self, color, health_width):
+        def paint(surface, pos):
+            x, y = pos
+            pygame.draw.circle(surface, color, (x, y), 10)
             
             # Health bar
-            health_ratio = enemy['health'] / enemy['max_health']
-            pygame.draw.rect(self.screen, NEON_RED, 
-                           (x - 15, y - 20, 30, 5))
-            pygame.draw.rect(self.screen, NEON_GREEN, 
-                           (x - 15, y - 20, 30 * health_ratio, 5))
+            pygame.draw.rect(surface, NEON_RED, (x - 15, y - 20, HEALTH_BAR_WIDTH, 5))
+            if health_width:
+                pygame.draw.rect(surface, NEON_GREEN, (x - 15, y - 20, health_width, 5))
+        return paint
+            
+    def render(self, alpha=1.0):
+        # Static scenery - a rebuilt layer changes the whole screen
+        if not self.static_layer.valid:
+            self.game_engine.request_full_redraw()
+        self.static_layer.blit(self.screen)
+            
+        # Draw enemies, picking the sprite with the right health bar
+        enemies = self.enemies
+        n = len(enemies)
+        xs, ys = self.enemy_centers()
+        bars = (np.maximum(enemies.health[:n], 0) * HEALTH_BAR_WIDTH / enemies.max_health[:n]).astype(np.int32)
+        self.sprites.add_kinds(list(zip(enemies.kind[:n].tolist(), bars.tolist())), xs.tolist(), ys.tolist())
                            
         # Draw projectiles
+        shot_xs, shot_ys = [], []
         for projectile in self.projectiles:
-            start_x, start_y = projectile['start_x'], projectile['start_y']
-            target_pos = min(int(projectile['target']['position']), len(self.path) - 1)
-            target_x, target_y = self.path[target_pos]
-            target_x = target_x * self.grid_size + self.grid_size//2
-            target_y = target_y * self.grid_size + self.grid_size//2
-            
-            current_x = start_x + (target_x - start_x) * projectile['progress']
-            current_y = start_y + (target_y - start_y) * projectile['progress']
+            start_x, start_y = projectile.start_x, projectile.start_y
+            target_x, target_y = projectile.end_x, projectile.end_y
             
-            pygame.draw.circle(self.screen, NEON_YELLOW, (int(current_x), int(current_y)), 5)
+            shot_xs.append(int(start_x + (target_x - start_x) * projectile.progress))
+            shot_ys.append(int(start_y + (target_y - start_y) * projectile.progress))
+        self.sprites.add_many('projectile', shot_xs, shot_ys)
+        
+        self.game_engine.mark_dirty_rects(self.sprites.flush(self.screen, rects=True))
             
         self.render_ui()
         
     def render_ui(self):
-        font = pygame.font.Font(None, 36)
-        
         # Stats
         stats = [
             f"Wave: {self.current_wave}",
             f"Lives: {self.lives}",
             f"Money: {self.money}",
-            f"Towers: {len(self.towers)}"
+            f"Towers: {len(self.towers)}",
+            f"Target: {self.target_policy}"
         ]
         
         for i, stat in enumerate(stats):
-            text = font.render(stat, True, NEON_GREEN)
-            self.screen.blit(text, (SCREEN_WIDTH - 200, 20 + i*40))
-            
-        # Instructions
-        small_font = pygame.font.Font(None, 24)
-        instructions = [
-            "Click to place Firewall (50 money)",
-            "Stop malware from reaching the end!",
-            "Viruses (Pink): Fast, Low HP",
-            "Trojans (Orange): Medium",
-            "Ransomware (Purple): Slow, High HP"
-        ]
-        
-        for i, instruction in enumerate(instructions):
-            text = small_font.render(instruction, True, LIGHT_GRAY)
-            self.screen.blit(text, (20, 20 + i*25))
\ No newline at end of file
+            text = self.text_cache.render(stat, 36, NEON_GREEN)
+            self.game_engine.mark_dirty(self.screen.blit(text, (SCREEN_WIDTH - 200, 20 + i*40)))
\ No newline at end of file
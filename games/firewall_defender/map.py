@@ -0,0 +1,161 @@
+# games/firewall_defender/map.py
+import heapq
+from collections import deque
+import numpy as np
+
+NEIGHBOR_OFFSETS = ((1, 0), (0, -1), (0, 1), (-1, 0))
+
+
+class GridMap:
+    """Tower-defense grid with a shared flow field towards the network core
+
+    distance[cell] is the number of steps from a cell to the core and
+    next_cell[cell] is the neighbor to step to, so every enemy reads its
+    route from the same field. Blocking a cell only repairs the part of the
+    field whose route ran through it.
+    """
+
+    def __init__(self, width, height, spawn, core):
+        self.width = width
+        self.height = height
+        self.spawn = spawn
+        self.core = core
+        self.blocked = set()
+        self.distance = {}
+        self.next_cell = {}
+        self.compute_field()
+
+    def in_bounds(self, cell):
+        x, y = cell
+        return 0 <= x < self.width and 0 <= y < self.height
+
+    def is_open(self, cell):
+        return self.in_bounds(cell) and cell not in self.blocked
+
+    def neighbors(self, cell):
+        x, y = cell
+        for dx, dy in NEIGHBOR_OFFSETS:
+            neighbor = (x + dx, y + dy)
+            if self.is_open(neighbor):
+                yield neighbor
+
+    def cell_id(self, cell):
+        """Row-major index of a cell, used by the NumPy enemy and coverage arrays"""
+        x, y = cell
+        return y * self.width + x
+
+    def cell_at(self, cell_id):
+        return (cell_id % self.width, cell_id // self.width)
+
+    def flow_ids(self):
+        """next_cell as an array over cell ids
+
+        The core points at itself; blocked and cut-off cells hold -1.
+        """
+        flow = np.full(self.width * self.height, -1, dtype=np.int32)
+        for cell, via in self.next_cell.items():
+            flow[self.cell_id(cell)] = self.cell_id(via if via is not None else cell)
+        return flow
+
+    def distance_ids(self):
+        """distance as an array over cell ids; cells with no path to the core hold inf"""
+        distance = np.full(self.width * self.height, np.inf, dtype=np.float32)
+        for cell, steps in self.distance.items():
+            distance[self.cell_id(cell)] = steps
+        return distance
+
+    def open_cells(self):
+        return [(x, y) for x in range(self.width) for y in range(self.height)
+                if (x, y) not in self.blocked]
+
+    def compute_field(self):
+        """Full breadth-first search outwards from the core"""
+        self.distance = {self.core: 0}
+        self.next_cell = {self.core: None}
+        queue = deque([self.core])
+
+        while queue:
+            cell = queue.popleft()
+            for neighbor in self.neighbors(cell):
+                if neighbor not in self.distance:
+                    self.distance[neighbor] = self.distance[cell] + 1
+                    self.next_cell[neighbor] = cell
+                    queue.append(neighbor)
+
+    def reachable(self, cell):
+        return cell in self.distance
+
+    def route(self, start=None):
+        """Cells from start (default: spawn) to the core following the field"""
+        cell = self.spawn if start is None else start
+        if not self.reachable(cell):
+            return []
+        path = [cell]
+        while cell != self.core:
+            cell = self.next_cell[cell]
+            path.append(cell)
+        return path
+
+    def block(self, cell, occupied=()):
+        """Block a cell (e.g. for a tower) and repair the flow field
+
+        The placement is refused, leaving the map unchanged, if it would cut
+        the spawn or any occupied cell off from the core. Returns whether
+        the cell was blocked.
+        """
+        if not self.is_open(cell) or cell in (self.spawn, self.core):
+            return False
+
+        # Cells whose route ran through the blocked cell - the only ones that change
+        affected = self._upstream(cell)
+        saved = {c: (self.distance.get(c), self.next_cell.get(c)) for c in affected}
+
+        self.blocked.add(cell)
+        for c in affected:
+            self.distance.pop(c, None)
+            self.next_cell.pop(c, None)
+
+        # Re-seed the affected region from its unaffected border and expand inwards
+        heap = []
+        for c in affected - {cell}:
+            for neighbor in self.neighbors(c):
+                if neighbor not in affected and neighbor in self.distance:
+                    heapq.heappush(heap, (self.distance[neighbor] + 1, c, neighbor))
+
+        while heap:
+            dist, c, via = heapq.heappop(heap)
+            if c in self.distance:
+                continue
+            self.distance[c] = dist
+            self.next_cell[c] = via
+            for neighbor in self.neighbors(c):
+                if neighbor in affected and neighbor not in self.distance:
+                    heapq.heappush(heap, (dist + 1, neighbor, c))
+
+        # Reject placements that seal the path
+        if not self.reachable(self.spawn) or not all(self.reachable(c) for c in occupied):
+            self.blocked.discard(cell)
+            for c, (dist, via) in saved.items():
+                if dist is not None:
+                    self.distance[c] = dist
+                    self.next_cell[c] = via
+                else:
+                    self.distance.pop(c, None)
+                    self.next_cell.pop(c, None)
+            return False
+
+        return True
+
+    def _upstream(self, cell):
+        """The cell plus every cell whose flow leads through it"""
+        if cell not in self.distance:
+            return {cell}
+        affected = {cell}
+        queue = deque([cell])
+        while queue:
+            current = queue.popleft()
+            for neighbor in self.neighbors(current):
+                if neighbor not in affected and self.next_cell.get(neighbor) == current:
+                    affected.add(neighbor)
+                    queue.append(neighbor)
+        return affected
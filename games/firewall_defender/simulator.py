@@ -0,0 +1,181 @@
+# games/firewall_defender/simulator.py
+"""
+Headless Firewall Defender wave simulator for balancing
+
+Runs the real game logic (spawning, movement, targeting, projectiles) with
+no rendering or input, skipping the idle time between waves, and fans
+batches of tower layouts out across a process pool.
+
+Usage: python -m games.firewall_defender.simulator [--layouts N] [--towers N] [--waves N]
+                                                   [--workers N] [--seed N] [--output FILE]
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from config import *
+
+MAX_WAVE_SECONDS = 600  # safety stop for a wave that never clears
+
+# One headless engine per process, created on first use
+_engine = None
+
+
+def _headless_engine():
+    global _engine
+    if _engine is None:
+        from game import CyberpunkArcade
+        _engine = CyberpunkArcade(headless=True)
+    return _engine
+
+
+def simulate(layout, waves, seed=0, policy="first", dt=FIXED_TIMESTEP):
+    """Play up to `waves` waves against a fixed tower layout
+
+    layout is a list of (x, y) grid cells. Towers are placed for free before
+    the first wave; cells that are taken or would seal the path are skipped.
+    Returns the wave reached plus per-wave leaks and money.
+    """
+    if waves < 1:
+        raise ValueError(f"waves must be at least 1, got {waves}")
+    from games.firewall_defender.firewall_defender import FirewallDefender, TOWER_COST, WAVE_DELAY
+
+    # Game code prints every kill and wave
+    with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+        game = FirewallDefender(_headless_engine(), seed)
+
+        starting_money = game.money
+        for x, y in layout:
+            game.money = TOWER_COST  # layouts are placed for free
+            game.place_tower(x, y)
+            game.money = starting_money
+        game.set_target_policy(policy)
+
+        leaks, money, ticks = [], [], 0
+        max_wave_ticks = int(MAX_WAVE_SECONDS / dt)
+        while len(leaks) < waves and game.game_active:
+            # Fast-forward the gap between waves
+            game.wave_timer = WAVE_DELAY
+            lives_before = game.lives
+
+            for _ in range(max_wave_ticks):
+                game.step(dt)
+                ticks += 1
+                if not game.game_active or len(game.enemies) == 0:
+                    break
+
+            leaks.append(lives_before - max(game.lives, 0))
+            money.append(game.money)
+
+    return {
+        "layout": [list(cell) for cell in layout],
+        "towers": len(game.towers),
+        "seed": seed,
+        "waves_survived": len(leaks) if game.game_active else max(len(leaks) - 1, 0),
+        "leaks": leaks,
+        "money": money,
+        "lives": max(game.lives, 0),
+        "ticks": ticks
+    }
+
+
+def _simulate_job(job):
+    return simulate(*job)
+
+
+def random_layout(rng, towers, width=SCREEN_WIDTH // 40, height=SCREEN_HEIGHT // 40):
+    """Random tower cells away from the spawn and core columns"""
+    cells = [(x, y) for x in range(1, width - 1) for y in range(height)]
+    return rng.sample(cells, towers)
+
+
+def run_batch(layouts, waves, seed=0, policy="first", workers=None):
+    """Simulate every layout (in parallel when workers != 1); results keep layout order"""
+    jobs = [(layout, waves, seed + i, policy) for i, layout in enumerate(layouts)]
+    if workers == 1:
+        return [_simulate_job(job) for job in jobs]
+
+    workers = workers or os.cpu_count() or 1
+    chunksize = max(1, len(jobs) // (workers * 8))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(_simulate_job, jobs, chunksize=chunksize))
+
+
+def summarize(results, waves):
+    """Aggregate a batch: wave reached, mean leaks and money per wave, best layouts"""
+    count = len(results)
+    survived = sorted(result["waves_survived"] for result in results)
+
+    leaks_per_wave, money_per_wave, reached = [], [], []
+    for wave in range(waves):
+        played = [result for result in results if len(result["leaks"]) > wave]
+        reached.append(len(played))
+        leaks_per_wave.append(sum(r["leaks"][wave] for r in played) / len(played) if played else None)
+        money_per_wave.append(sum(r["money"][wave] for r in played) / len(played) if played else None)
+
+    best = sorted(results, key=lambda r: (-r["waves_survived"], sum(r["leaks"]),
+                                          -(r["money"][-1] if r["money"] else 0)))
+    return {
+        "layouts": count,
+        "waves": waves,
+        "waves_survived": {
+            "mean": sum(survived) / count if count else 0.0,
+            "min": survived[0] if survived else 0,
+            "median": survived[count // 2] if survived else 0,
+            "max": survived[-1] if survived else 0,
+            "cleared_all": sum(1 for s in survived if s >= waves)
+        },
+        "layouts_reaching_wave": reached,
+        "mean_leaks_per_wave": leaks_per_wave,
+        "mean_money_per_wave": money_per_wave,
+        "best_layouts": [{"layout": r["layout"], "waves_survived": r["waves_survived"],
+                          "leaks": sum(r["leaks"])} for r in best[:5]]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Firewall Defender wave simulator")
+    parser.add_argument("--layouts", type=int, default=1000, help="random layouts to simulate")
+    parser.add_argument("--towers", type=int, default=8, help="towers per layout")
+    parser.add_argument("--waves", type=int, default=20, help="waves per simulation")
+    parser.add_argument("--policy", default="first", help="tower targeting policy")
+    parser.add_argument("--workers", type=int, help="worker processes (default: all CPUs)")
+    parser.add_argument("--seed", type=int, default=0, help="seed for layouts and games")
+    parser.add_argument("--output", help="write the summary and every result as JSON")
+    args = parser.parse_args()
+    if args.waves < 1:
+        parser.error("--waves must be at least 1")
+
+    rng = random.Random(args.seed)
+    layouts = [random_layout(rng, args.towers) for _ in range(args.layouts)]
+
+    start = time.perf_counter()
+    results = run_batch(layouts, args.waves, args.seed, args.policy, args.workers)
+    elapsed = time.perf_counter() - start
+    summary = summarize(results, args.waves)
+
+    survived = summary["waves_survived"]
+    print(f"Simulated {args.layouts} layouts x {args.waves} waves in {elapsed:.1f} s "
+          f"({sum(r['ticks'] for r in results) / elapsed:,.0f} ticks/s)")
+    print(f"Waves survived: mean {survived['mean']:.1f}, min {survived['min']}, "
+          f"median {survived['median']}, max {survived['max']}, "
+          f"{survived['cleared_all']} cleared every wave")
+    print(f"{'wave':>4}{'layouts':>9}{'leaks':>8}{'money':>9}")
+    for wave in range(args.waves):
+        if not summary["layouts_reaching_wave"][wave]:
+            break
+        print(f"{wave + 1:>4}{summary['layouts_reaching_wave'][wave]:>9}"
+              f"{summary['mean_leaks_per_wave'][wave]:>8.2f}{summary['mean_money_per_wave'][wave]:>9.0f}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"summary": summary, "results": results}, f, indent=2)
+        print(f"Results written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
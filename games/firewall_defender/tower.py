@@ -0,0 +1,107 @@
+# games/firewall_defender/tower.py
+import math
+import numpy as np
+
+TARGET_POLICIES = ("first", "strongest", "closest")
+
+
+class CoverageIndex:
+    """Precomputed tower coverage plus per-cell enemy buckets over the grid's cell ids
+
+    Each tower's coverage (the walkable cell ids within its range and their
+    distances from the tower) is computed once when the tower is placed.
+    Once per tick, index_enemies() sorts the enemy rows by cell into
+    buckets, so finding a target only looks at the rows standing in the
+    tower's covered cells - the cost follows the tower's coverage and what
+    is in it, not how many enemies exist.
+    """
+
+    def __init__(self, grid_map):
+        self.grid_map = grid_map
+        self.size = grid_map.width * grid_map.height
+        self.cells = set(grid_map.open_cells())
+        self.towers = []
+        self.steps_to_core = grid_map.distance_ids()
+
+        # Enemy rows sorted by cell; rows in cell c are order[starts[c]:starts[c + 1]]
+        self.order = np.zeros(0, dtype=np.intp)
+        self.starts = np.zeros(self.size + 1, dtype=np.intp)
+
+    # Towers -----------------------------------------------------------------
+
+    def add_tower(self, tower):
+        """Compute and store tower['cells'] and tower['distances'] (covered cell ids, nearest first)"""
+        tx, ty, reach = tower['x'], tower['y'], tower['range']
+        coverage = []
+
+        for dx in range(-reach, reach + 1):
+            for dy in range(-reach, reach + 1):
+                cell = (tx + dx, ty + dy)
+                distance = math.hypot(dx, dy)
+                if distance <= reach and cell in self.cells:
+                    coverage.append((distance, self.grid_map.cell_id(cell)))
+
+        coverage.sort()
+        tower['cells'] = np.array([cell_id for _, cell_id in coverage], dtype=np.intp)
+        tower['distances'] = np.array([distance for distance, _ in coverage], dtype=np.float32)
+        self.towers.append(tower)
+
+    def update_paths(self):
+        """Re-read the flow field's distances after the grid changes"""
+        self.steps_to_core = self.grid_map.distance_ids()
+
+    def remove_cell(self, cell):
+        """Drop a cell that is no longer walkable (e.g. a tower was built on it)"""
+        if cell not in self.cells:
+            return
+        cell_id = self.grid_map.cell_id(cell)
+        for tower in self.towers:
+            keep = tower['cells'] != cell_id
+            tower['cells'] = tower['cells'][keep]
+            tower['distances'] = tower['distances'][keep]
+        self.cells.discard(cell)
+
+    # Enemies ----------------------------------------------------------------
+
+    def index_enemies(self, enemies):
+        """Bucket the live enemy rows by cell - once per tick, before any find_target()"""
+        cells = enemies.cell[:len(enemies)]
+        self.order = np.argsort(cells, kind="stable")
+        self.starts = np.searchsorted(cells[self.order], np.arange(self.size + 1))
+
+    # Targeting --------------------------------------------------------------
+
+    def find_target(self, tower, enemies, policy="first"):
+        """Row of a live enemy in the tower's coverage picked by a targeting policy
+
+        first: nearest the core along the current flow field, strongest:
+        most health, closest: in the nearest occupied cell. Returns None if
+        nothing is in range. Uses the buckets from the last index_enemies().
+        """
+        begin = self.starts[tower['cells']]
+        counts = self.starts[tower['cells'] + 1] - begin
+        total = int(counts.sum())
+        if total == 0:
+            return None
+
+        # Every row in the covered buckets, with its cell's distance from the tower
+        ends = np.cumsum(counts)
+        rows = self.order[np.repeat(begin - (ends - counts), counts) + np.arange(total)]
+        distance = np.repeat(tower['distances'], counts)
+
+        candidates = enemies.health[rows] > 0
+        if not candidates.any():
+            return None
+
+        if policy == "closest":
+            value = -distance
+        elif policy == "strongest":
+            value = enemies.health[rows]
+        else:
+            # Cells travelled stop measuring progress once a tower reroutes
+            # the path, so rank by steps still to go: from the cell each
+            # enemy is heading into, plus what is left of its current step
+            value = -(self.steps_to_core[enemies.next[rows]] + (1 - enemies.progress[rows]))
+        value = np.where(candidates, value, -np.inf)
+        # Break ties on the lowest row, as a scan over every enemy would
+        return int(rows[value == value.max()].min())
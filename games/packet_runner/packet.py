@@ -1,3 +1,103 @@
-class Packet:
-    def __init__(self):
-        pass
\ No newline at end of file
+# games/packet_runner/packet.py
+import numpy as np
+
+# Packet type codes stored in PacketStore.kind
+PACKET_TYPES = ("tcp", "udp", "malicious")
+PACKET_RADIUS = 15
+
+
+class PacketStore:
+    """Struct-of-arrays packet storage backed by NumPy columns
+
+    Live packets occupy rows [0, count) of the x, y, speed and kind columns.
+    Removal swaps survivors from the tail into the holes, so the live rows
+    stay contiguous and every per-frame operation is a vectorized slice.
+    """
+
+    COLUMNS = (("x", np.float32), ("y", np.float32), ("speed", np.float32), ("kind", np.int8))
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        for name, dtype in self.COLUMNS:
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def capacity(self):
+        return len(self.x)
+
+    def _reserve(self, needed):
+        """Grow every column (by doubling) to hold at least `needed` rows"""
+        if needed <= self.capacity:
+            return
+        capacity = max(needed, self.capacity * 2)
+        for name, dtype in self.COLUMNS:
+            column = np.zeros(capacity, dtype=dtype)
+            column[:self.count] = getattr(self, name)[:self.count]
+            setattr(self, name, column)
+
+    def spawn(self, x, y, speed, kind):
+        """Append a single packet"""
+        self._reserve(self.count + 1)
+        i = self.count
+        self.x[i] = x
+        self.y[i] = y
+        self.speed[i] = speed
+        self.kind[i] = kind
+        self.count += 1
+
+    def spawn_batch(self, xs, ys, speeds, kinds):
+        """Append many packets at once from equal-length arrays"""
+        n = len(xs)
+        self._reserve(self.count + n)
+        live = slice(self.count, self.count + n)
+        self.x[live] = xs
+        self.y[live] = ys
+        self.speed[live] = speeds
+        self.kind[live] = kinds
+        self.count += n
+
+    def advance(self):
+        """Move every packet down by its per-tick speed"""
+        n = self.count
+        self.y[:n] += self.speed[:n]
+
+    def cull(self, max_y):
+        """Remove packets that fell below max_y; returns how many were removed"""
+        gone = np.flatnonzero(self.y[:self.count] > max_y)
+        self.remove(gone)
+        return len(gone)
+
+    def collide_rect(self, rect):
+        """Indices of packets whose bounding box overlaps a pygame.Rect"""
+        n = self.count
+        x = self.x[:n]
+        y = self.y[:n]
+        hits = ((x + PACKET_RADIUS > rect.left) & (x - PACKET_RADIUS < rect.right) &
+                (y + PACKET_RADIUS > rect.top) & (y - PACKET_RADIUS < rect.bottom))
+        return np.flatnonzero(hits)
+
+    def remove(self, indices):
+        """Swap-remove the rows at the given (unique) indices"""
+        removed = len(indices)
+        if removed == 0:
+            return
+
+        n = self.count
+        remaining = n - removed
+        keep = np.ones(n, dtype=bool)
+        keep[indices] = False
+
+        # Holes below the new count are filled with survivors from the tail
+        holes = np.flatnonzero(~keep[:remaining])
+        movers = np.flatnonzero(keep[remaining:]) + remaining
+        for name, _ in self.COLUMNS:
+            column = getattr(self, name)
+            column[holes] = column[movers]
+
+        self.count = remaining
+
+    def clear(self):
+        self.count = 0
@@ -1,12 +1,22 @@
 # games/packet_runner/packet_runner.py
 import pygame
-import random
+import numpy as np
 from games.base_game import BaseGame
+from games.packet_runner.packet import PacketStore, PACKET_TYPES, PACKET_RADIUS
+from utils.render_utils import SpriteBatch
 from config import *
 
+# Spawn weights per packet type: TCP most common, malicious least common
+SPAWN_WEIGHTS = np.array([5, 3, 2]) / 10
+PACKET_COLORS = [NEON_GREEN, NEON_BLUE, NEON_PINK]
+PACKET_POINTS = {"tcp": 10, "udp": 5, "malicious": -15}
+
 class PacketRunner(BaseGame):
-    def __init__(self, game_engine):
-        super().__init__(game_engine)
+    profile_phases = ("update", "handle_input", "update_packets", "spawn_packets", "check_collisions",
+                      "render", "render_ui")
+    
+    def __init__(self, game_engine, seed=None):
+        super().__init__(game_engine, seed)
         self.game_time = 60.0  # 60 seconds game
         self.time_left = self.game_time
         self.game_active = True  # ← ADD THIS LINE
@@ -19,110 +29,113 @@ class PacketRunner(BaseGame):
         self.player_height = 20
         
         # Packets
-        self.packets = []
+        self.packets = PacketStore()
         self.spawn_timer = 0
         self.spawn_interval = 0.8  # seconds between spawns
+        self.spawn_count = 1  # packets per spawn; raised for stress levels
+        self.np_random = np.random.default_rng(self.rng.getrandbits(64))
+        
+        # One pre-rendered sprite per packet type code
+        size = 2 * PACKET_RADIUS + 1
+        self.sprites = SpriteBatch(game_engine.sprite_batching)
+        for kind, color in enumerate(PACKET_COLORS):
+            self.sprites.define(kind, (size, size), (PACKET_RADIUS, PACKET_RADIUS),
+                                lambda surface, pos, color=color: pygame.draw.circle(surface, color, pos, PACKET_RADIUS))
         
         print("Packet Runner started! Catch TCP (green) and UDP (blue) packets. Avoid malicious (red) packets!")
         
-    def update(self):
+    def update(self, dt, input_state):
         if not self.game_active:
             return
             
         # Update timer
-        self.time_left -= 1/60  # Assuming 60 FPS
+        self.time_left -= dt
         if self.time_left <= 0:
             self.end_game()
             
-        self.handle_input()
+        self.handle_input(input_state)
         self.update_packets()
-        self.spawn_packets()
+        self.spawn_packets(dt)
         self.check_collisions()
         
-    def handle_input(self):
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_LEFT] and self.player_x > 0:
+    def handle_input(self, input_state):
+        if input_state.pressed(pygame.K_LEFT) and self.player_x > 0:
             self.player_x -= self.player_speed
-        if keys[pygame.K_RIGHT] and self.player_x < SCREEN_WIDTH - self.player_width:
+        if input_state.pressed(pygame.K_RIGHT) and self.player_x < SCREEN_WIDTH - self.player_width:
             self.player_x += self.player_speed
             
-    def spawn_packets(self):
-        self.spawn_timer += 1/60
+    def spawn_packets(self, dt):
+        self.spawn_timer += dt
         if self.spawn_timer >= self.spawn_interval:
             self.spawn_timer = 0
             
-            # Random packet type with weights
-            packet_type = random.choices(
-                ["tcp", "udp", "malicious"],
-                weights=[5, 3, 2]  # TCP most common, malicious least common
-            )[0]
-            
-            self.packets.append({
-                "x": random.randint(50, SCREEN_WIDTH - 50),
-                "y": -30,
-                "type": packet_type,
-                "speed": random.uniform(3, 6)
-            })
+            # Random packet types with weights
+            n = self.spawn_count
+            self.packets.spawn_batch(
+                self.np_random.integers(50, SCREEN_WIDTH - 50, size=n, endpoint=True),
+                np.full(n, -30),
+                self.np_random.uniform(3, 6, size=n),  # pixels per tick
+                self.np_random.choice(len(PACKET_TYPES), size=n, p=SPAWN_WEIGHTS)
+            )
             
     def update_packets(self):
-        for packet in self.packets[:]:
-            packet["y"] += packet["speed"]
-            # Remove packets that go off screen
-            if packet["y"] > SCREEN_HEIGHT:
-                self.packets.remove(packet)
+        self.packets.advance()
+        # Remove packets that go off screen
+        self.packets.cull(SCREEN_HEIGHT)
                 
     def check_collisions(self):
         player_rect = pygame.Rect(self.player_x, self.player_y, self.player_width, self.player_height)
         
-        for packet in self.packets[:]:
-            packet_rect = pygame.Rect(packet["x"] - 15, packet["y"] - 15, 30, 30)
+        caught = self.packets.collide_rect(player_rect)
+        if len(caught) == 0:
+            return
             
-            if player_rect.colliderect(packet_rect):
-                self.handle_packet_catch(packet["type"])
-                self.packets.remove(packet)
+        counts = np.bincount(self.packets.kind[caught], minlength=len(PACKET_TYPES))
+        self.packets.remove(caught)
+        
+        for kind, count in enumerate(counts.tolist()):
+            if count:
+                self.handle_packet_catch(PACKET_TYPES[kind], count)
                 
-    def handle_packet_catch(self, packet_type):
-        if packet_type == "tcp":
-            self.score += 10
-            print(f"✅ Caught TCP packet! +10 points (Total: {self.score})")
-        elif packet_type == "udp":
-            self.score += 5
-            print(f"✅ Caught UDP packet! +5 points (Total: {self.score})")
-        elif packet_type == "malicious":
-            self.score -= 15
-            print(f"❌ Caught malicious packet! -15 points (Total: {self.score})")
+    def handle_packet_catch(self, packet_type, count=1):
+        points = PACKET_POINTS[packet_type] * count
+        self.score += points
+        
+        label = "malicious" if packet_type == "malicious" else packet_type.upper()
+        caught = f"{count} {label} packets" if count > 1 else f"{label} packet"
+        if points >= 0:
+            print(f"✅ Caught {caught}! +{points} points (Total: {self.score})")
+        else:
+            print(f"❌ Caught {caught}! {points} points (Total: {self.score})")
             
         # Update global score
         self.game_engine.add_score(self.score)
         
-    def render(self):
+    def render(self, alpha=1.0):
         # Draw player (simple rectangle for now)
         pygame.draw.rect(self.screen, NEON_BLUE, 
                         (self.player_x, self.player_y, self.player_width, self.player_height))
         
-        # Draw packets
-        for packet in self.packets:
-            color = NEON_GREEN if packet["type"] == "tcp" else \
-                   NEON_BLUE if packet["type"] == "udp" else \
-                   NEON_PINK
-            pygame.draw.circle(self.screen, color, (int(packet["x"]), int(packet["y"])), 15)
+        # Draw packets, interpolated between the last two ticks
+        n = self.packets.count
+        xs = self.packets.x[:n].astype(int).tolist()
+        ys = (self.packets.y[:n] - self.packets.speed[:n] * (1 - alpha)).astype(int).tolist()
+        self.sprites.add_kinds(self.packets.kind[:n].tolist(), xs, ys)
+        self.sprites.flush(self.screen)
         
         # Draw UI
         self.render_ui()
         
     def render_ui(self):
-        font = pygame.font.Font(None, 36)
-        
         # Score
-        score_text = font.render(f"Score: {self.score}", True, NEON_GREEN)
+        score_text = self.text_cache.render(f"Score: {self.score}", 36, NEON_GREEN)
         self.screen.blit(score_text, (20, 20))
         
         # Timer
-        time_text = font.render(f"Time: {int(self.time_left)}", True, NEON_BLUE)
+        time_text = self.text_cache.render(f"Time: {int(self.time_left)}", 36, NEON_BLUE)
         self.screen.blit(time_text, (SCREEN_WIDTH - 150, 20))
         
         # Instructions
-        small_font = pygame.font.Font(None, 24)
         instructions = [
             "← → : Move",
             "TCP (Green): +10",
@@ -131,5 +144,5 @@ class PacketRunner(BaseGame):
         ]
         
         for i, instruction in enumerate(instructions):
-            text = small_font.render(instruction, True, LIGHT_GRAY)
+            text = self.text_cache.render(instruction, 24, LIGHT_GRAY)
             self.screen.blit(text, (20, 60 + i*25))
\ No newline at end of file
@@ -0,0 +1,98 @@
+"""
+CyberPunk Arcade - Game Registry
+Maps game ids to their classes, importing each game module only when it is
+first needed and recording how long every game takes to load and start
+"""
+
+import importlib
+import threading
+import time
+from config import *
+
+# Entry points: game id -> "module:Class". Adding a title means adding a line
+# here (and to GAMES); nothing is imported until the game is launched or prewarmed.
+GAME_ENTRY_POINTS = {
+    "packet_runner": "games.packet_runner.packet_runner:PacketRunner",
+    "firewall_defender": "games.firewall_defender.firewall_defender:FirewallDefender",
+    "code_breaker": "games.code_breaker.code_breaker:CodeBreaker",
+    "social_engineering": "games.social_engineering.social_engineering:SocialEngineering",
+    "ctf_racer": "games.ctf_racer.ctf_racer:CTFRacer"
+}
+
+
+class GameRegistry:
+    """Lazy game class loader with per-game import and construction timings"""
+
+    def __init__(self, entry_points=GAME_ENTRY_POINTS):
+        self.entry_points = dict(entry_points)
+        self.classes = {}
+        self.import_times = {}  # game id -> seconds spent importing its module
+        self.construct_times = {}  # game id -> seconds spent in its last __init__
+        self.lock = threading.Lock()
+
+    def __contains__(self, game_id):
+        return game_id in self.entry_points
+
+    def is_loaded(self, game_id):
+        return game_id in self.classes
+
+    def load(self, game_id):
+        """Import a game's module (once) and return its class
+
+        Raises KeyError for unknown ids and ImportError/AttributeError for
+        broken entry points.
+        """
+        game_class = self.classes.get(game_id)
+        if game_class is not None:
+            return game_class
+
+        module_name, class_name = self.entry_points[game_id].split(":")
+        with self.lock:
+            # Another thread may have finished the import while we waited
+            if game_id in self.classes:
+                return self.classes[game_id]
+            start = time.perf_counter()
+            module = importlib.import_module(module_name)
+            game_class = getattr(module, class_name)
+            self.import_times[game_id] = time.perf_counter() - start
+            self.classes[game_id] = game_class
+        return game_class
+
+    def create(self, game_id, game_engine, seed=None):
+        """Load a game if needed and construct a fresh instance (seed None = random)"""
+        game_class = self.load(game_id)
+        start = time.perf_counter()
+        game = game_class(game_engine, seed)
+        self.construct_times[game_id] = time.perf_counter() - start
+        game.game_id = game_id
+        return game
+
+    def prewarm(self, game_ids=None):
+        """Import game modules on a background thread; returns the thread (or None)"""
+        todo = [game_id for game_id in (game_ids or self.entry_points) if not self.is_loaded(game_id)]
+        if not todo:
+            return None
+        thread = threading.Thread(target=self._prewarm_worker, args=(todo,),
+                                  name="game-prewarm", daemon=True)
+        thread.start()
+        return thread
+
+    def _prewarm_worker(self, game_ids):
+        for game_id in game_ids:
+            try:
+                self.load(game_id)
+            except Exception as e:
+                # Reported again, on the main thread, if the game is launched
+                print(f"⚠️ Could not prewarm {game_id}: {e}")
+
+    def timings(self):
+        """Per-game load timings in milliseconds (None where not measured yet)"""
+        report = {}
+        for game_id in self.entry_points:
+            import_time = self.import_times.get(game_id)
+            construct_time = self.construct_times.get(game_id)
+            report[game_id] = {
+                "import_ms": import_time * 1000 if import_time is not None else None,
+                "construct_ms": construct_time * 1000 if construct_time is not None else None
+            }
+        return report
@@ -0,0 +1,215 @@
+# games/social_engineering/scenario.py
+"""
+Social Engineering Sim scenario library
+
+Scenarios live in a JSON lines file, one object per line. Only an index of
+line offsets and category tags is kept in memory; scenarios are read from
+disk when drawn, and the next one is read ahead on a background thread.
+The index is cached next to the library and rebuilt whenever the library
+file changes, so shipping thousands of scenarios costs neither memory nor
+startup time.
+
+Usage: python -m games.social_engineering.scenario [--library FILE] [--tag TAG ...]
+"""
+
+import argparse
+import json
+import os
+import threading
+from config import *
+
+SCENARIO_LIBRARY_PATH = os.path.join(DATA_PATH, "social_engineering", "scenarios.jsonl")
+INDEX_FORMAT_VERSION = 1  # bump when the index layout changes so stale caches are ignored
+REQUIRED_FIELDS = ('type', 'title', 'content', 'question', 'options', 'correct', 'explanation')
+
+
+class ScenarioLibrary:
+    """Random access to the scenarios in a JSON lines file through an offset index
+
+    Every scenario is tagged with its 'type' as well as its own 'tags', and
+    ids() selects scenarios by tag. get() is safe to call from any thread.
+    """
+
+    def __init__(self, path=SCENARIO_LIBRARY_PATH):
+        self.path = path
+        self.index_path = os.path.splitext(path)[0] + ".idx"
+        self.offsets = []  # byte offset of each scenario's line
+        self.tags = {}  # tag -> [scenario id, ...]
+        self.file = None
+        self.lock = threading.Lock()
+        self.load_index()
+
+    def __len__(self):
+        return len(self.offsets)
+
+    def load_index(self):
+        """Use the cached index if it matches the library file, otherwise rebuild it"""
+        stat = os.stat(self.path)
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                index = json.load(f)
+            if (index['version'] == INDEX_FORMAT_VERSION and index['size'] == stat.st_size
+                    and index['mtime_ns'] == stat.st_mtime_ns):
+                self.offsets = index['offsets']
+                self.tags = index['tags']
+                return
+        except (OSError, ValueError, KeyError):
+            pass
+
+        self.build_index()
+        try:
+            self.save_index(stat)
+        except OSError as e:
+            print(f"Could not cache scenario index: {e}")
+
+    def build_index(self):
+        """Scan the library once for line offsets and tags"""
+        self.offsets = []
+        self.tags = {}
+        with open(self.path, "rb") as f:
+            offset = 0
+            for line_number, line in enumerate(f, 1):
+                if line.strip():
+                    try:
+                        scenario = json.loads(line)
+                    except ValueError as e:
+                        raise ValueError(f"{self.path}:{line_number}: {e}") from None
+                    missing = [field for field in REQUIRED_FIELDS if field not in scenario]
+                    if missing:
+                        raise ValueError(f"{self.path}:{line_number}: missing {', '.join(missing)}")
+                    scenario_id = len(self.offsets)
+                    self.offsets.append(offset)
+                    for tag in dict.fromkeys([scenario['type']] + scenario.get('tags', [])):
+                        self.tags.setdefault(tag, []).append(scenario_id)
+                offset += len(line)
+
+    def save_index(self, stat):
+        """Write the index atomically so a crash never leaves a half-written cache"""
+        index = {
+            'version': INDEX_FORMAT_VERSION,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'offsets': self.offsets,
+            'tags': self.tags
+        }
+        temp_path = self.index_path + ".tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f, separators=(",", ":"))
+        os.replace(temp_path, self.index_path)
+
+    def ids(self, tags=None):
+        """Ids of the scenarios carrying any of the tags (all scenarios if tags is None)"""
+        if tags is None:
+            return list(range(len(self.offsets)))
+        selected = set()
+        for tag in tags:
+            selected.update(self.tags.get(tag, ()))
+        return sorted(selected)
+
+    def get(self, scenario_id):
+        """Read one scenario from disk"""
+        with self.lock:
+            if self.file is None:
+                self.file = open(self.path, "rb")
+            self.file.seek(self.offsets[scenario_id])
+            line = self.file.readline()
+        scenario = json.loads(line)
+        scenario['id'] = scenario.get('id', scenario_id)
+        return scenario
+
+    def close(self):
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+
+
+_libraries = {}
+_libraries_lock = threading.Lock()
+
+
+def scenario_library(path=SCENARIO_LIBRARY_PATH):
+    """The library for a scenario file, indexed once per process"""
+    with _libraries_lock:
+        library = _libraries.get(path)
+        if library is None:
+            library = _libraries[path] = ScenarioLibrary(path)
+        return library
+
+
+class ScenarioDeck:
+    """Draws scenarios without replacement in a shuffled order
+
+    The order comes from the caller's rng, so a seeded game sees the same
+    scenarios every time. When the deck runs out it is reshuffled, keeping
+    the last scenario from coming straight back. The scenario after the
+    one drawn is read ahead on a background thread.
+    """
+
+    def __init__(self, library, rng, tags=None):
+        self.library = library
+        self.rng = rng
+        self.order = library.ids(tags)
+        if not self.order:
+            raise ValueError(f"{library.path} has no scenarios" + (f" tagged {', '.join(tags)}" if tags else ""))
+        self.rng.shuffle(self.order)
+        self.position = 0
+        self.prefetched = {}  # scenario id -> scenario read ahead
+        self.prefetch_thread = None
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.order)
+
+    def next_id(self):
+        if self.position >= len(self.order):
+            last = self.order[-1]
+            self.rng.shuffle(self.order)
+            if len(self.order) > 1 and self.order[0] == last:
+                self.order[0], self.order[-1] = self.order[-1], self.order[0]
+            self.position = 0
+        scenario_id = self.order[self.position]
+        self.position += 1
+        return scenario_id
+
+    def draw(self):
+        """The next scenario, read ahead if the prefetch got to it in time"""
+        scenario_id = self.next_id()
+        with self.lock:
+            scenario = self.prefetched.pop(scenario_id, None)
+        if scenario is None:
+            scenario = self.library.get(scenario_id)
+
+        # Read the one after in the background; a reshuffle may still change
+        # it, in which case draw() just reads from disk
+        if self.position < len(self.order):
+            self.prefetch(self.order[self.position])
+        return scenario
+
+    def prefetch(self, scenario_id):
+        def read_ahead():
+            scenario = self.library.get(scenario_id)
+            with self.lock:
+                self.prefetched = {scenario_id: scenario}
+
+        self.prefetch_thread = threading.Thread(target=read_ahead, name="ScenarioPrefetch", daemon=True)
+        self.prefetch_thread.start()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Index and summarize a scenario library")
+    parser.add_argument("--library", default=SCENARIO_LIBRARY_PATH, help="scenario JSON lines file")
+    parser.add_argument("--tag", nargs="+", help="only count scenarios with any of these tags")
+    args = parser.parse_args()
+
+    library = ScenarioLibrary(args.library)
+    library.build_index()
+    library.save_index(os.stat(args.library))
+    print(f"{len(library.ids(args.tag))} of {len(library)} scenarios selected, index written to {library.index_path}")
+    for tag, ids in sorted(library.tags.items(), key=lambda item: (-len(item[1]), item[0])):
+        if args.tag is None or tag in args.tag:
+            print(f"{tag:<24}{len(ids):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,75 +1,67 @@
 # games/social_engineering/social_engineering.py
+import re
 import pygame
-import random
 from games.base_game import BaseGame
+from games.social_engineering.scenario import ScenarioDeck, scenario_library
+from utils.text_utils import TextBlock
 from config import *
 
+SCENARIOS_PER_GAME = 5
+CONTENT_TOP = 180
+CONTENT_WIDTH = 600
+QUESTION_TOP = 280  # the question moves further down when the content needs the room
+LINK_PATTERN = re.compile(r'https?://[^\s"]+')
+
+
+def content_runs(content):
+    """Scenario text as TextBlock runs, with links highlighted"""
+    runs = []
+    last = 0
+    for match in LINK_PATTERN.finditer(content):
+        runs.append((content[last:match.start()], None))
+        runs.append((match.group(), NEON_PINK))
+        last = match.end()
+    runs.append((content[last:], None))
+    return runs
+
+
 class SocialEngineering(BaseGame):
-    def __init__(self, game_engine):
-        super().__init__(game_engine)
+    def __init__(self, game_engine, seed=None):
+        super().__init__(game_engine, seed)
         self.game_active = True
         self.current_scenario = None
         self.scenarios_completed = 0
         self.correct_answers = 0
         
+        # Scenarios are read from the on-disk library as they are drawn,
+        # in a shuffled order with no repeats
+        self.deck = ScenarioDeck(scenario_library(), self.rng)
+        
+        # The scenario text is wrapped and rendered once per scenario
+        self.content_block = TextBlock(self.text_cache.fonts, 24, WHITE, CONTENT_WIDTH)
+        self.question_y = QUESTION_TOP
+        
         self.load_scenario()
         print("Social Engineering Sim started! Identify phishing attempts and social engineering tricks!")
         
     def load_scenario(self):
-        scenarios = [
-            {
-                'type': 'phishing_email',
-                'title': 'Suspicious Email',
-                'content': '''From: security@your-bank.com
-Subject: Urgent: Your Account Will Be Suspended
-
-Dear Customer,
-
-We detected unusual activity on your account. To prevent suspension, verify your identity immediately.
-
-Click here: http://fake-bank-security.com/verify
-
-Bank Security Team''',
-                'question': 'Is this email legitimate?',
-                'options': ['Yes - It looks official', 'No - Suspicious link and urgency'],
-                'correct': 1,
-                'explanation': 'This is phishing! Legitimate banks never ask for verification via email links.'
-            },
-            {
-                'type': 'tech_support',
-                'title': 'Phone Call',
-                'content': '''Caller: "Hello, I'm from Microsoft Support. We detected viruses on your computer. Please install this remote access tool so I can fix it."''',
-                'question': 'How should you respond?',
-                'options': ['Install the tool - They sound professional', 'Hang up - This is a tech support scam'],
-                'correct': 1,
-                'explanation': 'Tech support scams use fear to gain remote access to your computer.'
-            },
-            {
-                'type': 'social_media',
-                'title': 'Social Media Message',
-                'content': '''Message from "friend": "Hey! Check out this crazy video of you: http://bit.ly/suspicious-link"''',
-                'question': 'What should you do?',
-                'question': 'Is this safe to click?',
-                'options': ['Click it - It\'s from a friend', 'Ignore it - Account may be compromised'],
-                'correct': 1,
-                'explanation': 'Compromised accounts often send malicious links to friends.'
-            }
-        ]
+        self.current_scenario = self.deck.draw()
+        self.content_block.set_text(content_runs(self.current_scenario['content']))
+        self.question_y = max(QUESTION_TOP, CONTENT_TOP + self.content_block.height + 20)
         
-        self.current_scenario = random.choice(scenarios)
+    def option_rect(self, index):
+        """Screen rect of an answer button - shared by input and rendering"""
+        return pygame.Rect(SCREEN_WIDTH//2 - 200, self.question_y + 40 + index*80, 400, 60)
         
-    def handle_input(self):
-        mouse_pos = pygame.mouse.get_pos()
-        mouse_click = pygame.mouse.get_pressed()[0]
-        
-        # Create option buttons
-        option_rects = []
-        for i, option in enumerate(self.current_scenario['options']):
-            rect = pygame.Rect(SCREEN_WIDTH//2 - 200, 300 + i*80, 400, 60)
-            option_rects.append(rect)
+    def handle_input(self, input_state):
+        # One answer per click, on the press
+        if not input_state.mouse_just_pressed(1):
+            return
             
-            if mouse_click and rect.collidepoint(mouse_pos):
+        for i, option in enumerate(self.current_scenario['options']):
+            if self.option_rect(i).collidepoint(input_state.mouse_pos):
                 self.check_answer(i)
+                break
                 
     def check_answer(self, selected_option):
         is_correct = (selected_option == self.current_scenario['correct'])
@@ -83,57 +75,50 @@ Bank Security Team''',
             
         self.scenarios_completed += 1
         
-        if self.scenarios_completed >= 5:
-            accuracy = (self.correct_answers / 5) * 100
+        if self.scenarios_completed >= SCENARIOS_PER_GAME:
+            accuracy = (self.correct_answers / SCENARIOS_PER_GAME) * 100
             print(f"🎯 Game Complete! Accuracy: {accuracy}%")
             self.end_game()
         else:
             self.load_scenario()
             
-    def update(self):
+    def update(self, dt, input_state):
         if not self.game_active:
             return
             
-        self.handle_input()
+        self.handle_input(input_state)
         
-    def render(self):
+    def render(self, alpha=1.0):
         if not self.current_scenario:
             return
             
-        font_large = pygame.font.Font(None, 48)
-        font_medium = pygame.font.Font(None, 32)
-        font_small = pygame.font.Font(None, 24)
-        
         # Title
-        title = font_large.render("Social Engineering Sim", True, NEON_BLUE)
+        title = self.text_cache.render("Social Engineering Sim", 48, NEON_BLUE)
         self.screen.blit(title, (SCREEN_WIDTH//2 - title.get_width()//2, 50))
         
         # Scenario title
-        scenario_title = font_medium.render(self.current_scenario['title'], True, NEON_GREEN)
+        scenario_title = self.text_cache.render(self.current_scenario['title'], 32, NEON_GREEN)
         self.screen.blit(scenario_title, (SCREEN_WIDTH//2 - scenario_title.get_width()//2, 120))
         
         # Content
-        content_lines = self.current_scenario['content'].split('\n')
-        for i, line in enumerate(content_lines):
-            text = font_small.render(line, True, WHITE)
-            self.screen.blit(text, (SCREEN_WIDTH//2 - 300, 180 + i*25))
+        self.content_block.blit(self.screen, (SCREEN_WIDTH//2 - CONTENT_WIDTH//2, CONTENT_TOP))
             
         # Question
-        question = font_medium.render(self.current_scenario['question'], True, NEON_ORANGE)
-        self.screen.blit(question, (SCREEN_WIDTH//2 - question.get_width()//2, 280))
+        question = self.text_cache.render(self.current_scenario['question'], 32, NEON_ORANGE)
+        self.screen.blit(question, (SCREEN_WIDTH//2 - question.get_width()//2, self.question_y))
         
         # Options
         for i, option in enumerate(self.current_scenario['options']):
             # Draw button
-            rect = pygame.Rect(SCREEN_WIDTH//2 - 200, 320 + i*80, 400, 60)
+            rect = self.option_rect(i)
             pygame.draw.rect(self.screen, DARK_BLUE, rect)
             pygame.draw.rect(self.screen, NEON_BLUE, rect, 2)
             
             # Draw option text
-            option_text = font_medium.render(option, True, WHITE)
+            option_text = self.text_cache.render(option, 32, WHITE)
             self.screen.blit(option_text, (rect.centerx - option_text.get_width()//2, 
                                          rect.centery - option_text.get_height()//2))
                                          
         # Stats
-        stats = font_small.render(f"Scenarios: {self.scenarios_completed}/5 | Correct: {self.correct_answers} | Score: {self.score}", True, LIGHT_GRAY)
+        stats = self.text_cache.render(f"Scenarios: {self.scenarios_completed}/{SCENARIOS_PER_GAME} | Correct: {self.correct_answers} | Score: {self.score}", 24, LIGHT_GRAY)
         self.screen.blit(stats, (20, SCREEN_HEIGHT - 40))
\ No newline at end of file
@@ -0,0 +1,79 @@
+# tests/test_firewall_defender.py
+import random
+import pytest
+from games.firewall_defender.map import GridMap
+
+
+def fresh_map(grid_map, blocked):
+    """The same grid with the flow field computed from scratch"""
+    fresh = GridMap(grid_map.width, grid_map.height, grid_map.spawn, grid_map.core)
+    fresh.blocked = set(blocked)
+    fresh.compute_field()
+    return fresh
+
+
+def assert_valid_field(grid_map):
+    """Every cell's next step is an open neighbor one step closer to the core"""
+    for cell, via in grid_map.next_cell.items():
+        if cell == grid_map.core:
+            assert via is None
+            continue
+        assert via in set(grid_map.neighbors(cell))
+        assert grid_map.distance[via] == grid_map.distance[cell] - 1
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_block_matches_full_recompute(seed):
+    rng = random.Random(seed)
+    grid_map = GridMap(12, 9, (0, 4), (11, 4))
+    cells = [(x, y) for x in range(grid_map.width) for y in range(grid_map.height)]
+
+    for _ in range(60):
+        cell = rng.choice(cells)
+        occupied = rng.sample(sorted(grid_map.distance), 3)
+        before = (set(grid_map.blocked), dict(grid_map.distance), dict(grid_map.next_cell))
+        expected = fresh_map(grid_map, grid_map.blocked | {cell})
+        seals = not expected.reachable(grid_map.spawn) or not all(expected.reachable(c) for c in occupied)
+
+        placed = grid_map.block(cell, occupied)
+
+        if placed:
+            assert not seals
+            assert grid_map.distance == expected.distance
+            assert_valid_field(grid_map)
+        else:
+            # Refused placements leave the map exactly as it was
+            assert (grid_map.blocked, grid_map.distance, grid_map.next_cell) == before
+
+    assert grid_map.blocked
+    assert grid_map.distance == fresh_map(grid_map, grid_map.blocked).distance
+
+
+def test_block_rejects_sealing_the_path():
+    # A wall down column 5 with a single gap at (5, 2)
+    grid_map = GridMap(10, 5, (0, 2), (9, 2))
+    for y in (0, 1, 3, 4):
+        assert grid_map.block((5, y))
+    before = (set(grid_map.blocked), dict(grid_map.distance), dict(grid_map.next_cell))
+
+    assert not grid_map.block((5, 2))
+    assert (grid_map.blocked, grid_map.distance, grid_map.next_cell) == before
+    assert grid_map.route()[-1] == grid_map.core
+
+
+def test_block_rejects_trapping_an_enemy():
+    grid_map = GridMap(6, 6, (0, 0), (5, 5))
+    # Wall off the corner (0, 5) except through (1, 5)
+    assert grid_map.block((0, 4))
+    assert not grid_map.block((1, 5), occupied=[(0, 5)])
+    assert grid_map.block((1, 5))
+    assert not grid_map.reachable((0, 5))
+
+
+def test_block_refuses_spawn_core_and_taken_cells():
+    grid_map = GridMap(6, 6, (0, 0), (5, 5))
+    assert not grid_map.block(grid_map.spawn)
+    assert not grid_map.block(grid_map.core)
+    assert not grid_map.block((6, 0))
+    assert grid_map.block((2, 2))
+    assert not grid_map.block((2, 2))
@@ -0,0 +1,98 @@
+# tests/test_utils.py
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import pytest
+from config import *
+from game import CyberpunkArcade
+from utils.replay import HEADER, REPLAY_FORMAT_VERSION, ReplayLog, run_replay
+
+TICKS = 600
+
+
+@pytest.fixture
+def engine():
+    engine = CyberpunkArcade(headless=True, save_data=False)
+    yield engine
+    engine.shutdown()
+
+
+def record_session(engine, game_id, seed):
+    """Play a scripted session with replay recording on; returns the log and the game"""
+    engine.record_replays = True
+    engine.start_game(game_id, seed=seed)
+    game, log = engine.game_instance, engine.recording
+
+    # Sweep left and right, pausing now and then
+    for tick in range(TICKS):
+        if tick % 90 == 0:
+            key = (pygame.K_LEFT, pygame.K_RIGHT, None)[tick // 90 % 3]
+            engine.input.release_all()
+            if key is not None:
+                engine.input.process_event(pygame.event.Event(pygame.KEYDOWN, key=key, mod=0, unicode=""))
+        engine.update(FIXED_TIMESTEP)
+
+    engine.recording = None
+    return log, game
+
+
+def test_replay_round_trip(engine, tmp_path):
+    log, game = record_session(engine, "packet_runner", seed=2024)
+    assert log.tick_count == TICKS
+    assert game.score != 0
+
+    path = str(tmp_path / "packet_runner.replay")
+    log.save(path)
+    loaded = ReplayLog.load(path)
+
+    assert (loaded.game_id, loaded.seed, loaded.timestep) == ("packet_runner", 2024, FIXED_TIMESTEP)
+    assert loaded.tick_count == log.tick_count
+    assert loaded.runs == log.runs
+
+    player = CyberpunkArcade(headless=True, save_data=False)
+    tick_times, replayed = run_replay(loaded, player)
+    player.shutdown()
+    assert len(tick_times) == TICKS
+    assert replayed.score == game.score
+    assert replayed.player_x == game.player_x
+
+
+def test_replay_rejects_other_versions(engine, tmp_path):
+    log, _ = record_session(engine, "packet_runner", seed=7)
+    path = str(tmp_path / "old.replay")
+    log.save(path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+
+    # The version byte follows the 4-byte magic
+    assert data[4] == REPLAY_FORMAT_VERSION
+    data[4] = REPLAY_FORMAT_VERSION - 1
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError, match="unsupported replay format"):
+        ReplayLog.load(path)
+
+    data[:4] = b"NOPE"
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError, match="not a replay log"):
+        ReplayLog.load(path)
+
+
+def test_replay_rejects_truncated_logs(engine, tmp_path):
+    log, _ = record_session(engine, "packet_runner", seed=7)
+    path = str(tmp_path / "short.replay")
+    log.save(path)
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+
+    # Claim one more tick than the body holds
+    fields = list(HEADER.unpack_from(data))
+    fields[3] += 1
+    HEADER.pack_into(data, 0, *fields)
+    with open(path, "wb") as f:
+        f.write(data)
+    with pytest.raises(ValueError, match="truncated"):
+        ReplayLog.load(path)
@@ -0,0 +1,221 @@
+"""
+CyberPunk Arcade - Asset Manager
+Loads images straight out of the bundled zip archives, decodes them on a
+background thread and keeps display-converted surfaces in an LRU cache
+"""
+
+import io
+import os
+import threading
+import zipfile
+from collections import OrderedDict
+import pygame
+from config import *
+
+
+class AssetManager:
+    """Image loader with a byte-budgeted cache of converted surfaces
+
+    Assets are keyed by their path inside an archive (or relative to the
+    assets folder for loose files), e.g.
+    "cyberpunk-street-files/PNG/layers/foreground.png". Zip members win over
+    loose files, so nothing has to be extracted.
+
+    preload() decodes a manifest on a worker thread; the decoded surfaces
+    are converted to the display format by pump() on the main thread, which
+    is the only place pygame allows convert().
+    """
+
+    def __init__(self, root=ASSETS_PATH, budget=ASSET_CACHE_BUDGET):
+        self.root = root
+        self.budget = budget
+        self.archives = {}  # archive path -> open ZipFile
+        self.members = {}  # asset key -> archive path
+        self.archive_lock = threading.Lock()
+
+        # Converted surfaces, least recently used first
+        self.surfaces = OrderedDict()
+        self.cache_bytes = 0
+
+        # Decoded by the preload thread, waiting for pump() (or an image()
+        # call that needs one right away) to convert them, oldest first
+        self.decoded = OrderedDict()
+        self.pending = set()
+        self.pending_lock = threading.Lock()
+        self.preloaded = threading.Condition(self.pending_lock)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._index_archives()
+
+    def _index_archives(self):
+        if not os.path.isdir(self.root):
+            return
+        for filename in sorted(os.listdir(self.root)):
+            if not filename.endswith(".zip"):
+                continue
+            path = os.path.join(self.root, filename)
+            try:
+                archive = zipfile.ZipFile(path)
+            except (OSError, zipfile.BadZipFile) as e:
+                print(f"⚠️ Skipping asset archive {filename}: {e}")
+                continue
+            self.archives[path] = archive
+            for name in archive.namelist():
+                # Skip directories and macOS resource-fork / Finder clutter
+                if name.endswith("/") or name.startswith("__MACOSX/"):
+                    continue
+                if os.path.basename(name).startswith("."):
+                    continue
+                self.members.setdefault(name, path)
+
+    def is_cached(self, key, alpha=True):
+        """Whether image() would return the surface without loading anything"""
+        return (key, alpha) in self.surfaces
+
+    def exists(self, key):
+        return key in self.members or os.path.isfile(os.path.join(self.root, key))
+
+    def read_bytes(self, key):
+        """Raw file contents of an asset (safe to call from any thread)"""
+        archive_path = self.members.get(key)
+        if archive_path is not None:
+            # ZipFile shares one file handle, so reads are serialized
+            with self.archive_lock:
+                return self.archives[archive_path].read(key)
+        with open(os.path.join(self.root, key), "rb") as f:
+            return f.read()
+
+    def decode(self, key):
+        """Decode an image without converting it (safe to call from any thread)"""
+        return pygame.image.load(io.BytesIO(self.read_bytes(key)), key)
+
+    # Cache ------------------------------------------------------------------
+
+    def image(self, key, alpha=True):
+        """Return the display-converted surface for an image, loading it on a miss
+
+        The returned surface is shared - copy it before drawing on it.
+        """
+        cache_key = (key, alpha)
+        surface = self.surfaces.get(cache_key)
+        if surface is not None:
+            self.surfaces.move_to_end(cache_key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+
+        # Already being preloaded - take the worker's result rather than
+        # decoding the image a second time
+        preloaded = self._take_preloaded(cache_key)
+        if preloaded is not None:
+            return self._store(cache_key, preloaded)
+        return self._store(cache_key, self.decode(key))
+
+    def _take_preloaded(self, cache_key):
+        """Wait for a pending key's decoded surface; None if it isn't pending or failed"""
+        with self.preloaded:
+            self.preloaded.wait_for(lambda: cache_key in self.decoded or cache_key not in self.pending)
+            self.pending.discard(cache_key)
+            return self.decoded.pop(cache_key, None)
+
+    def _store(self, cache_key, surface):
+        _, alpha = cache_key
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if alpha else surface.convert()
+
+        old = self.surfaces.pop(cache_key, None)
+        if old is not None:
+            self.cache_bytes -= self._size(old)
+        self.surfaces[cache_key] = surface
+        self.cache_bytes += self._size(surface)
+
+        # Evict least recently used surfaces, but never the one just stored
+        while self.cache_bytes > self.budget and len(self.surfaces) > 1:
+            _, evicted = self.surfaces.popitem(last=False)
+            self.cache_bytes -= self._size(evicted)
+            self.evictions += 1
+        return surface
+
+    def _size(self, surface):
+        width, height = surface.get_size()
+        return width * height * surface.get_bytesize()
+
+    def clear(self):
+        self.surfaces.clear()
+        self.cache_bytes = 0
+
+    # Background preloading --------------------------------------------------
+
+    def preload(self, keys, alpha=True):
+        """Decode images on a background thread; returns the thread (or None)
+
+        Keys that are already cached or queued, and repeats, are skipped.
+        """
+        with self.pending_lock:
+            todo = [key for key in dict.fromkeys(keys)
+                    if (key, alpha) not in self.surfaces and (key, alpha) not in self.pending]
+            self.pending.update((key, alpha) for key in todo)
+        if not todo:
+            return None
+
+        thread = threading.Thread(target=self._preload_worker, args=(todo, alpha),
+                                  name="asset-preload", daemon=True)
+        thread.start()
+        return thread
+
+    def _preload_worker(self, keys, alpha):
+        for key in keys:
+            try:
+                surface = self.decode(key)
+            except (OSError, KeyError, pygame.error) as e:
+                print(f"⚠️ Could not preload {key}: {e}")
+                with self.preloaded:
+                    self.pending.discard((key, alpha))
+                    self.preloaded.notify_all()
+                continue
+            with self.preloaded:
+                self.decoded[(key, alpha)] = surface
+                self.preloaded.notify_all()
+
+    def pump(self, limit=4):
+        """Convert up to limit preloaded images into the cache (main thread only)"""
+        converted = 0
+        while converted < limit:
+            with self.pending_lock:
+                if not self.decoded:
+                    break
+                cache_key, surface = self.decoded.popitem(last=False)
+                self.pending.discard(cache_key)
+            if cache_key not in self.surfaces:
+                self._store(cache_key, surface)
+                converted += 1
+        return converted
+
+    def is_loading(self):
+        with self.pending_lock:
+            return bool(self.pending)
+
+    # Housekeeping -----------------------------------------------------------
+
+    def stats(self):
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.surfaces),
+            "bytes": self.cache_bytes,
+            "hit_rate": self.hits / total if total else 0.0
+        }
+
+    def close(self):
+        with self.archive_lock:
+            for archive in self.archives.values():
+                archive.close()
+            self.archives.clear()
+            self.members.clear()
@@ -0,0 +1,202 @@
+"""
+CyberPunk Arcade - Debug Tools
+Frame-time profiler with an on-screen overlay and CSV export
+"""
+
+import csv
+import os
+import time
+import pygame
+from config import *
+
+
+class FrameProfiler:
+    """Per-frame timings for engine phases and game sub-phases
+
+    Methods are timed by swapping timing wrappers onto the instances with
+    instrument(); release() deletes them again, so while the profiler is
+    off the game runs its normal methods with no extra calls at all.
+
+    Samples are kept in a ring buffer of the last `capacity` frames.
+    """
+
+    def __init__(self, capacity=PROFILER_HISTORY):
+        self.capacity = capacity
+        self.enabled = False
+        self.frame_times = [0.0] * capacity
+        self.sections = {}  # section name -> [seconds per frame] ring
+        self.current = {}  # seconds spent per section in the frame being measured
+        self.index = 0
+        self.count = 0
+        self.instrumented = []  # (object, method names, section prefix)
+
+        # Overlay
+        self.panel = None
+        self.lines = []
+        self.frames_since_text = 0
+
+    # Measuring --------------------------------------------------------------
+
+    def add(self, name, seconds):
+        self.current[name] = self.current.get(name, 0.0) + seconds
+
+    def end_frame(self, frame_seconds):
+        """Store the finished frame's samples in the ring buffer"""
+        i = self.index
+        self.frame_times[i] = frame_seconds
+        for name, seconds in self.current.items():
+            if name not in self.sections:
+                self.sections[name] = [0.0] * self.capacity
+        for name, samples in self.sections.items():
+            samples[i] = self.current.get(name, 0.0)
+        self.current.clear()
+        self.index = (i + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def recent(self, samples, n=None):
+        """The last n samples of a ring (default: all stored), oldest first"""
+        n = self.count if n is None else min(n, self.count)
+        start = (self.index - n) % self.capacity
+        if start + n <= self.capacity:
+            return samples[start:start + n]
+        return samples[start:] + samples[:self.index]
+
+    def reset(self):
+        self.frame_times = [0.0] * self.capacity
+        self.sections = {}
+        self.current.clear()
+        self.index = 0
+        self.count = 0
+
+    # Instrumentation --------------------------------------------------------
+
+    def instrument(self, obj, names, prefix=""):
+        """Time calls to obj's methods under "<prefix><name>" until release(obj)"""
+        wrapped = []
+        for name in names:
+            original = getattr(obj, name, None)
+            if original is None or name in vars(obj):
+                continue
+            setattr(obj, name, self._timed(original, prefix + name))
+            wrapped.append(name)
+            # Register sections up front so they are listed in instrumentation order
+            if prefix + name not in self.sections:
+                self.sections[prefix + name] = [0.0] * self.capacity
+        self.instrumented.append((obj, wrapped, prefix))
+
+    def _timed(self, method, label):
+        add = self.add
+        perf_counter = time.perf_counter
+
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add(label, perf_counter() - start)
+        return timed
+
+    def release(self, obj=None):
+        """Remove the timing wrappers from obj (default: from everything)
+
+        A released object's sections are dropped from the buffer too.
+        """
+        remaining = []
+        for entry in self.instrumented:
+            target, names, prefix = entry
+            if obj is None or target is obj:
+                for name in names:
+                    if name in vars(target):
+                        delattr(target, name)
+                    self.sections.pop(prefix + name, None)
+            else:
+                remaining.append(entry)
+        self.instrumented = remaining
+
+    # Export -----------------------------------------------------------------
+
+    def dump_csv(self, path=None):
+        """Write the buffered frames (oldest first) to CSV and return the path"""
+        if path is None:
+            stamp = time.strftime("%Y%m%d_%H%M%S")
+            path = os.path.join(PROFILE_PATH, f"frame_profile_{stamp}.csv")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        names = list(self.sections)
+        columns = [self.recent(self.frame_times)] + [self.recent(self.sections[name]) for name in names]
+        with open(path, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["frame", "frame_ms"] + [f"{name}_ms" for name in names])
+            for frame, row in enumerate(zip(*columns)):
+                writer.writerow([frame] + [f"{seconds * 1000:.3f}" for seconds in row])
+        return path
+
+    # Overlay ----------------------------------------------------------------
+
+    def draw(self, surface, fonts, graph_frames=120):
+        """Draw FPS, a frame-time graph and per-section averages
+
+        fonts is a FontRegistry; the text changes every refresh, so it is
+        rendered directly instead of filling the shared text cache.
+        """
+        width, line_height = 340, 18
+        graph_height = 60
+        if self.frames_since_text <= 0 or not self.lines:
+            self.lines = self._summary_lines()
+            self.frames_since_text = PROFILER_TEXT_INTERVAL
+        self.frames_since_text -= 1
+
+        height = 40 + graph_height + line_height * len(self.lines)
+        if self.panel is None or self.panel.get_height() != height:
+            self.panel = pygame.Surface((width, height), pygame.SRCALPHA)
+            self.panel.fill((0, 0, 0, 190))
+        x, y = SCREEN_WIDTH - width - 10, SCREEN_HEIGHT - height - 10
+        surface.blit(self.panel, (x, y))
+
+        # Frame-time graph with the 60 FPS budget marked
+        graph_top = y + 10
+        budget_ms = 1000 / FPS
+        scale = graph_height / (budget_ms * 2)
+        budget_y = graph_top + graph_height - budget_ms * scale
+        pygame.draw.line(surface, GRAY, (x + 10, budget_y), (x + width - 10, budget_y))
+        samples = self.recent(self.frame_times, graph_frames)
+        step = (width - 20) / max(1, graph_frames - 1)
+        points = [(x + 10 + i * step, graph_top + graph_height - min(graph_height, seconds * 1000 * scale))
+                  for i, seconds in enumerate(samples)]
+        if len(points) > 1:
+            pygame.draw.lines(surface, NEON_GREEN, False, points)
+
+        font = fonts.get(18)
+        text_y = graph_top + graph_height + 15
+        for label, value, color in self.lines:
+            surface.blit(font.render(label, True, color), (x + 10, text_y))
+            if value:
+                value_text = font.render(value, True, color)
+                surface.blit(value_text, (x + width - 10 - value_text.get_width(), text_y))
+            text_y += line_height
+
+        return pygame.Rect(x, y, width, height)
+
+    def _summary_lines(self, frames=60):
+        frame_samples = self.recent(self.frame_times, frames)
+        if not frame_samples:
+            return [("Profiling... (F3 hide, F4 save CSV)", None, LIGHT_GRAY)]
+
+        average = sum(frame_samples) / len(frame_samples)
+        fps = 1 / average if average else 0.0
+        color = NEON_GREEN if average <= 1 / FPS * 1.05 else NEON_ORANGE
+        lines = [(f"FPS {fps:.1f}", f"frame {average * 1000:.2f} ms, max {max(frame_samples) * 1000:.2f} ms", color)]
+        owner = None
+        for name, samples in self.sections.items():
+            recent = self.recent(samples, frames)
+            ms = sum(recent) / len(recent) * 1000
+            if "." in name:
+                # Game phases are grouped under their class name
+                game, phase = name.split(".", 1)
+                if game != owner:
+                    lines.append((game, None, NEON_BLUE))
+                    owner = game
+                lines.append((f"    {phase}", f"{ms:.2f} ms", LIGHT_GRAY))
+            else:
+                lines.append((name, f"{ms:.2f} ms", WHITE))
+        return lines
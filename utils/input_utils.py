@@ -0,0 +1,82 @@
+"""
+CyberPunk Arcade - Input State
+Event-driven keyboard and mouse state shared by the engine and all mini-games
+"""
+
+import pygame
+
+
+class InputState:
+    """Keyboard and mouse state built from pygame events
+
+    pressed() is true while a key is held; just_pressed() and just_released()
+    are true for the tick after the matching KEYDOWN/KEYUP event. Edges are
+    cleared by end_tick() once a simulation tick has consumed them - a frame
+    that runs no ticks keeps them for the next one, so quick taps are never
+    lost. Mouse buttons use pygame's numbering (1 = left).
+    """
+
+    def __init__(self):
+        self.keys_held = set()
+        self.keys_down = set()
+        self.keys_up = set()
+        self.buttons_held = set()
+        self.buttons_down = set()
+        self.buttons_up = set()
+        self.mouse_pos = (0, 0)
+
+    def process_event(self, event):
+        if event.type == pygame.KEYDOWN:
+            self.keys_held.add(event.key)
+            self.keys_down.add(event.key)
+        elif event.type == pygame.KEYUP:
+            self.keys_held.discard(event.key)
+            self.keys_up.add(event.key)
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            self.mouse_pos = event.pos
+            self.buttons_held.add(event.button)
+            self.buttons_down.add(event.button)
+        elif event.type == pygame.MOUSEBUTTONUP:
+            self.mouse_pos = event.pos
+            self.buttons_held.discard(event.button)
+            self.buttons_up.add(event.button)
+        elif event.type == pygame.MOUSEMOTION:
+            self.mouse_pos = event.pos
+        elif event.type == pygame.WINDOWFOCUSLOST:
+            # Releases that happen in another window never reach us
+            self.release_all()
+
+    def end_tick(self):
+        """Forget this tick's presses and releases"""
+        self.keys_down.clear()
+        self.keys_up.clear()
+        self.buttons_down.clear()
+        self.buttons_up.clear()
+
+    def release_all(self):
+        self.keys_up |= self.keys_held
+        self.buttons_up |= self.buttons_held
+        self.keys_held.clear()
+        self.buttons_held.clear()
+
+    # Keyboard ---------------------------------------------------------------
+
+    def pressed(self, key):
+        return key in self.keys_held
+
+    def just_pressed(self, key):
+        return key in self.keys_down
+
+    def just_released(self, key):
+        return key in self.keys_up
+
+    # Mouse ------------------------------------------------------------------
+
+    def mouse_pressed(self, button=1):
+        return button in self.buttons_held
+
+    def mouse_just_pressed(self, button=1):
+        return button in self.buttons_down
+
+    def mouse_just_released(self, button=1):
+        return button in self.buttons_up
@@ -0,0 +1,28 @@
+"""
+CyberPunk Arcade - Math Helpers
+Sine/cosine lookup tables for headings in degrees (0 = up, clockwise)
+"""
+
+import math
+
+TRIG_STEPS = 3600  # table entries per full turn (0.1 degree resolution)
+
+SIN_TABLE = [math.sin(2 * math.pi * i / TRIG_STEPS) for i in range(TRIG_STEPS)]
+COS_TABLE = [math.cos(2 * math.pi * i / TRIG_STEPS) for i in range(TRIG_STEPS)]
+
+
+def heading_index(degrees, steps=TRIG_STEPS):
+    """Nearest of `steps` evenly spaced headings, as an index in [0, steps)"""
+    return round(degrees * steps / 360) % steps
+
+
+def direction(degrees):
+    """(sin, cos) of a heading from a single table lookup"""
+    i = heading_index(degrees)
+    return SIN_TABLE[i], COS_TABLE[i]
+
+
+def rotate(x, y, degrees):
+    """Rotate a point about the origin clockwise on screen (y points down)"""
+    sin, cos = direction(degrees)
+    return x * cos - y * sin, x * sin + y * cos
@@ -0,0 +1,154 @@
+"""
+CyberPunk Arcade - Parallax Background
+Scrolling city skyline built from the cyberpunk-street layers
+"""
+
+import math
+import threading
+import pygame
+from utils.render_utils import TRANSPARENT_KEY
+from config import *
+
+
+class ParallaxLayer:
+    """One background layer, pre-scaled and pre-tiled into a wrap-around strip
+
+    The strip is at least a screen wide and a whole number of tiles long, so
+    any scroll offset is covered by at most two blits of it. Everything but
+    the final conversion to the display format is safe off the main thread;
+    with convert=False that step is left to convert().
+    """
+
+    def __init__(self, image, speed, size, dim=255, convert=True):
+        self.speed = speed  # pixels per second
+        self.offset = 0.0
+        self.last_step = 0.0
+        screen_width, screen_height = size
+
+        # Scale to the screen height once, keeping the pixel-art aspect ratio
+        width, height = image.get_size()
+        tile_width = max(1, round(width * screen_height / height))
+        tile = pygame.transform.scale(image, (tile_width, screen_height))
+        if dim < 255:
+            tile.fill((dim, dim, dim), special_flags=pygame.BLEND_RGB_MULT)
+
+        strip_width = tile_width * math.ceil(screen_width / tile_width)
+        self.strip = self._build_strip(tile, strip_width, screen_height)
+        self.width = strip_width
+        self.converted = False
+        if convert:
+            self.convert()
+
+    def _build_strip(self, tile, width, height):
+        tile_width = tile.get_width()
+        total = tile_width * height
+        opaque = visible = total
+        if tile.get_flags() & pygame.SRCALPHA:
+            opaque = pygame.mask.from_surface(tile, 254).count()
+            visible = pygame.mask.from_surface(tile, 0).count()
+
+        # Fully opaque, or all-or-nothing transparency that a colorkey can express
+        colorkey = opaque < total and opaque == visible
+        if opaque == visible and not (colorkey and self._uses_key(tile)):
+            strip = pygame.Surface((width, height))
+            strip.fill(TRANSPARENT_KEY)
+            if colorkey:
+                strip.set_colorkey(TRANSPARENT_KEY, pygame.RLEACCEL)
+        else:
+            # Soft edges need real per-pixel alpha
+            strip = pygame.Surface((width, height), pygame.SRCALPHA)
+
+        for x in range(0, width, tile_width):
+            strip.blit(tile, (x, 0))
+        return strip
+
+    def convert(self):
+        """Match the strip to the display's pixel format (main thread only)"""
+        if pygame.display.get_surface() is not None:
+            alpha = self.strip.get_flags() & pygame.SRCALPHA
+            self.strip = self.strip.convert_alpha() if alpha else self.strip.convert()
+        self.converted = True
+
+    def _uses_key(self, tile):
+        return pygame.mask.from_threshold(tile, TRANSPARENT_KEY, (1, 1, 1, 255)).count() > 0
+
+    def update(self, dt):
+        self.last_step = self.speed * dt
+        self.offset = (self.offset + self.last_step) % self.width
+
+    def draw(self, target, alpha=1.0):
+        # Interpolate between the last two ticks like the games do
+        offset = (self.offset - self.last_step * (1 - alpha)) % self.width
+        x = -int(offset)
+        target.blit(self.strip, (x, 0))
+        if x + self.width < target.get_width():
+            target.blit(self.strip, (x + self.width, 0))
+
+
+class ParallaxBackground:
+    """The full skyline: layers drawn back to front, each scrolling at its own speed
+
+    Scaling the layer images and analysing their transparency takes a few
+    hundred milliseconds, so once the asset manager has the images the
+    strips are built on a worker thread. The main thread only converts the
+    finished strips, one per frame, and the background is black until then.
+    """
+
+    def __init__(self, assets, layers=PARALLAX_LAYERS, size=(SCREEN_WIDTH, SCREEN_HEIGHT), dim=PARALLAX_DIM):
+        self.assets = assets
+        self.layer_specs = layers
+        self.size = size
+        self.dim = dim
+        self.layers = None
+        self.built = None  # layers from the build thread, waiting to be converted
+        self.build_thread = None
+
+    @property
+    def ready(self):
+        return self.layers is not None
+
+    def start_build(self):
+        """Start building the strips once every layer image is loaded; False until then"""
+        keys = [key for key, _ in self.layer_specs]
+        if not all(self.assets.is_cached(key) for key in keys) and self.assets.is_loading():
+            return False
+
+        # Cached, or never preloaded - image() then loads it here, which also
+        # reports a missing layer straight away
+        images = [self.assets.image(key) for key in keys]
+        self.build_thread = threading.Thread(target=self._build_worker, args=(images,),
+                                             name="parallax-build", daemon=True)
+        self.build_thread.start()
+        return True
+
+    def _build_worker(self, images):
+        self.built = [ParallaxLayer(image, speed, self.size, self.dim, convert=False)
+                      for image, (_, speed) in zip(images, self.layer_specs)]
+
+    def poll(self):
+        """Advance the background build by one step; True once the layers are ready"""
+        if self.layers is not None:
+            return True
+        if self.build_thread is None:
+            self.start_build()
+        elif self.built is not None:
+            pending = [layer for layer in self.built if not layer.converted]
+            if pending:
+                pending[0].convert()
+            else:
+                self.layers = self.built
+                return True
+        return False
+
+    def update(self, dt):
+        if not self.poll():
+            return
+        for layer in self.layers:
+            layer.update(dt)
+
+    def draw(self, target, alpha=1.0):
+        if not self.poll():
+            target.fill(BLACK)
+            return
+        for layer in self.layers:
+            layer.draw(target, alpha)
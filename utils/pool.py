@@ -0,0 +1,63 @@
+"""
+CyberPunk Arcade - Object Pools
+Preallocated entity slots so steady-state gameplay allocates nothing per frame
+"""
+
+
+class Pool:
+    """Fixed set of reusable objects with an active list and a free stack
+
+    factory() builds one pooled object; it must have a pool_index slot,
+    which the pool uses to find the object in the active list. Releasing
+    swaps the last active object into the freed position, so iterating the
+    pool (last to first) stays valid while the current object is released.
+    A pool that runs dry doubles its slots rather than failing.
+    """
+
+    def __init__(self, factory, capacity):
+        self.factory = factory
+        self.active = []
+        self.free = []
+        self._grow(capacity)
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        active = self.active
+        for i in range(len(active) - 1, -1, -1):
+            yield active[i]
+
+    @property
+    def capacity(self):
+        return len(self.active) + len(self.free)
+
+    def _grow(self, count):
+        self.free.extend(self.factory() for _ in range(count))
+
+    def acquire(self):
+        """Take a free object and mark it active; the caller resets its fields"""
+        if not self.free:
+            self._grow(max(1, self.capacity))
+        obj = self.free.pop()
+        obj.pool_index = len(self.active)
+        self.active.append(obj)
+        return obj
+
+    def release(self, obj):
+        """Return an active object to the free stack"""
+        active = self.active
+        index = obj.pool_index
+        last = active.pop()
+        if last is not obj:
+            active[index] = last
+            last.pool_index = index
+        obj.pool_index = -1
+        self.free.append(obj)
+
+    def clear(self):
+        """Release every active object"""
+        for obj in self.active:
+            obj.pool_index = -1
+        self.free.extend(self.active)
+        self.active.clear()
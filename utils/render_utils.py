@@ -0,0 +1,146 @@
+"""
+CyberPunk Arcade - Rendering Helpers
+Cached layers for artwork that rarely changes and batched entity sprites
+"""
+
+import pygame
+from config import *
+
+# Marks transparent pixels in surfaces whose alpha is all-or-nothing; colorkey
+# blits are much cheaper than per-pixel alpha blending
+TRANSPARENT_KEY = (255, 0, 254)
+
+
+class StaticLayer:
+    """Pre-rendered surface for unchanging scenery (grids, paths, static UI)
+
+    draw_func(surface) paints the layer. It runs once, and again only after
+    invalidate() - every other frame is a single blit of the cached surface.
+    """
+
+    def __init__(self, size, draw_func, alpha=False):
+        self.size = size
+        self.draw_func = draw_func
+        self.alpha = alpha
+        self.surface = None
+        self.valid = False
+        self.builds = 0
+
+    def invalidate(self):
+        """Mark the layer for a rebuild on its next use"""
+        self.valid = False
+
+    def get(self):
+        """Return the cached surface, rebuilding it first if invalid"""
+        if not self.valid:
+            self.rebuild()
+        return self.surface
+
+    def rebuild(self):
+        if self.surface is None:
+            self.surface = self._create_surface()
+        elif self.alpha:
+            self.surface.fill((0, 0, 0, 0))
+
+        self.draw_func(self.surface)
+        self.valid = True
+        self.builds += 1
+
+    def _create_surface(self):
+        flags = pygame.SRCALPHA if self.alpha else 0
+        surface = pygame.Surface(self.size, flags)
+
+        # Match the display's pixel format so blits skip per-pixel conversion
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha() if self.alpha else surface.convert()
+        return surface
+
+    def blit(self, target, pos=(0, 0)):
+        """Draw the layer onto target and return the affected rect"""
+        return target.blit(self.get(), pos)
+
+
+class SpriteBatch:
+    """Entity sprites pre-rendered once and drawn with one Surface.blits() call
+
+    define() registers a sprite kind as a draw function plus its size and
+    anchor (the pixel that lands on the entity's position). The function
+    paints into a cached colorkeyed surface the first time the sprite is
+    used. Each frame, add()/add_many()/add_kinds() queue sprites and flush()
+    submits the whole queue at once.
+
+    With enabled=False the draw functions run straight onto the target at
+    flush time instead, which is the per-entity draw-call path the cache
+    replaces - kept so benchmarks can compare the two.
+    """
+
+    def __init__(self, enabled=True):
+        self.enabled = enabled
+        self.kinds = {}  # key -> (size, anchor, draw_func)
+        self.surfaces = {}  # key -> cached sprite surface
+        self.queue = []  # (key, x, y) in draw order
+
+    def define(self, key, size, anchor, draw_func):
+        """Register a sprite kind; draw_func(surface, (x, y)) paints it anchored at (x, y)"""
+        self.kinds[key] = (size, anchor, draw_func)
+        self.surfaces.pop(key, None)
+
+    def __contains__(self, key):
+        return key in self.kinds
+
+    def sprite(self, key):
+        """Return the cached surface for a sprite kind, rendering it on first use"""
+        surface = self.surfaces.get(key)
+        if surface is None:
+            size, anchor, draw_func = self.kinds[key]
+            surface = pygame.Surface(size)
+            surface.fill(TRANSPARENT_KEY)
+            draw_func(surface, anchor)
+            surface.set_colorkey(TRANSPARENT_KEY, pygame.RLEACCEL)
+            if pygame.display.get_surface() is not None:
+                surface = surface.convert()
+            self.surfaces[key] = surface
+        return surface
+
+    def add(self, key, x, y):
+        self.add_many(key, (x,), (y,))
+
+    def add_many(self, key, xs, ys):
+        """Queue one sprite kind at many positions (sequences of ints)"""
+        if not self.enabled:
+            self.queue.extend((key, x, y) for x, y in zip(xs, ys))
+            return
+        surface = self.sprite(key)
+        anchor_x, anchor_y = self.kinds[key][1]
+        self.queue.extend([(surface, (x - anchor_x, y - anchor_y)) for x, y in zip(xs, ys)])
+
+    def add_kinds(self, keys, xs, ys):
+        """Queue a different sprite kind per position"""
+        if not self.enabled:
+            self.queue.extend(zip(keys, xs, ys))
+            return
+        sprites = {}
+        for key in set(keys):
+            anchor_x, anchor_y = self.kinds[key][1]
+            sprites[key] = (self.sprite(key), anchor_x, anchor_y)
+        queue = self.queue
+        for key, x, y in zip(keys, xs, ys):
+            surface, anchor_x, anchor_y = sprites[key]
+            queue.append((surface, (x - anchor_x, y - anchor_y)))
+
+    def flush(self, target, rects=False):
+        """Draw and clear the queue; returns the drawn rects if rects is true"""
+        queue = self.queue
+        self.queue = []
+        if not queue:
+            return []
+
+        if self.enabled:
+            return target.blits(queue, doreturn=rects) or []
+
+        drawn = []
+        for key, x, y in queue:
+            (width, height), (anchor_x, anchor_y), draw_func = self.kinds[key]
+            draw_func(target, (x, y))
+            drawn.append(pygame.Rect(x - anchor_x, y - anchor_y, width, height))
+        return drawn if rects else []
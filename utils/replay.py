@@ -0,0 +1,191 @@
+"""
+CyberPunk Arcade - Input Recording and Replay
+Per-tick input logs that replay a game session exactly, for regression and
+performance testing
+
+Usage: python -m utils.replay LOG [LOG ...]
+"""
+
+import os
+import struct
+import sys
+import time
+import zlib
+from config import *
+
+REPLAY_MAGIC = b"CPAR"
+REPLAY_FORMAT_VERSION = 2
+
+# magic, version, seed, tick count, timestep, game id length. The timestep
+# is a double so replays tick with exactly the dt that was recorded.
+HEADER = struct.Struct("<4sBQIdH")
+# repeat count, mouse x/y, held/pressed/released button masks, held/pressed/released key counts
+RECORD = struct.Struct("<IhhBBBBBB")
+
+
+def _button_mask(buttons):
+    mask = 0
+    for button in buttons:
+        if 1 <= button <= 8:
+            mask |= 1 << (button - 1)
+    return mask
+
+
+def _mask_buttons(mask):
+    return {bit + 1 for bit in range(8) if mask & (1 << bit)}
+
+
+def snapshot(input_state):
+    """Hashable copy of everything a game can read from an InputState"""
+    return (input_state.mouse_pos,
+            _button_mask(input_state.buttons_held),
+            _button_mask(input_state.buttons_down),
+            _button_mask(input_state.buttons_up),
+            tuple(sorted(input_state.keys_held)),
+            tuple(sorted(input_state.keys_down)),
+            tuple(sorted(input_state.keys_up)))
+
+
+def apply_snapshot(input_state, snap):
+    """Make an InputState look exactly like it did when snap was taken"""
+    mouse_pos, held, down, up, keys_held, keys_down, keys_up = snap
+    input_state.mouse_pos = mouse_pos
+    input_state.buttons_held = _mask_buttons(held)
+    input_state.buttons_down = _mask_buttons(down)
+    input_state.buttons_up = _mask_buttons(up)
+    input_state.keys_held = set(keys_held)
+    input_state.keys_down = set(keys_down)
+    input_state.keys_up = set(keys_up)
+
+
+class ReplayLog:
+    """A game id, its RNG seed and the input seen on every simulation tick
+
+    Ticks are stored as runs of identical input, so a player holding a key
+    for five seconds costs one record, not three hundred.
+    """
+
+    def __init__(self, game_id, seed, timestep=FIXED_TIMESTEP):
+        self.game_id = game_id
+        self.seed = seed
+        self.timestep = timestep
+        self.runs = []  # [snapshot, repeat count]
+        self.tick_count = 0
+
+    def record(self, input_state):
+        """Append one tick of input"""
+        snap = snapshot(input_state)
+        if self.runs and self.runs[-1][0] == snap:
+            self.runs[-1][1] += 1
+        else:
+            self.runs.append([snap, 1])
+        self.tick_count += 1
+
+    def ticks(self):
+        """Yield the input snapshot of every tick in order"""
+        for snap, count in self.runs:
+            for _ in range(count):
+                yield snap
+
+    def save(self, path):
+        """Write the log atomically: a small header and a zlib-compressed body"""
+        body = bytearray()
+        for (mouse_pos, held, down, up, keys_held, keys_down, keys_up), count in self.runs:
+            body += RECORD.pack(count, mouse_pos[0], mouse_pos[1], held, down, up,
+                                len(keys_held), len(keys_down), len(keys_up))
+            keys = keys_held + keys_down + keys_up
+            body += struct.pack(f"<{len(keys)}I", *keys)
+
+        game_id = self.game_id.encode("utf-8")
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as f:
+            f.write(HEADER.pack(REPLAY_MAGIC, REPLAY_FORMAT_VERSION, self.seed, self.tick_count,
+                                self.timestep, len(game_id)))
+            f.write(game_id)
+            f.write(zlib.compress(bytes(body), 9))
+        os.replace(temp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "rb") as f:
+            data = f.read()
+
+        magic, version, seed, tick_count, timestep, id_length = HEADER.unpack_from(data)
+        if magic != REPLAY_MAGIC:
+            raise ValueError(f"{path} is not a replay log")
+        if version != REPLAY_FORMAT_VERSION:
+            raise ValueError(f"{path} has unsupported replay format {version}")
+        offset = HEADER.size
+        log = cls(data[offset:offset + id_length].decode("utf-8"), seed, timestep)
+        body = zlib.decompress(data[offset + id_length:])
+
+        offset = 0
+        while offset < len(body):
+            count, x, y, held, down, up, n_held, n_down, n_up = RECORD.unpack_from(body, offset)
+            offset += RECORD.size
+            keys = struct.unpack_from(f"<{n_held + n_down + n_up}I", body, offset)
+            offset += 4 * len(keys)
+            snap = ((x, y), held, down, up, keys[:n_held],
+                    keys[n_held:n_held + n_down], keys[n_held + n_down:])
+            log.runs.append([snap, count])
+            log.tick_count += count
+
+        if log.tick_count != tick_count:
+            raise ValueError(f"{path} is truncated ({log.tick_count} of {tick_count} ticks)")
+        return log
+
+
+def replay_path(game_id):
+    stamp = time.strftime("%Y%m%d_%H%M%S")
+    return os.path.join(REPLAY_PATH, f"{game_id}_{stamp}.replay")
+
+
+def run_replay(log, engine):
+    """Play a log through a (headless) engine as fast as possible
+
+    Returns the per-tick update times in seconds and the finished game.
+    The game gets the log's seed, so the run is identical to the recording.
+    """
+    engine.start_game(log.game_id, seed=log.seed)
+    game = engine.game_instance
+    tick_times = []
+
+    for snap in log.ticks():
+        if engine.current_state != log.game_id:
+            break  # the game ended, as it did when recorded
+        apply_snapshot(engine.input, snap)
+        start = time.perf_counter()
+        engine.update(log.timestep)
+        tick_times.append(time.perf_counter() - start)
+
+    return tick_times, game
+
+
+def main():
+    import contextlib
+    import io
+    from game import CyberpunkArcade
+
+    paths = sys.argv[1:]
+    if not paths:
+        print(__doc__.strip().splitlines()[-1])
+        return 1
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        engine = CyberpunkArcade(headless=True)
+
+    for path in paths:
+        log = ReplayLog.load(path)
+        with contextlib.redirect_stdout(io.StringIO()):
+            tick_times, game = run_replay(log, engine)
+        total = sum(tick_times)
+        rate = len(tick_times) / total if total else 0.0
+        print(f"{path}: {GAMES.get(log.game_id, log.game_id)} seed {log.seed} - "
+              f"{len(tick_times)}/{log.tick_count} ticks in {total * 1000:.1f} ms "
+              f"({rate:,.0f} ticks/s), score {game.score}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
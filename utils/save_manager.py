@@ -0,0 +1,169 @@
+"""
+CyberPunk Arcade - Save Manager
+Persists high scores, per-game best scores and achievements in a SQLite
+database, written in batches by a background thread
+"""
+
+import os
+import queue
+import sqlite3
+import threading
+import time
+from config import *
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS stats (key TEXT PRIMARY KEY, value INTEGER NOT NULL);
+CREATE TABLE IF NOT EXISTS high_scores (game_id TEXT PRIMARY KEY, score INTEGER NOT NULL, achieved_at REAL NOT NULL);
+CREATE TABLE IF NOT EXISTS achievements (achievement_id TEXT PRIMARY KEY, unlocked_at REAL NOT NULL);
+"""
+
+
+class SaveManager:
+    """Game data store that never makes the caller wait on the disk
+
+    load() reads everything once at startup. After that, save_stat(),
+    submit_score() and unlock() only queue the change; a writer thread
+    commits whatever has queued up every SAVE_BATCH_INTERVAL seconds in one
+    transaction. The database runs in WAL mode, so a crash mid-write loses
+    at most the batch in flight and never corrupts what was saved before.
+
+    With enabled=False (headless engines) nothing is read or written.
+    """
+
+    def __init__(self, path=SAVE_DB_PATH, enabled=True):
+        self.path = path
+        self.enabled = enabled
+        self.connection = None
+        self.db_lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.writer = None
+        self.batches = 0
+
+        if not enabled:
+            return
+        try:
+            self.connection = self._connect()
+        except (OSError, sqlite3.Error) as e:
+            print(f"⚠️ Saving disabled, could not open {path}: {e}")
+            self.enabled = False
+            return
+
+        self.writer = threading.Thread(target=self._write_loop, name="save-writer", daemon=True)
+        self.writer.start()
+
+    def _connect(self):
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        # Only the writer thread writes; load() shares the connection under db_lock
+        connection = sqlite3.connect(self.path, check_same_thread=False)
+        try:
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(SCHEMA)
+        except sqlite3.Error:
+            connection.close()
+            raise
+        return connection
+
+    def load(self):
+        """Everything saved so far: {'stats': {...}, 'high_scores': {...}, 'achievements': {...}}"""
+        data = {'stats': {}, 'high_scores': {}, 'achievements': {}}
+        if not self.enabled:
+            return data
+        with self.db_lock:
+            data['stats'] = dict(self.connection.execute("SELECT key, value FROM stats"))
+            data['high_scores'] = dict(self.connection.execute("SELECT game_id, score FROM high_scores"))
+            data['achievements'] = dict(self.connection.execute(
+                "SELECT achievement_id, unlocked_at FROM achievements"))
+        return data
+
+    def save_stat(self, key, value):
+        self._queue(('stat', key, value))
+
+    def submit_score(self, game_id, score):
+        """Keep score as the game's best unless a higher one is already saved"""
+        self._queue(('score', game_id, score, time.time()))
+
+    def unlock(self, achievement_id):
+        self._queue(('achievement', achievement_id, time.time()))
+
+    def _queue(self, change):
+        if self.enabled:
+            self.queue.put(change)
+
+    def flush(self, timeout=SAVE_FLUSH_TIMEOUT):
+        """Commit everything queued so far; False if it took longer than timeout"""
+        if not self.enabled:
+            return True
+        done = threading.Event()
+        self.queue.put(('flush', done))
+        return done.wait(timeout)
+
+    def close(self, timeout=SAVE_FLUSH_TIMEOUT):
+        """Commit pending changes and stop the writer, waiting at most timeout seconds
+
+        Returns False if the writer is still busy when the timeout runs out;
+        it is a daemon thread, so it can't hold up the process exiting.
+        """
+        if not self.enabled:
+            return True
+        self.enabled = False
+        done = threading.Event()
+        self.queue.put(('stop', done))
+        return done.wait(timeout)
+
+    def _write_loop(self):
+        while True:
+            # Collect changes for one batch interval, or until someone is
+            # waiting on a flush
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + SAVE_BATCH_INTERVAL
+            while batch[-1][0] not in ('flush', 'stop'):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            try:
+                self._commit(batch)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not save game data: {e}")
+
+            for change in batch:
+                if change[0] in ('flush', 'stop'):
+                    change[1].set()
+            if batch[-1][0] == 'stop':
+                with self.db_lock:
+                    self.connection.close()
+                return
+
+    def _commit(self, batch):
+        stats = {}
+        scores = {}
+        achievements = {}
+        for change in batch:
+            kind = change[0]
+            if kind == 'stat':
+                stats[change[1]] = change[2]
+            elif kind == 'score':
+                best = scores.get(change[1])
+                if best is None or change[2] > best[0]:
+                    scores[change[1]] = change[2:]
+            elif kind == 'achievement':
+                achievements.setdefault(change[1], change[2])
+        if not (stats or scores or achievements):
+            return
+
+        with self.db_lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO stats VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+                stats.items())
+            self.connection.executemany(
+                "INSERT INTO high_scores VALUES (?, ?, ?) ON CONFLICT(game_id) DO UPDATE SET "
+                "score = excluded.score, achieved_at = excluded.achieved_at WHERE excluded.score > high_scores.score",
+                [(game_id, score, achieved_at) for game_id, (score, achieved_at) in scores.items()])
+            self.connection.executemany(
+                "INSERT OR IGNORE INTO achievements VALUES (?, ?)", achievements.items())
+        self.batches += 1
@@ -0,0 +1,212 @@
+"""
+CyberPunk Arcade - Text Rendering Helpers
+Shared font registry, text-surface cache and wrapped text blocks used by the engine and all mini-games
+"""
+
+import os
+import re
+from collections import OrderedDict
+import pygame
+from config import *
+
+
+class FontRegistry:
+    """Creates each (font, size) pair once and hands out the shared Font object"""
+
+    def __init__(self):
+        self.fonts = {}
+
+    def get(self, size, name=None):
+        """Return the font for a size; name is a file in FONTS_PATH, None for the default font"""
+        key = (name, size)
+        font = self.fonts.get(key)
+        if font is None:
+            path = os.path.join(FONTS_PATH, name) if name else None
+            font = pygame.font.Font(path, size)
+            self.fonts[key] = font
+        return font
+
+
+class TextCache:
+    """LRU cache of rendered text surfaces keyed by font, size, string and color"""
+
+    def __init__(self, max_entries=TEXT_CACHE_SIZE, fonts=None):
+        self.fonts = fonts if fonts is not None else FontRegistry()
+        self.max_entries = max_entries
+        self.surfaces = OrderedDict()
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def render(self, text, size, color, font_name=None, antialias=True):
+        """Return a surface for the text, rendering it only on a cache miss"""
+        key = (font_name, size, text, color, antialias)
+        surface = self.surfaces.get(key)
+
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+
+        self.misses += 1
+        surface = self.fonts.get(size, font_name).render(text, antialias, color)
+        self.surfaces[key] = surface
+
+        if len(self.surfaces) > self.max_entries:
+            self.surfaces.popitem(last=False)
+            self.evictions += 1
+
+        return surface
+
+    def clear(self):
+        """Drop all cached surfaces (fonts stay registered)"""
+        self.surfaces.clear()
+
+    def stats(self):
+        """Return hit/miss counters as a dict"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "entries": len(self.surfaces),
+            "fonts": len(self.fonts.fonts),
+            "hit_rate": self.hits / lookups if lookups else 0.0
+        }
+
+
+class TextBlock:
+    """Word-wrapped multi-line text composed into one cached surface
+
+    text is a string or a list of (string, color) runs for inline colors -
+    a run with color None uses the block's color. Newlines start a new line,
+    words wrap at width and words wider than the block are split. The
+    surface is laid out and rendered again only when the text or width
+    changes, so a long block costs one blit per frame.
+    """
+
+    def __init__(self, fonts, size, color, width, text="", font_name=None, line_height=None, antialias=True):
+        self.fonts = fonts
+        self.size = size
+        self.color = color
+        self.width = width
+        self.font_name = font_name
+        self.line_height = line_height
+        self.antialias = antialias
+        self.runs = ()
+        self.lines = []  # [[(text, color), ...] per line]
+        self.surface = None
+        self.builds = 0
+        self.set_text(text)
+
+    def set_text(self, text):
+        """Change the text; the block is rebuilt only if it differs"""
+        runs = ((text, None),) if isinstance(text, str) else tuple((run, color) for run, color in text)
+        if runs != self.runs:
+            self.runs = runs
+            self.surface = None
+
+    def set_width(self, width):
+        if width != self.width:
+            self.width = width
+            self.surface = None
+
+    @property
+    def font(self):
+        return self.fonts.get(self.size, self.font_name)
+
+    @property
+    def height(self):
+        return self.get().get_height()
+
+    def get(self):
+        """Return the composed surface, laying it out first if the text or width changed"""
+        if self.surface is None:
+            self.lines = self.layout()
+            self.surface = self.compose()
+            self.builds += 1
+        return self.surface
+
+    def blit(self, target, pos):
+        """Draw the block onto target and return the affected rect"""
+        return target.blit(self.get(), pos)
+
+    def layout(self):
+        """Wrap the runs into lines of (text, color) segments"""
+        font = self.font
+        lines = [[]]
+        x = 0
+
+        def place(piece, color, piece_width):
+            nonlocal x
+            line = lines[-1]
+            if line and line[-1][1] == color:
+                line[-1] = (line[-1][0] + piece, color)
+            else:
+                line.append((piece, color))
+            x += piece_width
+
+        def new_line():
+            nonlocal x
+            # Trailing spaces at a wrap point would only widen the block
+            line = lines[-1]
+            if line:
+                text, color = line.pop()
+                if text.rstrip(" "):
+                    line.append((text.rstrip(" "), color))
+            lines.append([])
+            x = 0
+
+        for run, color in self.runs:
+            color = color or self.color
+            for p, paragraph in enumerate(run.split("\n")):
+                if p:
+                    new_line()
+                for token in re.findall(r" +|[^ ]+", paragraph):
+                    token_width = font.size(token)[0]
+                    if token.startswith(" "):
+                        if x:
+                            place(token, color, token_width)
+                        continue
+                    if x and x + token_width > self.width:
+                        new_line()
+                    # Words wider than the whole block are split where they overflow
+                    while token_width > self.width - x and len(token) > 1:
+                        split = max(1, self._split_point(font, token, self.width - x))
+                        place(token[:split], color, font.size(token[:split])[0])
+                        new_line()
+                        token = token[split:]
+                        token_width = font.size(token)[0]
+                    place(token, color, token_width)
+        return lines
+
+    @staticmethod
+    def _split_point(font, word, width):
+        """Length of the longest prefix of word that fits in width"""
+        low, high = 0, len(word)
+        while low < high:
+            middle = (low + high + 1) // 2
+            if font.size(word[:middle])[0] <= width:
+                low = middle
+            else:
+                high = middle - 1
+        return low
+
+    def compose(self):
+        font = self.font
+        line_height = self.line_height or font.get_linesize()
+        rendered = [[font.render(text, self.antialias, color) for text, color in line if text]
+                    for line in self.lines]
+        width = max((sum(s.get_width() for s in line) for line in rendered), default=0)
+        surface = pygame.Surface((max(1, width), max(1, len(rendered) * line_height)), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+
+        for row, line in enumerate(rendered):
+            x = 0
+            for segment in line:
+                surface.blit(segment, (x, row * line_height))
+                x += segment.get_width()
+        return surface